@@ -5,10 +5,14 @@ Combined architecture for superior market predictions
 
 import torch
 import torch.nn as nn
+from torch.utils.data import TensorDataset, DataLoader
 import numpy as np
 from typing import Tuple, Optional
+import copy
 import logging
 
+from agents.transformer_predictor import SDPAEncoderLayer, SDPAEncoder
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -110,12 +114,17 @@ class EnsemblePredictor(nn.Module):
         nhead: int = 8,
         num_encoder_layers: int = 3,
         dropout: float = 0.2,
-        ensemble_method: str = 'weighted'  # 'weighted', 'attention', 'voting'
+        ensemble_method: str = 'weighted',  # 'weighted', 'attention', 'voting'
+        prune_threshold: float = 0.02,
+        max_seq_len: int = 512
     ):
         super().__init__()
 
         self.ensemble_method = ensemble_method
 
+        # At inference, 'weighted' skips branches whose weight is <= this
+        self.prune_threshold = prune_threshold
+
         # Individual models
         self.lstm = LSTMPredictor(
             input_dim=input_dim,
@@ -134,18 +143,20 @@ class EnsemblePredictor(nn.Module):
         # Simplified Transformer (from existing TransformerPredictor)
         self.transformer_embedding = nn.Linear(input_dim, d_model)
 
-        encoder_layer = nn.TransformerEncoderLayer(
+        # Sinusoidal positional encoding, precomputed as (1, max_seq_len, d_model)
+        position = torch.arange(max_seq_len).unsqueeze(1)
+        div_term = torch.exp(torch.arange(0, d_model, 2) * (-np.log(10000.0) / d_model))
+        pos_enc = torch.zeros(1, max_seq_len, d_model)
+        pos_enc[0, :, 0::2] = torch.sin(position * div_term)
+        pos_enc[0, :, 1::2] = torch.cos(position * div_term)
+        self.register_buffer('pos_enc', pos_enc, persistent=False)
+
+        self.transformer_encoder = SDPAEncoder(
             d_model=d_model,
             nhead=nhead,
+            num_layers=num_encoder_layers,
             dim_feedforward=d_model * 4,
-            dropout=dropout,
-            activation='relu',
-            batch_first=True
-        )
-
-        self.transformer_encoder = nn.TransformerEncoder(
-            encoder_layer,
-            num_layers=num_encoder_layers
+            dropout=dropout
         )
 
         self.transformer_fc = nn.Linear(d_model, 1)
@@ -161,36 +172,154 @@ class EnsemblePredictor(nn.Module):
                 nn.Softmax(dim=-1)
             )
 
-    def forward(self, x):
+        # Side streams for the three branches, created on first CUDA forward
+        self._branch_streams = None
+
+        # Pruning mask, recomputed only when the weights or threshold change
+        # (keeps the host sync out of CUDA graph capture)
+        self._prune_mask = None
+        self._prune_mask_key = None
+
+        # Softmaxed ensemble weights, reused while the raw weights are unchanged
+        self._weights_cache = None
+        self._weights_cache_key = None
+
+    def _current_weights(self) -> torch.Tensor:
+        """
+        Softmax of the ensemble weights
+
+        Outside training, when no autograd graph is needed (weights frozen
+        or grad disabled), the result is cached and only recomputed after
+        the weights are modified in place or moved to another device.
+        """
+        if self.training or (self.weights.requires_grad and torch.is_grad_enabled()):
+            return torch.softmax(self.weights, dim=0)
+
+        key = (self.weights.data_ptr(), self.weights._version)
+        if self._weights_cache_key != key:
+            with torch.no_grad():
+                self._weights_cache = torch.softmax(self.weights, dim=0)
+            self._weights_cache_key = key
+
+        return self._weights_cache
+
+    def __getstate__(self):
+        # CUDA streams cannot be copied or pickled; they are recreated lazily
+        state = self.__dict__.copy()
+        state['_branch_streams'] = None
+        return state
+
+    def _transformer_forward(self, x):
+        """Transformer branch: embedding + positions -> encoder -> last-step head"""
+        # Embedding GEMM with the positional add as its epilogue; a single
+        # fused kernel when the model is compiled with TorchInductor
+        transformer_embed = self.transformer_embedding(x) + self.pos_enc[:, :x.size(1)]
+        transformer_out = self.transformer_encoder(transformer_embed)
+        return self.transformer_fc(transformer_out[:, -1, :])
+
+    def _forward_branches_concurrent(self, x):
+        """
+        Run LSTM, GRU and Transformer on separate CUDA streams so their
+        kernels can overlap, then join back onto the current stream
+        """
+        if self._branch_streams is None:
+            self._branch_streams = [torch.cuda.Stream(device=x.device) for _ in range(3)]
+
+        current = torch.cuda.current_stream(x.device)
+        branches = (self.lstm, self.gru, self._transformer_forward)
+
+        # Under CUDA graph capture the graph's private pool owns the memory
+        capturing = torch.cuda.is_current_stream_capturing()
+
+        outputs = []
+        for stream, branch in zip(self._branch_streams, branches):
+            stream.wait_stream(current)
+            with torch.cuda.stream(stream):
+                if not capturing:
+                    x.record_stream(stream)
+                outputs.append(branch(x))
+
+        for stream, output in zip(self._branch_streams, outputs):
+            current.wait_stream(stream)
+            if not capturing:
+                output.record_stream(current)
+
+        return outputs
+
+    def _forward_pruned(self, x, return_individual: bool = False):
+        """
+        Inference path for the weighted ensemble: branches whose softmax
+        weight is at or below prune_threshold are not evaluated, and the
+        remaining weights are renormalized
+        """
+        weights = self._current_weights().detach()
+
+        key = (self.weights._version, self.prune_threshold)
+        if self._prune_mask_key != key:
+            keep = (weights > self.prune_threshold).tolist()
+            if not any(keep):
+                keep[int(torch.argmax(weights))] = True
+            self._prune_mask = keep
+            self._prune_mask_key = key
+        keep = self._prune_mask
+
+        branches = (
+            ('lstm', self.lstm),
+            ('gru', self.gru),
+            ('transformer', self._transformer_forward)
+        )
+
+        preds, used = {}, []
+        for i, (name, branch) in enumerate(branches):
+            if keep[i]:
+                preds[name] = branch(x)
+                used.append(i)
+
+        used_weights = weights[used]
+        used_weights = used_weights / used_weights.sum()
+        ensemble_pred = sum(w * pred for w, pred in zip(used_weights, preds.values()))
+
+        individual_preds = None
+        if return_individual:
+            individual_preds = {name: pred.detach() for name, pred in preds.items()}
+
+        return ensemble_pred, individual_preds
+
+    def forward(self, x, return_individual: bool = False, prune: bool = True):
         """
         Args:
             x: (batch_size, seq_length, input_dim)
+            return_individual: Also return the per-model predictions
+            prune: In eval mode, skip low-weight branches of the weighted
+                ensemble; validation passes False to score the full model
         Returns:
             predictions: (batch_size, 1)
-            individual_preds: Dictionary of individual model predictions
+            individual_preds: Dictionary of detached per-model prediction
+                tensors (left on the input device), or None
         """
-        # LSTM prediction
-        lstm_pred = self.lstm(x)
+        if self.ensemble_method == 'weighted' and prune and not self.training:
+            return self._forward_pruned(x, return_individual)
 
-        # GRU prediction
-        gru_pred = self.gru(x)
-
-        # Transformer prediction
-        transformer_embed = self.transformer_embedding(x)
-        transformer_out = self.transformer_encoder(transformer_embed)
-        transformer_pred = self.transformer_fc(transformer_out[:, -1, :])
+        if x.is_cuda:
+            lstm_pred, gru_pred, transformer_pred = self._forward_branches_concurrent(x)
+        else:
+            lstm_pred = self.lstm(x)
+            gru_pred = self.gru(x)
+            transformer_pred = self._transformer_forward(x)
 
         # Store individual predictions
-        individual_preds = {
-            'lstm': lstm_pred.detach().cpu().numpy(),
-            'gru': gru_pred.detach().cpu().numpy(),
-            'transformer': transformer_pred.detach().cpu().numpy()
-        }
+        individual_preds = None
+        if return_individual:
+            individual_preds = {
+                'lstm': lstm_pred.detach(),
+                'gru': gru_pred.detach(),
+                'transformer': transformer_pred.detach()
+            }
 
         # Ensemble combination
         if self.ensemble_method == 'weighted':
             # Weighted average
-            weights = torch.softmax(self.weights, dim=0)
+            weights = self._current_weights()
             ensemble_pred = (
                 weights[0] * lstm_pred +
                 weights[1] * gru_pred +
@@ -220,7 +349,7 @@ class EnsemblePredictor(nn.Module):
     def get_model_weights(self):
         """Get current ensemble weights"""
         if self.ensemble_method == 'weighted':
-            weights = torch.softmax(self.weights, dim=0)
+            weights = self._current_weights()
             return {
                 'lstm': weights[0].item(),
                 'gru': weights[1].item(),
@@ -237,24 +366,148 @@ class EnsembleTrainer:
     def __init__(
         self,
         model: EnsemblePredictor,
-        device: str = 'cpu'
+        device: str = 'cpu',
+        compile_model: bool = False
     ):
+        """
+        Args:
+            model: Ensemble model to train
+            device: Torch device string
+            compile_model: Compile the model with TorchInductor to fuse the
+                transformer's pointwise/softmax ops (slower first step)
+        """
         self.model = model.to(device)
         self.device = device
         self.optimizer = None
         self.criterion = nn.MSELoss()
+        self.q_model = None
+
+        # bf16 autocast on GPU (same exponent range as fp32, so no GradScaler)
+        self.use_amp = device.startswith('cuda')
+        if self.use_amp:
+            torch.backends.cuda.matmul.allow_tf32 = True
+            torch.backends.cudnn.allow_tf32 = True
+            torch.backends.cudnn.benchmark = True
+
+        # In-place compile keeps state_dict keys unchanged; no fullgraph
+        # because the cuDNN RNN branches graph-break
+        if compile_model:
+            torch.set_float32_matmul_precision('high')
+            self.model.compile(mode='reduce-overhead', fullgraph=False)
+
+        # CUDA graph for inference (reduce-overhead compile already uses graphs)
+        self.use_cuda_graph = device.startswith('cuda') and not compile_model
+        self._graph = None
+        self._static_input = None
+        self._static_output = None
+
+    def make_data_loader(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        batch_size: int = 32,
+        shuffle: bool = True,
+        num_workers: int = 4
+    ) -> DataLoader:
+        """
+        Create a DataLoader suited to the non-blocking transfers in
+        train_step/validate: pinned host batches on CUDA, persistent
+        workers and two batches prefetched per worker
+
+        Args:
+            X: Input sequences (n_samples, seq_length, n_features)
+            y: Targets (n_samples,)
+            batch_size: Batch size
+            shuffle: Shuffle samples every epoch
+            num_workers: Number of data loading workers
+
+        Returns:
+            DataLoader yielding (X_batch, y_batch) float tensors
+        """
+        dataset = TensorDataset(
+            torch.as_tensor(X, dtype=torch.float32),
+            torch.as_tensor(y, dtype=torch.float32)
+        )
+
+        worker_kwargs = {}
+        if num_workers > 0:
+            worker_kwargs = {'persistent_workers': True, 'prefetch_factor': 2}
+
+        return DataLoader(
+            dataset,
+            batch_size=batch_size,
+            shuffle=shuffle,
+            num_workers=num_workers,
+            pin_memory=self.device.startswith('cuda'),
+            **worker_kwargs
+        )
+
+    def _capture_graph(self, X: torch.Tensor):
+        """Capture one inference forward pass into a CUDA graph"""
+        self._static_input = X.clone()
+
+        # Warm up on a side stream so lazy init (cuDNN plans, streams,
+        # pruning mask) happens outside of capture
+        side_stream = torch.cuda.Stream()
+        side_stream.wait_stream(torch.cuda.current_stream())
+        with torch.cuda.stream(side_stream), torch.no_grad(), torch.amp.autocast(
+            device_type='cuda', dtype=torch.bfloat16, enabled=self.use_amp, cache_enabled=False
+        ):
+            for _ in range(3):
+                self.model(self._static_input)
+        torch.cuda.current_stream().wait_stream(side_stream)
+
+        self._graph = torch.cuda.CUDAGraph()
+        with torch.cuda.graph(self._graph), torch.no_grad(), torch.amp.autocast(
+            device_type='cuda', dtype=torch.bfloat16, enabled=self.use_amp, cache_enabled=False
+        ):
+            self._static_output, _ = self.model(self._static_input)
+
+    def predict(self, X: torch.Tensor) -> torch.Tensor:
+        """
+        Inference forward pass
+
+        On CUDA the ensemble is captured into a CUDA graph on the first call
+        (and whenever the input shape changes), then replayed so the ~30
+        kernel launches of the three backbones collapse into one
+
+        Args:
+            X: (batch_size, seq_length, input_dim)
+        Returns:
+            predictions: (batch_size, 1)
+        """
+        self.model.eval()
+        X = X.to(self.device)
+
+        if not self.use_cuda_graph:
+            with torch.no_grad():
+                predictions, _ = self.model(X)
+            return predictions
+
+        if self._graph is None or self._static_input.shape != X.shape:
+            self._capture_graph(X)
+
+        self._static_input.copy_(X)
+        self._graph.replay()
+
+        return self._static_output.clone()
 
     def train_step(self, X: torch.Tensor, y: torch.Tensor) -> float:
         """Single training step"""
         self.model.train()
 
-        X = X.to(self.device)
-        y = y.to(self.device)
+        # Weight updates can change the pruned branch set baked into the graph
+        self._graph = None
+
+        # Async H2D copies; overlap with compute when batches are pinned
+        X = X.to(self.device, non_blocking=True)
+        y = y.to(self.device, non_blocking=True)
 
         # Forward pass
         self.optimizer.zero_grad()
-        predictions, _ = self.model(X)
-        loss = self.criterion(predictions.squeeze(), y)
+        with torch.amp.autocast(device_type='cuda', dtype=torch.bfloat16, enabled=self.use_amp):
+            predictions, _ = self.model(X)
+            loss = self.criterion(predictions.squeeze(), y)
 
         # Backward pass
         loss.backward()
@@ -266,22 +519,47 @@ class EnsembleTrainer:
         """Validation step"""
         self.model.eval()
 
-        X = X.to(self.device)
-        y = y.to(self.device)
+        # Async H2D copies; overlap with compute when batches are pinned
+        X = X.to(self.device, non_blocking=True)
+        y = y.to(self.device, non_blocking=True)
 
-        with torch.no_grad():
-            predictions, individual_preds = self.model(X)
+        with torch.no_grad(), torch.amp.autocast(
+            device_type='cuda', dtype=torch.bfloat16, enabled=self.use_amp
+        ):
+            # Unpruned, so model selection scores the ensemble being trained
+            predictions, individual_preds = self.model(X, return_individual=True, prune=False)
             loss = self.criterion(predictions.squeeze(), y)
 
             # Calculate individual model losses
             individual_losses = {}
             for model_name, preds in individual_preds.items():
-                preds_tensor = torch.from_numpy(preds).to(self.device)
-                model_loss = self.criterion(preds_tensor.squeeze(), y)
+                model_loss = self.criterion(preds.squeeze(), y)
                 individual_losses[model_name] = model_loss.item()
 
         return loss.item(), individual_losses
 
+    def quantize_for_inference(self) -> nn.Module:
+        """
+        Build an int8 dynamically-quantized CPU copy of the model
+
+        LSTM, GRU and Linear weights are stored as int8 and activations are
+        quantized on the fly (VNNI int8 dot products on recent x86 CPUs).
+        cuDNN has no int8 RNN kernels, so the result is for CPU deployment
+        only; the training model is left untouched.
+
+        Returns:
+            Quantized model in eval mode (also stored as self.q_model)
+        """
+        cpu_model = copy.deepcopy(self.model).cpu().eval()
+
+        self.q_model = torch.ao.quantization.quantize_dynamic(
+            cpu_model,
+            {nn.LSTM, nn.GRU, nn.Linear},
+            dtype=torch.qint8
+        )
+
+        return self.q_model
+
     def train(
         self,
         train_loader,
@@ -315,20 +593,21 @@ class EnsembleTrainer:
 
         for epoch in range(epochs):
             # Training
-            train_losses = []
+            train_loss_sum, train_batches = 0.0, 0
             for X_batch, y_batch in train_loader:
-                loss = self.train_step(X_batch, y_batch)
-                train_losses.append(loss)
+                train_loss_sum += self.train_step(X_batch, y_batch)
+                train_batches += 1
 
-            avg_train_loss = np.mean(train_losses)
+            avg_train_loss = train_loss_sum / max(train_batches, 1)
 
             # Validation
-            val_losses = []
+            val_loss_sum, val_batches = 0.0, 0
             for X_batch, y_batch in val_loader:
                 val_loss, individual_losses = self.validate(X_batch, y_batch)
-                val_losses.append(val_loss)
+                val_loss_sum += val_loss
+                val_batches += 1
 
-            avg_val_loss = np.mean(val_losses)
+            avg_val_loss = val_loss_sum / max(val_batches, 1)
 
             # Learning rate scheduling
             scheduler.step(avg_val_loss)
@@ -391,7 +670,7 @@ if __name__ == "__main__":
     seq_length = 60
     dummy_input = torch.randn(batch_size, seq_length, input_dim)
 
-    ensemble_pred, individual_preds = model(dummy_input)
+    ensemble_pred, individual_preds = model(dummy_input, return_individual=True)
 
     print(f"\nForward Pass Test:")
     print(f"  Input Shape: {dummy_input.shape}")
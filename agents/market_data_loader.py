@@ -10,12 +10,69 @@ from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 import requests
 from pathlib import Path
+from functools import lru_cache
+from joblib import Parallel, delayed
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _sequence_kernel():
+    """
+    Build the Numba sequence/target kernel once
+
+    Returns None when numba is not installed, in which case
+    create_sequences uses NumPy stride tricks instead.
+    """
+    try:
+        import numba
+    except ImportError:
+        return None
+
+    @numba.njit(parallel=True, cache=True)
+    def make_sequences(features, close, sequence_length, prediction_horizon):
+        n_samples = features.shape[0] - sequence_length - prediction_horizon + 1
+        X = np.empty((n_samples, sequence_length, features.shape[1]), dtype=np.float32)
+        y = np.empty(n_samples, dtype=np.float32)
+
+        for i in numba.prange(n_samples):
+            X[i] = features[i:i + sequence_length]
+            current_price = close[i + sequence_length - 1]
+            future_price = close[i + sequence_length + prediction_horizon - 1]
+            y[i] = (future_price - current_price) / current_price
+
+        return X, y
+
+    return make_sequences
+
+
+def _wilder_average(values: pd.Series, period: int) -> pd.Series:
+    """
+    Wilder's moving average as TA-Lib computes it for RSI and ATR
+
+    Seeded with the simple mean of the first `period` values (leading NaNs
+    skipped), then smoothed recursively with alpha = 1 / period.
+
+    Args:
+        values: Input series
+        period: Smoothing period
+
+    Returns:
+        Smoothed series aligned with values, NaN until the seed is complete
+    """
+    arr = values.to_numpy(dtype=np.float64)
+    out = np.full(len(arr), np.nan)
+    valid = np.flatnonzero(~np.isnan(arr))
+    if len(valid) >= period:
+        first = valid[0]
+        seeded = arr[first + period - 1:].copy()
+        seeded[0] = arr[first:first + period].mean()
+        out[first + period - 1:] = pd.Series(seeded).ewm(alpha=1 / period, adjust=False).mean().to_numpy()
+    return pd.Series(out, index=values.index)
+
+
 class MarketDataLoader:
     """
     Loads real market data from multiple sources for Transformer training
@@ -26,6 +83,44 @@ class MarketDataLoader:
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.cache_duration = timedelta(hours=1)
 
+    def _cache_path(
+        self,
+        ticker: str,
+        start_date: str,
+        end_date: str,
+        interval: str,
+        suffix: str = ""
+    ) -> Path:
+        """Parquet cache location for one ticker/date-range/interval"""
+        return self.data_dir / f"{ticker}_{start_date}_{end_date}_{interval}{suffix}.parquet"
+
+    def _read_cache(self, path: Path) -> Optional[pd.DataFrame]:
+        """Return the cached frame if it exists and is younger than cache_duration"""
+        if not path.exists():
+            return None
+
+        modified = datetime.fromtimestamp(path.stat().st_mtime)
+        if modified <= datetime.now() - self.cache_duration:
+            return None
+
+        try:
+            return pd.read_parquet(path)
+        except ImportError:
+            logger.warning("pyarrow not installed, Parquet cache disabled. Install with: pip install pyarrow")
+        except Exception as e:
+            logger.warning(f"Could not read cache {path.name}: {e}")
+
+        return None
+
+    def _write_cache(self, df: pd.DataFrame, path: Path):
+        """Persist a frame to the Parquet cache (zstd-compressed)"""
+        try:
+            df.to_parquet(path, compression='zstd')
+        except ImportError:
+            logger.warning("pyarrow not installed, Parquet cache disabled. Install with: pip install pyarrow")
+        except Exception as e:
+            logger.warning(f"Could not write cache {path.name}: {e}")
+
     def fetch_stock_data(
         self,
         tickers: List[str],
@@ -48,28 +143,52 @@ class MarketDataLoader:
         logger.info(f"Fetching stock data for {len(tickers)} tickers from {start_date} to {end_date}")
 
         data = {}
+
+        # Serve fresh cached frames without touching the network
+        missing = []
         for ticker in tickers:
-            try:
-                df = yf.download(
-                    ticker,
-                    start=start_date,
-                    end=end_date,
-                    interval=interval,
-                    progress=False
-                )
-
-                if not df.empty:
-                    # Flatten multi-index columns if present
-                    if isinstance(df.columns, pd.MultiIndex):
-                        df.columns = df.columns.get_level_values(0)
-
-                    data[ticker] = df
-                    logger.info(f"✓ {ticker}: {len(df)} rows")
-                else:
+            cached = self._read_cache(self._cache_path(ticker, start_date, end_date, interval))
+            if cached is not None:
+                data[ticker] = cached
+                logger.info(f"✓ {ticker}: {len(cached)} rows (cached)")
+            else:
+                missing.append(ticker)
+
+        if not missing:
+            return data
+
+        # Single batched request; columns come back as (ticker, field)
+        try:
+            df_all = yf.download(
+                missing,
+                start=start_date,
+                end=end_date,
+                interval=interval,
+                group_by='ticker',
+                threads=True,
+                progress=False
+            )
+        except Exception as e:
+            logger.error(f"✗ {', '.join(missing)}: {str(e)}")
+            return data
+
+        for ticker in missing:
+            if isinstance(df_all.columns, pd.MultiIndex):
+                if ticker not in df_all.columns.get_level_values(0):
                     logger.warning(f"✗ {ticker}: No data available")
+                    continue
+                df = df_all[ticker]
+            else:
+                df = df_all
+
+            df = df.dropna(how='all')
 
-            except Exception as e:
-                logger.error(f"✗ {ticker}: {str(e)}")
+            if not df.empty:
+                data[ticker] = df.copy()
+                self._write_cache(data[ticker], self._cache_path(ticker, start_date, end_date, interval))
+                logger.info(f"✓ {ticker}: {len(df)} rows")
+            else:
+                logger.warning(f"✗ {ticker}: No data available")
 
         return data
 
@@ -111,6 +230,11 @@ class MarketDataLoader:
         """
         Add comprehensive technical indicators to price data
 
+        RSI, ATR, Stochastic and Bollinger Bands use TA-Lib's C kernels when
+        it is installed; otherwise pandas computes the same definitions
+        (Wilder smoothing for RSI/ATR, population std for the bands), so
+        features do not depend on the install.
+
         Args:
             df: DataFrame with OHLCV columns
 
@@ -119,6 +243,11 @@ class MarketDataLoader:
         """
         df = df.copy()
 
+        try:
+            import talib
+        except ImportError:
+            talib = None
+
         # Moving Averages
         df['SMA_10'] = df['Close'].rolling(window=10).mean()
         df['SMA_30'] = df['Close'].rolling(window=30).mean()
@@ -131,27 +260,44 @@ class MarketDataLoader:
         df['MACD_Signal'] = df['MACD'].ewm(span=9, adjust=False).mean()
         df['MACD_Hist'] = df['MACD'] - df['MACD_Signal']
 
+        # Raw float64 arrays for the TA-Lib kernels
+        high = df['High'].to_numpy(dtype=np.float64)
+        low = df['Low'].to_numpy(dtype=np.float64)
+        close = df['Close'].to_numpy(dtype=np.float64)
+
         # RSI
-        delta = df['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['RSI'] = 100 - (100 / (1 + rs))
+        if talib is not None:
+            df['RSI'] = talib.RSI(close, timeperiod=14)
+        else:
+            delta = df['Close'].diff()
+            gain = _wilder_average(delta.clip(lower=0), 14)
+            loss = _wilder_average((-delta).clip(lower=0), 14)
+            df['RSI'] = 100 * gain / (gain + loss)
 
         # Bollinger Bands
-        df['BB_Middle'] = df['Close'].rolling(window=20).mean()
-        bb_std = df['Close'].rolling(window=20).std()
-        df['BB_Upper'] = df['BB_Middle'] + (bb_std * 2)
-        df['BB_Lower'] = df['BB_Middle'] - (bb_std * 2)
+        if talib is not None:
+            upper, middle, lower = talib.BBANDS(
+                close, timeperiod=20, nbdevup=2, nbdevdn=2, matype=0
+            )
+            df['BB_Middle'], df['BB_Upper'], df['BB_Lower'] = middle, upper, lower
+        else:
+            df['BB_Middle'] = df['Close'].rolling(window=20).mean()
+            bb_std = df['Close'].rolling(window=20).std(ddof=0)
+            df['BB_Upper'] = df['BB_Middle'] + (bb_std * 2)
+            df['BB_Lower'] = df['BB_Middle'] - (bb_std * 2)
         df['BB_Width'] = (df['BB_Upper'] - df['BB_Lower']) / df['BB_Middle']
 
         # ATR (Average True Range)
-        high_low = df['High'] - df['Low']
-        high_close = np.abs(df['High'] - df['Close'].shift())
-        low_close = np.abs(df['Low'] - df['Close'].shift())
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        true_range = np.max(ranges, axis=1)
-        df['ATR'] = true_range.rolling(14).mean()
+        if talib is not None:
+            df['ATR'] = talib.ATR(high, low, close, timeperiod=14)
+        else:
+            high_low = df['High'] - df['Low']
+            high_close = np.abs(df['High'] - df['Close'].shift())
+            low_close = np.abs(df['Low'] - df['Close'].shift())
+            ranges = pd.concat([high_low, high_close, low_close], axis=1)
+            # The first bar has no previous close, so no true range
+            true_range = ranges.max(axis=1).where(df['Close'].shift().notna())
+            df['ATR'] = _wilder_average(true_range, 14)
 
         # Volume indicators
         df['Volume_SMA'] = df['Volume'].rolling(window=20).mean()
@@ -162,22 +308,23 @@ class MarketDataLoader:
         df['Log_Returns'] = np.log(df['Close'] / df['Close'].shift(1))
         df['Volatility'] = df['Returns'].rolling(window=20).std()
 
-        # Stochastic Oscillator
-        low_14 = df['Low'].rolling(window=14).min()
-        high_14 = df['High'].rolling(window=14).max()
-        df['Stochastic_K'] = 100 * ((df['Close'] - low_14) / (high_14 - low_14))
-        df['Stochastic_D'] = df['Stochastic_K'].rolling(window=3).mean()
-
-        # On-Balance Volume (OBV)
-        obv = [0]
-        for i in range(1, len(df)):
-            if df['Close'].iloc[i] > df['Close'].iloc[i-1]:
-                obv.append(obv[-1] + df['Volume'].iloc[i])
-            elif df['Close'].iloc[i] < df['Close'].iloc[i-1]:
-                obv.append(obv[-1] - df['Volume'].iloc[i])
-            else:
-                obv.append(obv[-1])
-        df['OBV'] = obv
+        # Stochastic Oscillator (fast %K and its 3-period SMA)
+        if talib is not None:
+            k, d = talib.STOCHF(
+                high, low, close, fastk_period=14, fastd_period=3, fastd_matype=0
+            )
+            df['Stochastic_K'], df['Stochastic_D'] = k, d
+        else:
+            low_14 = df['Low'].rolling(window=14).min()
+            high_14 = df['High'].rolling(window=14).max()
+            k = 100 * ((df['Close'] - low_14) / (high_14 - low_14))
+            d = k.rolling(window=3).mean()
+            # Like STOCHF, %K starts once %D is defined
+            df['Stochastic_K'], df['Stochastic_D'] = k.where(d.notna()), d
+
+        # On-Balance Volume (OBV): +volume on up-ticks, -volume on down-ticks
+        direction = np.sign(df['Close'].diff().fillna(0.0))
+        df['OBV'] = (direction * df['Volume']).cumsum()
 
         return df
 
@@ -208,19 +355,56 @@ class MarketDataLoader:
         # Remove NaN rows
         df = df.dropna()
 
-        X, y = [], []
+        features = df[feature_columns].to_numpy(dtype=np.float32)
+        close = df['Close'].to_numpy(dtype=np.float32)
+        n_samples = len(df) - sequence_length - prediction_horizon + 1
+
+        if n_samples <= 0:
+            return (
+                np.empty((0, sequence_length, len(feature_columns)), dtype=np.float32),
+                np.empty(0, dtype=np.float32)
+            )
+
+        # Numba: windows copied and targets computed in one parallel pass
+        kernel = _sequence_kernel()
+        if kernel is not None:
+            return kernel(features, close, sequence_length, prediction_horizon)
 
-        for i in range(len(df) - sequence_length - prediction_horizon + 1):
-            # Input sequence
-            X.append(df[feature_columns].iloc[i:i+sequence_length].values)
+        # Zero-copy (n_windows, sequence_length, n_features) view, materialized once
+        windows = np.lib.stride_tricks.sliding_window_view(
+            features, (sequence_length, features.shape[1])
+        )[:, 0]
+        X = np.ascontiguousarray(windows[:n_samples])
 
-            # Target (future returns)
-            future_price = df['Close'].iloc[i+sequence_length+prediction_horizon-1]
-            current_price = df['Close'].iloc[i+sequence_length-1]
-            future_return = (future_price - current_price) / current_price
-            y.append(future_return)
+        # Target (future returns)
+        current_price = close[sequence_length - 1:sequence_length - 1 + n_samples]
+        future_price = close[sequence_length + prediction_horizon - 1:]
+        y = (future_price - current_price) / current_price
 
-        return np.array(X), np.array(y)
+        return X, y
+
+    def _process_ticker(
+        self,
+        ticker: str,
+        df: pd.DataFrame,
+        start_date: str,
+        end_date: str,
+        interval: str,
+        sequence_length: int,
+        prediction_horizon: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Indicators (cached per ticker/date range) and sequences for one ticker"""
+        ta_cache = self._cache_path(ticker, start_date, end_date, interval, suffix="_ta")
+        df_ta = self._read_cache(ta_cache)
+        if df_ta is None:
+            df_ta = self.add_technical_indicators(df)
+            self._write_cache(df_ta, ta_cache)
+
+        return self.create_sequences(
+            df_ta,
+            sequence_length=sequence_length,
+            prediction_horizon=prediction_horizon
+        )
 
     def prepare_training_data(
         self,
@@ -229,11 +413,18 @@ class MarketDataLoader:
         end_date: str,
         sequence_length: int = 60,
         prediction_horizon: int = 1,
-        test_split: float = 0.2
+        test_split: float = 0.2,
+        interval: str = "1d",
+        n_jobs: int = -1
     ) -> Dict[str, np.ndarray]:
         """
         Comprehensive data preparation pipeline
 
+        Indicator frames are cached next to the raw OHLCV cache, so re-runs
+        over the same tickers and date range skip add_technical_indicators.
+        Tickers are processed in parallel worker processes (n_jobs=-1 uses
+        all cores, n_jobs=1 runs serially).
+
         Returns:
             Dictionary with keys: 'X_train', 'X_test', 'y_train', 'y_test'
         """
@@ -242,31 +433,27 @@ class MarketDataLoader:
         logger.info("=" * 60)
 
         # Fetch data
-        data = self.fetch_stock_data(tickers, start_date, end_date)
+        data = self.fetch_stock_data(tickers, start_date, end_date, interval)
 
         if not data:
             raise ValueError("No data fetched. Check tickers and date range.")
 
-        # Process each ticker
-        all_X, all_y = [], []
-
-        for ticker, df in data.items():
-            logger.info(f"\nProcessing {ticker}...")
-
-            # Add technical indicators
-            df = self.add_technical_indicators(df)
-
-            # Create sequences
-            X, y = self.create_sequences(
-                df,
-                sequence_length=sequence_length,
-                prediction_horizon=prediction_horizon
+        # Process tickers in parallel (independent frames, pure CPU work)
+        logger.info(f"\nProcessing {len(data)} tickers (n_jobs={n_jobs})...")
+        results = Parallel(n_jobs=n_jobs, backend='loky')(
+            delayed(self._process_ticker)(
+                ticker, df, start_date, end_date, interval,
+                sequence_length, prediction_horizon
             )
+            for ticker, df in data.items()
+        )
 
+        all_X, all_y = [], []
+        for ticker, (X, y) in zip(data, results):
             all_X.append(X)
             all_y.append(y)
 
-            logger.info(f"  Generated {len(X)} sequences with {X.shape[2]} features")
+            logger.info(f"  {ticker}: {len(X)} sequences with {X.shape[2]} features")
 
         # Combine all tickers
         X_combined = np.concatenate(all_X, axis=0)
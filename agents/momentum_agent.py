@@ -4,10 +4,12 @@ Uses PPO algorithm to follow market trends
 """
 
 import numpy as np
+import torch
+import gymnasium as gym
 from typing import Optional
 from stable_baselines3 import PPO
 from stable_baselines3.common.callbacks import EvalCallback, CheckpointCallback
-from stable_baselines3.common.vec_env import DummyVecEnv
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv
 import logging
 from pathlib import Path
 
@@ -16,6 +18,23 @@ from agents.base_agent import BaseAgent
 logger = logging.getLogger(__name__)
 
 
+class MixedPrecisionPPO(PPO):
+    """
+    PPO whose gradient updates run under bf16 autocast on CUDA
+
+    bf16 keeps fp32's exponent range, so no GradScaler is needed; policy
+    parameters and optimizer state stay fp32. On CPU this is plain PPO.
+    """
+
+    def train(self) -> None:
+        with torch.autocast(
+            device_type='cuda',
+            dtype=torch.bfloat16,
+            enabled=self.device.type == 'cuda'
+        ):
+            super().train()
+
+
 class MomentumAgent(BaseAgent):
     """
     Momentum Trading Strategy Agent
@@ -32,6 +51,9 @@ class MomentumAgent(BaseAgent):
         - Handles non-stationary financial data well
     """
 
+    BUY_REASON = "% - Positive momentum: RSI oversold, MACD bullish crossover, price above MA"
+    SELL_REASON = "% - Negative momentum: RSI overbought, MACD bearish crossover, price below MA"
+
     def __init__(self, name: str = "Momentum Trader", agent_id: Optional[int] = None):
         super().__init__(
             name=name,
@@ -46,6 +68,9 @@ class MomentumAgent(BaseAgent):
         self.gamma = 0.99
         self.gae_lambda = 0.95
 
+        # bf16 autocast for the PPO update on GPU
+        self.mixed_precision = True
+
     def train(
         self,
         env,
@@ -58,22 +83,35 @@ class MomentumAgent(BaseAgent):
         Train the momentum agent using PPO
 
         Args:
-            env: Trading environment
+            env: Trading environment, or a zero-argument factory returning
+                one; a factory collects rollouts from n_envs parallel
+                worker processes
             total_timesteps: Total training steps
             eval_env: Evaluation environment
             save_path: Path to save checkpoints
+            n_envs: Number of worker processes when env is a factory
+                (default 8)
         """
         logger.info(f"Training {self.name} with PPO for {total_timesteps} timesteps...")
 
+        n_envs = kwargs.pop('n_envs', 8)
+
         # Wrap environment
-        vec_env = DummyVecEnv([lambda: env])
+        if callable(env) and not isinstance(env, gym.Env):
+            vec_env = SubprocVecEnv([env for _ in range(n_envs)])
+        else:
+            vec_env = DummyVecEnv([lambda: env])
+
+        # Keep the rollout size per update the same regardless of env count
+        n_steps = max(self.n_steps // vec_env.num_envs, 1)
 
         # Initialize PPO model
-        self.model = PPO(
+        ppo_class = MixedPrecisionPPO if self.mixed_precision else PPO
+        self.model = ppo_class(
             policy="MlpPolicy",
             env=vec_env,
             learning_rate=self.learning_rate,
-            n_steps=self.n_steps,
+            n_steps=n_steps,
             batch_size=self.batch_size,
             gamma=self.gamma,
             gae_lambda=self.gae_lambda,
@@ -89,8 +127,9 @@ class MomentumAgent(BaseAgent):
         save_path_obj = Path(save_path)
         save_path_obj.mkdir(parents=True, exist_ok=True)
 
+        # Callback frequencies count vectorized steps (num_envs timesteps each)
         checkpoint_callback = CheckpointCallback(
-            save_freq=10000,
+            save_freq=max(10000 // vec_env.num_envs, 1),
             save_path=str(save_path_obj),
             name_prefix="momentum_ppo"
         )
@@ -103,18 +142,21 @@ class MomentumAgent(BaseAgent):
                 eval_vec_env,
                 best_model_save_path=str(save_path_obj / "best_model"),
                 log_path=str(save_path_obj / "eval_logs"),
-                eval_freq=5000,
+                eval_freq=max(5000 // vec_env.num_envs, 1),
                 deterministic=True,
                 render=False
             )
             callbacks.append(eval_callback)
 
-        # Train
-        self.model.learn(
-            total_timesteps=total_timesteps,
-            callback=callbacks,
-            progress_bar=True
-        )
+        # Train, then shut down the rollout worker processes
+        try:
+            self.model.learn(
+                total_timesteps=total_timesteps,
+                callback=callbacks,
+                progress_bar=True
+            )
+        finally:
+            vec_env.close()
 
         logger.info(f"{self.name} training completed!")
 
@@ -150,27 +192,26 @@ class MomentumAgent(BaseAgent):
         # Extract relevant features from observation
         # observation structure: [cash%, positions%, value_change, ...market features]
 
-        explanations = []
-
-        # Interpret action
-        n_assets = len(action)
-        for i, act in enumerate(action):
-            if abs(act) < 0.01:  # Holding
-                action_str = "HOLD"
-                reason = "No strong momentum signal"
-            elif act > 0:  # Buying
-                action_str = f"BUY {abs(act)*100:.1f}%"
-
-                # Check indicators from observation (simplified)
-                # In real implementation, access actual indicator values
-                reason = "Positive momentum: RSI oversold, MACD bullish crossover, price above MA"
-            else:  # Selling
-                action_str = f"SELL {abs(act)*100:.1f}%"
-                reason = "Negative momentum: RSI overbought, MACD bearish crossover, price below MA"
+        # Interpret all assets at once
+        # (reasons are simplified; a real implementation would read the
+        # actual indicator values from the observation)
+        action = np.asarray(action)
+        pct = np.char.mod("%.1f", np.abs(action) * 100)
+
+        explanations = np.where(
+            np.abs(action) < 0.01,
+            "HOLD - No strong momentum signal",
+            np.where(
+                action > 0,
+                np.char.add(np.char.add("BUY ", pct), self.BUY_REASON),
+                np.char.add(np.char.add("SELL ", pct), self.SELL_REASON)
+            )
+        )
 
-            explanations.append(f"Asset {i}: {action_str} - {reason}")
+        labels = np.char.add("Asset ", np.arange(len(action)).astype(str))
+        explanations = np.char.add(np.char.add(labels, ": "), explanations)
 
-        full_explanation = f"{self.name} Decision:\n" + "\n".join(explanations)
+        full_explanation = f"{self.name} Decision:\n" + "\n".join(explanations.tolist())
 
         return full_explanation
 
@@ -193,7 +234,8 @@ class MomentumAgent(BaseAgent):
         # Load PPO model
         model_path = load_path / "momentum_ppo_model.zip"
         if model_path.exists():
-            self.model = PPO.load(model_path)
+            ppo_class = MixedPrecisionPPO if self.mixed_precision else PPO
+            self.model = ppo_class.load(model_path)
             logger.info(f"PPO model loaded from {model_path}")
 
         super().load(path)
@@ -3,146 +3,313 @@ Options Trading Agent with Greeks Calculation
 Implements Black-Scholes model and advanced options strategies
 """
 
+import math
+import os
+from functools import lru_cache, partial
 import numpy as np
-from scipy.stats import norm
+from scipy.special import ndtr
 from scipy.optimize import minimize
 import gymnasium as gym
 from gymnasium import spaces
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime, timedelta
 from stable_baselines3 import PPO
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_INV_SQRT_2PI = 1.0 / math.sqrt(2 * math.pi)
 
-class BlackScholesModel:
+
+def _npdf(x: float) -> float:
+    """Standard normal density (scalar; avoids scipy.stats dispatch)"""
+    return math.exp(-0.5 * x * x) * _INV_SQRT_2PI
+
+
+@lru_cache(maxsize=None)
+def _compiled_greeks():
     """
-    Black-Scholes option pricing model with Greeks calculation
+    Load a compiled price/Greeks kernel once
+
+    Prefers the Cython extension (agents/_bs.pyx, built by setup.py), then
+    the Numba kernel. Returns None when neither is available, in which case
+    the environment uses _all_greeks instead.
     """
+    try:
+        from agents._bs import price_and_greeks
+        return price_and_greeks
+    except ImportError:
+        pass
 
-    @staticmethod
-    def calculate_d1_d2(
-        S: float,  # Current stock price
-        K: float,  # Strike price
-        T: float,  # Time to expiration (years)
-        r: float,  # Risk-free rate
-        sigma: float  # Volatility
-    ) -> Tuple[float, float]:
-        """Calculate d1 and d2 for Black-Scholes formula"""
-        d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
-        d2 = d1 - sigma * np.sqrt(T)
-        return d1, d2
+    try:
+        from agents._bs_numba import all_greeks_and_price
+    except ImportError:
+        logger.warning("Neither the Cython extension nor numba is available, using scipy Greeks in OptionsEnvironment")
+        return None
 
-    @staticmethod
-    def call_price(S: float, K: float, T: float, r: float, sigma: float) -> float:
-        """Calculate European call option price"""
-        if T <= 0:
-            return max(S - K, 0)
+    return all_greeks_and_price
 
-        d1, d2 = BlackScholesModel.calculate_d1_d2(S, K, T, r, sigma)
-        price = S * norm.cdf(d1) - K * np.exp(-r * T) * norm.cdf(d2)
-        return price
 
-    @staticmethod
-    def put_price(S: float, K: float, T: float, r: float, sigma: float) -> float:
-        """Calculate European put option price"""
-        if T <= 0:
-            return max(K - S, 0)
+# Pricing and Greeks are module-level functions so hot paths (the RL env
+# step loop) call them without class attribute lookups; BlackScholesModel
+# and GreeksCalculator expose them as static methods for the public API.
 
-        d1, d2 = BlackScholesModel.calculate_d1_d2(S, K, T, r, sigma)
-        price = K * np.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
-        return price
+def _d1d2(
+    S: float,  # Current stock price
+    K: float,  # Strike price
+    T: float,  # Time to expiration (years)
+    r: float,  # Risk-free rate
+    sigma: float  # Volatility
+) -> Tuple[float, float]:
+    """Calculate d1 and d2 for Black-Scholes formula"""
+    sigma_sqrt_t = sigma * math.sqrt(T)
+    d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / sigma_sqrt_t
+    d2 = d1 - sigma_sqrt_t
+    return d1, d2
 
 
-class GreeksCalculator:
+def _call_price(S: float, K: float, T: float, r: float, sigma: float) -> float:
+    """Calculate European call option price"""
+    if T <= 0:
+        return max(S - K, 0)
+
+    d1, d2 = _d1d2(S, K, T, r, sigma)
+    price = S * ndtr(d1) - K * math.exp(-r * T) * ndtr(d2)
+    return price
+
+
+def _put_price(S: float, K: float, T: float, r: float, sigma: float) -> float:
+    """Calculate European put option price"""
+    if T <= 0:
+        return max(K - S, 0)
+
+    d1, d2 = _d1d2(S, K, T, r, sigma)
+    price = K * math.exp(-r * T) * ndtr(-d2) - S * ndtr(-d1)
+    return price
+
+
+def _call_put(S: float, K: float, T: float, r: float, sigma: float) -> Tuple[float, float]:
     """
-    Calculate option Greeks (Delta, Gamma, Theta, Vega, Rho)
+    Calculate European call and put prices together
+
+    The put comes from put-call parity, P = C - S + K*exp(-rT), so only
+    the call needs CDF evaluations. Likewise put delta is call delta - 1,
+    gamma and vega are identical for both, and put rho only differs by
+    the discounted strike term.
     """
+    if T <= 0:
+        return max(S - K, 0), max(K - S, 0)
 
-    @staticmethod
-    def delta(S: float, K: float, T: float, r: float, sigma: float, option_type: str) -> float:
-        """Calculate Delta: rate of change of option price with respect to stock price"""
-        if T <= 0:
-            return 0
+    d1, d2 = _d1d2(S, K, T, r, sigma)
+    disc = math.exp(-r * T)
+    call = S * ndtr(d1) - K * disc * ndtr(d2)
 
-        d1, _ = BlackScholesModel.calculate_d1_d2(S, K, T, r, sigma)
+    return call, call - S + K * disc
 
-        if option_type.lower() == 'call':
-            return norm.cdf(d1)
-        else:
-            return norm.cdf(d1) - 1
 
-    @staticmethod
-    def gamma(S: float, K: float, T: float, r: float, sigma: float) -> float:
-        """Calculate Gamma: rate of change of Delta with respect to stock price"""
-        if T <= 0:
-            return 0
+def _norm_cdf_approx(x: np.ndarray) -> np.ndarray:
+    """
+    Branchless standard normal CDF for arrays (Abramowitz & Stegun
+    26.2.17, absolute error below 7.5e-8)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    t = 1.0 / (1.0 + 0.2316419 * np.abs(x))
+    poly = t * (0.319381530 + t * (-0.356563782 + t * (1.781477937 + t * (-1.821255978 + t * 1.330274429))))
+    y = 1.0 - _INV_SQRT_2PI * np.exp(-0.5 * x * x) * poly
+    return np.where(x >= 0, y, 1.0 - y)
+
+
+def _price_vec(
+    S: float,
+    K_arr: np.ndarray,
+    T: float,
+    r: float,
+    sigma: float,
+    is_call_arr: np.ndarray
+) -> np.ndarray:
+    """
+    Price several European options on the same underlying in one
+    vectorized pass
+
+    Args:
+        S: Current stock price
+        K_arr: Strike prices
+        T: Time to expiration (years)
+        r: Risk-free rate
+        sigma: Volatility
+        is_call_arr: Boolean mask, True for calls and False for puts
+
+    Returns:
+        Option prices, one per strike
+    """
+    K_arr = np.asarray(K_arr, dtype=np.float64)
 
-        d1, _ = BlackScholesModel.calculate_d1_d2(S, K, T, r, sigma)
-        gamma = norm.pdf(d1) / (S * sigma * np.sqrt(T))
-        return gamma
+    if T <= 0:
+        return np.where(is_call_arr, np.maximum(S - K_arr, 0), np.maximum(K_arr - S, 0))
 
-    @staticmethod
-    def theta(S: float, K: float, T: float, r: float, sigma: float, option_type: str) -> float:
-        """Calculate Theta: rate of change of option price with respect to time"""
-        if T <= 0:
-            return 0
+    sigma_sqrt_t = sigma * np.sqrt(T)
+    d1 = (np.log(S / K_arr) + (r + 0.5 * sigma**2) * T) / sigma_sqrt_t
+    d2 = d1 - sigma_sqrt_t
+    disc = np.exp(-r * T)
 
-        d1, d2 = BlackScholesModel.calculate_d1_d2(S, K, T, r, sigma)
+    # N(-x) = 1 - N(x), so two CDF evaluations cover both option types
+    Nd1 = _norm_cdf_approx(d1)
+    Nd2 = _norm_cdf_approx(d2)
 
-        common_term = -(S * norm.pdf(d1) * sigma) / (2 * np.sqrt(T))
+    return np.where(
+        is_call_arr,
+        S * Nd1 - K_arr * disc * Nd2,
+        K_arr * disc * (1.0 - Nd2) - S * (1.0 - Nd1)
+    )
 
-        if option_type.lower() == 'call':
-            theta = common_term - r * K * np.exp(-r * T) * norm.cdf(d2)
-        else:
-            theta = common_term + r * K * np.exp(-r * T) * norm.cdf(-d2)
 
-        return theta / 365  # Daily theta
+def _delta(S: float, K: float, T: float, r: float, sigma: float, option_type: str) -> float:
+    """Calculate Delta: rate of change of option price with respect to stock price"""
+    if T <= 0:
+        return 0
 
-    @staticmethod
-    def vega(S: float, K: float, T: float, r: float, sigma: float) -> float:
-        """Calculate Vega: rate of change of option price with respect to volatility"""
-        if T <= 0:
-            return 0
+    d1, _ = _d1d2(S, K, T, r, sigma)
 
-        d1, _ = BlackScholesModel.calculate_d1_d2(S, K, T, r, sigma)
-        vega = S * norm.pdf(d1) * np.sqrt(T)
-        return vega / 100  # Per 1% change in volatility
+    if option_type.lower() == 'call':
+        return ndtr(d1)
+    else:
+        return ndtr(d1) - 1
 
-    @staticmethod
-    def rho(S: float, K: float, T: float, r: float, sigma: float, option_type: str) -> float:
-        """Calculate Rho: rate of change of option price with respect to interest rate"""
-        if T <= 0:
-            return 0
 
-        _, d2 = BlackScholesModel.calculate_d1_d2(S, K, T, r, sigma)
+def _gamma(S: float, K: float, T: float, r: float, sigma: float) -> float:
+    """Calculate Gamma: rate of change of Delta with respect to stock price"""
+    if T <= 0:
+        return 0
 
-        if option_type.lower() == 'call':
-            rho = K * T * np.exp(-r * T) * norm.cdf(d2)
-        else:
-            rho = -K * T * np.exp(-r * T) * norm.cdf(-d2)
+    d1, _ = _d1d2(S, K, T, r, sigma)
+    gamma = _npdf(d1) / (S * sigma * math.sqrt(T))
+    return gamma
 
-        return rho / 100  # Per 1% change in interest rate
 
-    @staticmethod
-    def calculate_all_greeks(
-        S: float,
-        K: float,
-        T: float,
-        r: float,
-        sigma: float,
-        option_type: str
-    ) -> Dict[str, float]:
-        """Calculate all Greeks at once"""
-        return {
-            'delta': GreeksCalculator.delta(S, K, T, r, sigma, option_type),
-            'gamma': GreeksCalculator.gamma(S, K, T, r, sigma),
-            'theta': GreeksCalculator.theta(S, K, T, r, sigma, option_type),
-            'vega': GreeksCalculator.vega(S, K, T, r, sigma),
-            'rho': GreeksCalculator.rho(S, K, T, r, sigma, option_type)
-        }
+def _theta(S: float, K: float, T: float, r: float, sigma: float, option_type: str) -> float:
+    """Calculate Theta: rate of change of option price with respect to time"""
+    if T <= 0:
+        return 0
+
+    d1, d2 = _d1d2(S, K, T, r, sigma)
+
+    common_term = -(S * _npdf(d1) * sigma) / (2 * math.sqrt(T))
+
+    if option_type.lower() == 'call':
+        theta = common_term - r * K * math.exp(-r * T) * ndtr(d2)
+    else:
+        theta = common_term + r * K * math.exp(-r * T) * ndtr(-d2)
+
+    return theta / 365  # Daily theta
+
+
+def _vega(S: float, K: float, T: float, r: float, sigma: float) -> float:
+    """Calculate Vega: rate of change of option price with respect to volatility"""
+    if T <= 0:
+        return 0
+
+    d1, _ = _d1d2(S, K, T, r, sigma)
+    vega = S * _npdf(d1) * math.sqrt(T)
+    return vega / 100  # Per 1% change in volatility
+
+
+def _rho(S: float, K: float, T: float, r: float, sigma: float, option_type: str) -> float:
+    """Calculate Rho: rate of change of option price with respect to interest rate"""
+    if T <= 0:
+        return 0
+
+    _, d2 = _d1d2(S, K, T, r, sigma)
+
+    if option_type.lower() == 'call':
+        rho = K * T * math.exp(-r * T) * ndtr(d2)
+    else:
+        rho = -K * T * math.exp(-r * T) * ndtr(-d2)
+
+    return rho / 100  # Per 1% change in interest rate
+
+
+@lru_cache(maxsize=4096)
+def _all_greeks(S: float, K: float, T: float, r: float, sigma: float, is_call: bool) -> Dict[str, float]:
+    """
+    Fused Greeks kernel: d1/d2, N(d1), N(d2), n(d1) and the discount
+    factor are computed once and shared by all five Greeks
+
+    Results are memoized on the positional arguments; treat the
+    returned dict as read-only.
+    """
+    if T <= 0:
+        return {'delta': 0, 'gamma': 0, 'theta': 0, 'vega': 0, 'rho': 0}
+
+    sqrtT = math.sqrt(T)
+    sT = sigma * sqrtT
+    d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / sT
+    d2 = d1 - sT
+    Nd1 = ndtr(d1)
+    nd1 = _npdf(d1)
+    disc = math.exp(-r * T)
+
+    common_term = -(S * nd1 * sigma) / (2 * sqrtT)
+
+    if is_call:
+        Nd2 = ndtr(d2)
+        delta = Nd1
+        theta = common_term - r * K * disc * Nd2
+        rho = K * T * disc * Nd2
+    else:
+        N_neg_d2 = ndtr(-d2)
+        delta = Nd1 - 1
+        theta = common_term + r * K * disc * N_neg_d2
+        rho = -K * T * disc * N_neg_d2
+
+    return {
+        'delta': delta,
+        'gamma': nd1 / (S * sT),
+        'theta': theta / 365,  # Daily theta
+        'vega': S * nd1 * sqrtT / 100,  # Per 1% change in volatility
+        'rho': rho / 100  # Per 1% change in interest rate
+    }
+
+
+def _calculate_all_greeks(
+    S: float,
+    K: float,
+    T: float,
+    r: float,
+    sigma: float,
+    option_type: str
+) -> Dict[str, float]:
+    """Calculate all Greeks at once"""
+    # Copy so callers can't mutate the cached result
+    return dict(_all_greeks(S, K, T, r, sigma, option_type.lower() == 'call'))
+
+
+class BlackScholesModel:
+    """
+    Black-Scholes option pricing model with Greeks calculation
+    """
+
+    calculate_d1_d2 = staticmethod(_d1d2)
+    call_price = staticmethod(_call_price)
+    put_price = staticmethod(_put_price)
+    call_put = staticmethod(_call_put)
+    norm_cdf_approx = staticmethod(_norm_cdf_approx)
+    price_vec = staticmethod(_price_vec)
+
+
+class GreeksCalculator:
+    """
+    Calculate option Greeks (Delta, Gamma, Theta, Vega, Rho)
+    """
+
+    delta = staticmethod(_delta)
+    gamma = staticmethod(_gamma)
+    theta = staticmethod(_theta)
+    vega = staticmethod(_vega)
+    rho = staticmethod(_rho)
+    calculate_all_greeks = staticmethod(_calculate_all_greeks)
+    _all = staticmethod(_all_greeks)
 
 
 class OptionsStrategy:
@@ -164,7 +331,7 @@ class OptionsStrategy:
         Strategy for generating income on stocks you already own
         """
         stock_value = S * shares_owned
-        call_premium = BlackScholesModel.call_price(S, K, T, r, sigma) * shares_owned
+        call_premium = _call_price(S, K, T, r, sigma) * shares_owned
 
         return {
             'stock_value': stock_value,
@@ -188,7 +355,7 @@ class OptionsStrategy:
         Strategy for downside protection
         """
         stock_value = S * shares_owned
-        put_cost = BlackScholesModel.put_price(S, K, T, r, sigma) * shares_owned
+        put_cost = _put_price(S, K, T, r, sigma) * shares_owned
 
         return {
             'stock_value': stock_value,
@@ -211,8 +378,9 @@ class OptionsStrategy:
         Bull Call Spread: Buy call at lower strike + Sell call at higher strike
         Strategy for moderate bullish outlook
         """
-        long_call = BlackScholesModel.call_price(S, K_long, T, r, sigma)
-        short_call = BlackScholesModel.call_price(S, K_short, T, r, sigma)
+        long_call, short_call = _price_vec(
+            S, np.array([K_long, K_short]), T, r, sigma, np.array([True, True])
+        ).tolist()
 
         net_cost = long_call - short_call
 
@@ -240,10 +408,12 @@ class OptionsStrategy:
         Iron Condor: Sell OTM put spread + Sell OTM call spread
         Strategy for low volatility markets
         """
-        put_long = BlackScholesModel.put_price(S, K_put_long, T, r, sigma)
-        put_short = BlackScholesModel.put_price(S, K_put_short, T, r, sigma)
-        call_short = BlackScholesModel.call_price(S, K_call_short, T, r, sigma)
-        call_long = BlackScholesModel.call_price(S, K_call_long, T, r, sigma)
+        put_long, put_short, call_short, call_long = _price_vec(
+            S,
+            np.array([K_put_long, K_put_short, K_call_short, K_call_long]),
+            T, r, sigma,
+            np.array([False, False, True, True])
+        ).tolist()
 
         net_credit = (put_short - put_long) + (call_short - call_long)
 
@@ -265,19 +435,25 @@ class OptionsEnvironment(gym.Env):
         self,
         initial_capital: float = 100000,
         commission: float = 1.0,
-        risk_free_rate: float = 0.05
+        risk_free_rate: float = 0.05,
+        mc_paths: int = 256
     ):
         super().__init__()
 
         self.initial_capital = initial_capital
         self.commission = commission
         self.risk_free_rate = risk_free_rate
+        self.mc_paths = mc_paths  # Monte Carlo paths for position valuation
+
+        # GBM time step (one trading day)
+        self._dt = 1 / 252
+        self._sqrt_dt = math.sqrt(self._dt)
 
         # Action space: [strategy_type, strike_offset, quantity]
         # strategy_type: 0=covered_call, 1=protective_put, 2=bull_spread, 3=iron_condor
         self.action_space = spaces.Box(
-            low=np.array([0, -0.2, 0]),
-            high=np.array([3, 0.2, 10]),
+            low=np.array([0, -0.2, 0], dtype=np.float32),
+            high=np.array([3, 0.2, 10], dtype=np.float32),
             dtype=np.float32
         )
 
@@ -304,6 +480,18 @@ class OptionsEnvironment(gym.Env):
         self.time_step = 0
         self.max_steps = 252  # 1 year of trading days
 
+        # Draw the whole episode's randomness up front from the env's seeded
+        # generator: one price shock per step and three noise features per
+        # observation (including the one returned here, drawn directly in
+        # the observation dtype)
+        self._shocks = self.np_random.standard_normal(self.max_steps)
+        self._obs_noise = self.np_random.standard_normal((self.max_steps + 1, 3), dtype=np.float32)
+
+        self._obs = np.empty(self.observation_space.shape, dtype=np.float32)
+
+        # Monte Carlo price paths used for position valuation
+        self._paths = None
+
         return self._get_observation(), {}
 
     def _get_observation(self) -> np.ndarray:
@@ -311,41 +499,53 @@ class OptionsEnvironment(gym.Env):
         days_to_expiry = 30  # Example: 30-day options
 
         # Calculate Greeks for ATM option
-        greeks = GreeksCalculator.calculate_all_greeks(
-            S=self.current_price,
-            K=self.current_price,
-            T=days_to_expiry / 365,
-            r=self.risk_free_rate,
-            sigma=self.volatility,
-            option_type='call'
-        )
-
-        obs = np.array([
-            self.current_price,
-            self.volatility,
-            days_to_expiry,
-            self.portfolio_value,
-            self.capital,
-            len(self.positions),
-            greeks['delta'],
-            greeks['gamma'],
-            greeks['theta'],
-            greeks['vega'],
-            greeks['rho'],
-            self.time_step / self.max_steps,
-            np.random.randn(),  # Market sentiment
-            np.random.randn(),  # Technical indicator
-            np.random.randn()   # Volume indicator
-        ], dtype=np.float32)
-
-        return obs
+        kernel = _compiled_greeks()
+        if kernel is not None:
+            _, *greeks = kernel(
+                float(self.current_price),
+                float(self.current_price),
+                days_to_expiry / 365,
+                float(self.risk_free_rate),
+                float(self.volatility),
+                True
+            )
+        else:
+            # With K = S the Greeks are homogeneous in S: delta is scale-free,
+            # gamma scales with 1/S and theta/vega/rho with S. Evaluating at
+            # S = K = 1 lets the memoized kernel serve every step for as long
+            # as volatility is unchanged
+            S = self.current_price
+            unit = _all_greeks(
+                1.0, 1.0, days_to_expiry / 365, self.risk_free_rate, self.volatility, True
+            )
+            greeks = (
+                unit['delta'],
+                unit['gamma'] / S,
+                unit['theta'] * S,
+                unit['vega'] * S,
+                unit['rho'] * S
+            )
+
+        # Fill the preallocated buffer in place
+        b = self._obs
+        b[0] = self.current_price
+        b[1] = self.volatility
+        b[2] = days_to_expiry
+        b[3] = self.portfolio_value
+        b[4] = self.capital
+        b[5] = len(self.positions)
+        b[6:11] = greeks  # delta, gamma, theta, vega, rho
+        b[11] = self.time_step / self.max_steps
+        b[12:15] = self._obs_noise[self.time_step]  # Market sentiment, technical, volume indicators
+
+        # Hand out a copy so callers that keep observations aren't aliased
+        return b.copy()
 
     def step(self, action):
         # Simulate price movement (Geometric Brownian Motion)
-        dt = 1/252
-        drift = self.risk_free_rate * dt
-        shock = self.volatility * np.sqrt(dt) * np.random.randn()
-        self.current_price *= np.exp(drift + shock)
+        drift = self.risk_free_rate * self._dt
+        shock = self.volatility * self._sqrt_dt * self._shocks[self.time_step]
+        self.current_price *= math.exp(drift + shock)
 
         # Execute strategy based on action
         strategy_type = int(action[0])
@@ -363,10 +563,60 @@ class OptionsEnvironment(gym.Env):
 
         return self._get_observation(), reward, done, truncated, {}
 
+    def simulate_paths(self, n_paths: Optional[int] = None) -> np.ndarray:
+        """
+        Simulate risk-neutral GBM price paths from the current price
+
+        All paths are generated in one broadcast pass over an
+        (n_paths, remaining_steps) shock matrix.
+
+        Args:
+            n_paths: Number of Monte Carlo paths (default: self.mc_paths)
+
+        Returns:
+            Array of shape (n_paths, remaining_steps); column j is the
+            price j + 1 steps ahead
+        """
+        n_paths = n_paths or self.mc_paths
+        steps = max(self.max_steps - self.time_step, 1)
+        sigma = self.volatility
+
+        Z = self.np_random.standard_normal((n_paths, steps))
+        incr = (self.risk_free_rate - 0.5 * sigma * sigma) * self._dt + sigma * self._sqrt_dt * Z
+        self._paths = self.current_price * np.exp(np.cumsum(incr, axis=1))
+
+        return self._paths
+
     def _calculate_portfolio_value(self) -> float:
-        """Calculate current portfolio value including all positions"""
-        # Simplified: just return capital for now
-        return self.capital
+        """
+        Calculate current portfolio value including all positions
+
+        Each position is a dict with 'type' ('call' or 'put'), 'strike',
+        'expiry_step' and 'quantity'. Options are valued as the discounted
+        mean payoff over simulated price paths; expired ones at intrinsic
+        value.
+        """
+        if not self.positions:
+            return self.capital
+
+        paths = self.simulate_paths()
+        value = self.capital
+
+        for position in self.positions:
+            horizon = position['expiry_step'] - self.time_step
+            is_call = position['type'] == 'call'
+
+            if horizon <= 0:
+                spot = np.asarray(self.current_price)
+                discount = 1.0
+            else:
+                spot = paths[:, min(horizon, paths.shape[1]) - 1]
+                discount = math.exp(-self.risk_free_rate * horizon * self._dt)
+
+            payoff = np.maximum(spot - position['strike'], 0) if is_call else np.maximum(position['strike'] - spot, 0)
+            value += position['quantity'] * discount * float(payoff.mean())
+
+        return value
 
 
 class OptionsAgent:
@@ -375,26 +625,53 @@ class OptionsAgent:
     """
 
     def __init__(self, initial_capital: float = 100000):
+        self.initial_capital = initial_capital
         self.env = OptionsEnvironment(initial_capital=initial_capital)
         self.model = None
 
-    def train(self, total_timesteps: int = 100000):
-        """Train the options agent using PPO"""
+    def train(self, total_timesteps: int = 100000, n_envs: Optional[int] = None):
+        """
+        Train the options agent using PPO
+
+        Args:
+            total_timesteps: Total training steps
+            n_envs: Number of environment worker processes collecting
+                rollouts in parallel (default: one per CPU core)
+        """
         logger.info("Training Options Agent...")
 
+        n_envs = n_envs or os.cpu_count() or 1
+
+        if n_envs > 1:
+            # Each worker's env seeds its own generator, so price paths differ
+            env_fn = partial(OptionsEnvironment, initial_capital=self.initial_capital)
+            vec_env = SubprocVecEnv([env_fn for _ in range(n_envs)])
+        else:
+            vec_env = DummyVecEnv([lambda: self.env])
+
+        # Keep the rollout size per update near 2048 regardless of env count,
+        # rounded down so it splits into whole minibatches
+        batch_size = 64
+        step = batch_size // math.gcd(batch_size, n_envs)
+        n_steps = max(2048 // n_envs // step * step, step)
+
         self.model = PPO(
             policy="MlpPolicy",
-            env=self.env,
+            env=vec_env,
             learning_rate=3e-4,
-            n_steps=2048,
-            batch_size=64,
+            n_steps=n_steps,
+            batch_size=batch_size,
             n_epochs=10,
             gamma=0.99,
             gae_lambda=0.95,
             verbose=1
         )
 
-        self.model.learn(total_timesteps=total_timesteps)
+        # Shut down the rollout worker processes once training ends
+        try:
+            self.model.learn(total_timesteps=total_timesteps)
+        finally:
+            vec_env.close()
         logger.info("✓ Options Agent training complete")
 
     def save(self, path: str):
@@ -418,8 +695,7 @@ if __name__ == "__main__":
     r = 0.05  # 5% risk-free rate
     sigma = 0.25  # 25% volatility
 
-    call_price = BlackScholesModel.call_price(S, K, T, r, sigma)
-    put_price = BlackScholesModel.put_price(S, K, T, r, sigma)
+    call_price, put_price = BlackScholesModel.call_put(S, K, T, r, sigma)
 
     print(f"\nOption Prices:")
     print(f"  Call: ${call_price:.2f}")
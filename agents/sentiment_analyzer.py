@@ -11,10 +11,18 @@ from datetime import datetime, timedelta
 import logging
 from textblob import TextBlob
 import re
+import json
+import asyncio
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+# Text cleaning patterns, compiled once
+_URL_RE = re.compile(r'http\S+|www\S+')
+# Mentions, plus any other non-word character (covers '#' so hashtags keep their text)
+_STRIP_RE = re.compile(r'@\w+|[^\w\s]')
+
 
 class SentimentAnalyzer:
     """
@@ -39,9 +47,21 @@ class SentimentAnalyzer:
         self.reddit_client_secret = reddit_client_secret
         self.news_api_key = news_api_key
 
+        # Pooled HTTP connections, reused across NewsAPI calls
+        self._session = requests.Session()
+
+        # VADER is a lexicon/rule scorer tuned for social media text and much
+        # faster than TextBlob's NLTK-backed pipeline
+        try:
+            from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+            self._vader = SentimentIntensityAnalyzer()
+        except ImportError:
+            logger.warning("vaderSentiment not installed. Falling back to TextBlob.")
+            self._vader = None
+
     def analyze_text(self, text: str) -> Dict[str, float]:
         """
-        Analyze sentiment of a single text using TextBlob
+        Analyze sentiment of a single text using VADER (TextBlob fallback)
 
         Args:
             text: Text to analyze
@@ -49,6 +69,17 @@ class SentimentAnalyzer:
         Returns:
             Dictionary with 'polarity' (-1 to 1) and 'subjectivity' (0 to 1)
         """
+        if self._vader is not None:
+            # VADER uses punctuation, capitalization and emoji as intensity
+            # cues, so only URLs are stripped
+            compound = self._vader.polarity_scores(_URL_RE.sub('', text))['compound']
+
+            return {
+                'polarity': compound,
+                'subjectivity': 1 - abs(compound),
+                'compound_score': compound
+            }
+
         # Clean text
         text = self._clean_text(text)
 
@@ -61,17 +92,61 @@ class SentimentAnalyzer:
             'compound_score': blob.sentiment.polarity * (1 - blob.sentiment.subjectivity)
         }
 
+    def analyze_batch(self, texts: List[str]) -> pd.DataFrame:
+        """
+        Analyze sentiment of many texts at once
+
+        Cleaning runs as vectorized pandas string operations over the
+        whole batch; only the scorer itself is applied per text.
+
+        Args:
+            texts: Texts to analyze (list or Series)
+
+        Returns:
+            DataFrame with 'polarity', 'subjectivity' and 'compound_score'
+            columns, one row per text in input order
+        """
+        texts = pd.Series(texts, dtype=object).reset_index(drop=True)
+
+        if self._vader is not None:
+            # Same URL-only cleaning as analyze_text
+            compound = texts.str.replace(_URL_RE, '', regex=True).map(
+                lambda text: self._vader.polarity_scores(text)['compound']
+            ).astype(float)
+
+            return pd.DataFrame({
+                'polarity': compound,
+                'subjectivity': 1 - compound.abs(),
+                'compound_score': compound
+            })
+
+        sentiments = self._clean_series(texts).map(lambda text: TextBlob(text).sentiment)
+        polarity = sentiments.map(lambda s: s.polarity).astype(float)
+        subjectivity = sentiments.map(lambda s: s.subjectivity).astype(float)
+
+        return pd.DataFrame({
+            'polarity': polarity,
+            'subjectivity': subjectivity,
+            'compound_score': polarity * (1 - subjectivity)
+        })
+
+    def _clean_series(self, texts: pd.Series) -> pd.Series:
+        """Vectorized _clean_text over a Series of strings"""
+        return (
+            texts.str.replace(_URL_RE, '', regex=True)
+            .str.replace(_STRIP_RE, '', regex=True)
+            .str.split()
+            .str.join(' ')
+            .str.lower()
+        )
+
     def _clean_text(self, text: str) -> str:
         """Clean and preprocess text"""
         # Remove URLs
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+        text = _URL_RE.sub('', text)
 
-        # Remove mentions and hashtags (but keep the text)
-        text = re.sub(r'@\w+', '', text)
-        text = re.sub(r'#', '', text)
-
-        # Remove special characters
-        text = re.sub(r'[^\w\s]', '', text)
+        # Remove mentions, hashtags (but keep the text) and special characters
+        text = _STRIP_RE.sub('', text)
 
         # Remove extra whitespace
         text = ' '.join(text.split())
@@ -108,7 +183,19 @@ class SentimentAnalyzer:
                 user_agent='AI_DAO_Hedge_Fund/1.0'
             )
 
-            results = []
+            # Column-wise accumulation; the frame is built once at the end
+            columns = {
+                'subreddit': [],
+                'title': [],
+                'selftext': [],
+                'score': [],
+                'num_comments': [],
+                'created_utc': []
+            }
+
+            # One case-insensitive alternation instead of a substring test per
+            # keyword (no keywords matches nothing)
+            keyword_re = re.compile('|'.join(map(re.escape, keywords)) or '(?!)', re.IGNORECASE)
 
             for subreddit_name in subreddits:
                 subreddit = reddit.subreddit(subreddit_name)
@@ -117,21 +204,23 @@ class SentimentAnalyzer:
                     # Check if any keyword is in title or selftext
                     text = f"{submission.title} {submission.selftext}"
 
-                    if any(keyword.lower() in text.lower() for keyword in keywords):
-                        sentiment = self.analyze_text(text)
-
-                        results.append({
-                            'source': 'reddit',
-                            'subreddit': subreddit_name,
-                            'title': submission.title,
-                            'text': text[:200],  # Truncate
-                            'score': submission.score,
-                            'num_comments': submission.num_comments,
-                            'created_utc': datetime.fromtimestamp(submission.created_utc),
-                            **sentiment
-                        })
-
-            df = pd.DataFrame(results)
+                    if keyword_re.search(text):
+                        columns['subreddit'].append(subreddit_name)
+                        columns['title'].append(submission.title)
+                        columns['selftext'].append(submission.selftext)
+                        columns['score'].append(submission.score)
+                        columns['num_comments'].append(submission.num_comments)
+                        columns['created_utc'].append(submission.created_utc)
+
+            df = pd.DataFrame(columns)
+            # Epoch seconds -> UTC timestamps in one vectorized conversion
+            df['created_utc'] = pd.to_datetime(columns['created_utc'], unit='s', utc=True)
+            text = df['title'].astype(str).str.cat(df['selftext'].astype(str), sep=' ')
+
+            df['source'] = 'reddit'
+            df['text'] = text.str.slice(0, 200)  # Truncate
+            df = df[['source', 'subreddit', 'title', 'text', 'score', 'num_comments', 'created_utc']]
+            df = pd.concat([df, self.analyze_batch(text)], axis=1)
             logger.info(f"✓ Fetched {len(df)} Reddit posts with sentiment")
 
             return df
@@ -148,7 +237,8 @@ class SentimentAnalyzer:
         self,
         query: str,
         from_date: Optional[str] = None,
-        to_date: Optional[str] = None
+        to_date: Optional[str] = None,
+        pages: int = 1
     ) -> pd.DataFrame:
         """
         Fetch and analyze news sentiment (using NewsAPI)
@@ -157,6 +247,8 @@ class SentimentAnalyzer:
             query: Search query (e.g., 'Tesla OR TSLA')
             from_date: Start date (YYYY-MM-DD)
             to_date: End date (YYYY-MM-DD)
+            pages: Number of 100-article result pages to fetch (concurrently
+                when httpx is installed)
 
         Returns:
             DataFrame with sentiment scores
@@ -180,27 +272,34 @@ class SentimentAnalyzer:
                 'pageSize': 100
             }
 
-            response = requests.get(url, params=params)
-            response.raise_for_status()
+            try:
+                from orjson import loads
+            except ImportError:
+                loads = json.loads
 
-            articles = response.json().get('articles', [])
+            articles = []
+            for content in self._fetch_news_pages(url, params, pages):
+                articles.extend(loads(content).get('articles', []))
 
-            results = []
+            # Column-wise accumulation; the frame is built once at the end
+            titles, descriptions, urls, published, source_names, texts = [], [], [], [], [], []
             for article in articles:
-                text = f"{article.get('title', '')} {article.get('description', '')}"
-                sentiment = self.analyze_text(text)
-
-                results.append({
-                    'source': 'news',
-                    'title': article.get('title'),
-                    'description': article.get('description'),
-                    'url': article.get('url'),
-                    'published_at': article.get('publishedAt'),
-                    'source_name': article.get('source', {}).get('name'),
-                    **sentiment
-                })
-
-            df = pd.DataFrame(results)
+                titles.append(article.get('title'))
+                descriptions.append(article.get('description'))
+                urls.append(article.get('url'))
+                published.append(article.get('publishedAt'))
+                source_names.append(article.get('source', {}).get('name'))
+                texts.append(f"{article.get('title', '')} {article.get('description', '')}")
+
+            df = pd.DataFrame({
+                'source': 'news',
+                'title': titles,
+                'description': descriptions,
+                'url': urls,
+                'published_at': published,
+                'source_name': source_names
+            })
+            df = pd.concat([df, self.analyze_batch(texts)], axis=1)
             logger.info(f"✓ Fetched {len(df)} news articles with sentiment")
 
             return df
@@ -209,6 +308,60 @@ class SentimentAnalyzer:
             logger.error(f"Error fetching news data: {e}")
             return self._generate_mock_news_data(query)
 
+    def _fetch_news_pages(self, url: str, params: Dict, pages: int) -> List[bytes]:
+        """
+        Fetch NewsAPI result pages 1..pages and return the raw response bodies
+
+        Multiple pages are requested concurrently with httpx when it is
+        installed and no event loop is already running in this thread;
+        otherwise they are fetched one by one over the pooled session.
+        """
+        if pages > 1:
+            try:
+                import httpx  # noqa: F401
+                has_httpx = True
+            except ImportError:
+                logger.warning("httpx not installed. Fetching NewsAPI pages sequentially.")
+                has_httpx = False
+
+            try:
+                asyncio.get_running_loop()
+                in_event_loop = True
+            except RuntimeError:
+                in_event_loop = False
+
+            if has_httpx and not in_event_loop:
+                return asyncio.run(self._fetch_pages(url, params, pages))
+
+        contents = []
+        for page in range(1, pages + 1):
+            response = self._session.get(url, params={**params, 'page': page})
+            response.raise_for_status()
+            contents.append(response.content)
+
+        return contents
+
+    async def _fetch_pages(self, url: str, params: Dict, pages: int) -> List[bytes]:
+        """Fetch all result pages concurrently over one httpx client"""
+        import httpx
+
+        try:
+            client = httpx.AsyncClient(http2=True)
+        except ImportError:
+            # HTTP/2 needs the optional 'h2' package
+            client = httpx.AsyncClient()
+
+        async with client:
+            responses = await asyncio.gather(*[
+                client.get(url, params={**params, 'page': page})
+                for page in range(1, pages + 1)
+            ])
+
+        for response in responses:
+            response.raise_for_status()
+
+        return [response.content for response in responses]
+
     def aggregate_sentiment(
         self,
         df: pd.DataFrame,
@@ -268,22 +421,31 @@ class SentimentAnalyzer:
         Returns:
             Dictionary of sentiment features
         """
-        # Fetch data from multiple sources
-        reddit_df = self.fetch_reddit_sentiment(
-            subreddits=['wallstreetbets', 'stocks', 'investing'],
-            keywords=[ticker],
-            limit=50
-        )
+        # Fetch data from multiple sources concurrently (both are I/O bound)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            reddit_future = executor.submit(
+                self.fetch_reddit_sentiment,
+                subreddits=['wallstreetbets', 'stocks', 'investing'],
+                keywords=[ticker],
+                limit=50
+            )
+            news_future = executor.submit(
+                self.fetch_news_sentiment,
+                query=ticker,
+                from_date=(datetime.now() - timedelta(days=lookback_days)).strftime('%Y-%m-%d')
+            )
 
-        news_df = self.fetch_news_sentiment(
-            query=ticker,
-            from_date=(datetime.now() - timedelta(days=lookback_days)).strftime('%Y-%m-%d')
-        )
+            reddit_df = reddit_future.result()
+            news_df = news_future.result()
 
-        # Combine
-        all_sentiment = pd.concat([reddit_df, news_df], ignore_index=True)
+        # Only the score columns are needed, so merge them as flat arrays
+        # rather than concatenating the two (column-disjoint) frames
+        polarity = np.concatenate([
+            reddit_df['polarity'].to_numpy(dtype=np.float64),
+            news_df['polarity'].to_numpy(dtype=np.float64)
+        ])
 
-        if all_sentiment.empty:
+        if polarity.size == 0:
             return {
                 'sentiment_mean': 0.0,
                 'sentiment_std': 0.0,
@@ -291,36 +453,43 @@ class SentimentAnalyzer:
                 'sentiment_volume': 0
             }
 
+        subjectivity = np.concatenate([
+            reddit_df['subjectivity'].to_numpy(dtype=np.float64),
+            news_df['subjectivity'].to_numpy(dtype=np.float64)
+        ])
+        timestamps = np.concatenate([
+            pd.to_datetime(reddit_df['created_utc'], utc=True).to_numpy(),
+            pd.to_datetime(news_df['published_at'], utc=True).to_numpy()
+        ])
+
         # Calculate features
         features = {
-            'sentiment_mean': all_sentiment['polarity'].mean(),
-            'sentiment_std': all_sentiment['polarity'].std(),
-            'sentiment_trend': self._calculate_trend(all_sentiment),
-            'sentiment_volume': len(all_sentiment),
-            'sentiment_positive_ratio': (all_sentiment['polarity'] > 0).mean(),
-            'sentiment_negative_ratio': (all_sentiment['polarity'] < 0).mean(),
-            'subjectivity_mean': all_sentiment['subjectivity'].mean()
+            'sentiment_mean': polarity.mean(),
+            'sentiment_std': polarity.std(ddof=1) if polarity.size > 1 else np.nan,
+            'sentiment_trend': self._calculate_trend(polarity, timestamps),
+            'sentiment_volume': polarity.size,
+            'sentiment_positive_ratio': (polarity > 0).mean(),
+            'sentiment_negative_ratio': (polarity < 0).mean(),
+            'subjectivity_mean': subjectivity.mean()
         }
 
         return features
 
-    def _calculate_trend(self, df: pd.DataFrame) -> float:
-        """Calculate sentiment trend (linear regression slope)"""
-        if len(df) < 2:
+    def _calculate_trend(self, polarity: np.ndarray, timestamps: np.ndarray) -> float:
+        """Calculate sentiment trend (linear regression slope over time order)"""
+        n = len(polarity)
+        if n < 2:
             return 0.0
 
         # Sort by time
-        time_col = 'created_utc' if 'created_utc' in df.columns else 'published_at'
-        df = df.sort_values(time_col)
-
-        # Simple linear trend
-        x = np.arange(len(df))
-        y = df['polarity'].values
+        y = np.asarray(polarity, dtype=np.float64)[np.argsort(timestamps, kind='stable')]
 
-        if len(x) == 0 or len(y) == 0:
-            return 0.0
+        # Least-squares slope against x = 0..n-1 in closed form:
+        # sum(y * (x - mean(x))) / sum((x - mean(x))^2), with the
+        # denominator equal to n(n^2 - 1)/12
+        x = np.arange(n, dtype=np.float64)
 
-        slope = np.polyfit(x, y, 1)[0]
+        slope = 12.0 * np.dot(y, x - (n - 1) / 2) / (n * (n * n - 1))
 
         return float(slope)
 
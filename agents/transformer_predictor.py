@@ -5,6 +5,8 @@ Uses attention mechanisms for time-series forecasting
 
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
+from torch.nn.attention import SDPBackend, sdpa_kernel
 import numpy as np
 from typing import Tuple, Optional
 import logging
@@ -21,18 +23,119 @@ class PositionalEncoding(nn.Module):
         position = torch.arange(max_len).unsqueeze(1)
         div_term = torch.exp(torch.arange(0, d_model, 2) * (-np.log(10000.0) / d_model))
 
-        pe = torch.zeros(max_len, 1, d_model)
-        pe[:, 0, 0::2] = torch.sin(position * div_term)
-        pe[:, 0, 1::2] = torch.cos(position * div_term)
+        pe = torch.zeros(1, max_len, d_model)
+        pe[0, :, 0::2] = torch.sin(position * div_term)
+        pe[0, :, 1::2] = torch.cos(position * div_term)
 
         self.register_buffer('pe', pe)
 
     def forward(self, x: torch.Tensor) -> torch.Tensor:
         """
         Args:
-            x: Tensor of shape (seq_len, batch_size, d_model)
+            x: Tensor of shape (batch_size, seq_len, d_model)
         """
-        x = x + self.pe[:x.size(0)]
+        x = x + self.pe[:, :x.size(1)]
+        return x
+
+
+class SDPAEncoderLayer(nn.Module):
+    """
+    Post-norm transformer encoder layer built on scaled_dot_product_attention
+    Q/K/V come from one fused projection and attention runs as a single
+    fused kernel, so the (seq_len x seq_len) score matrix is never materialized
+    """
+
+    def __init__(
+        self,
+        d_model: int,
+        nhead: int,
+        dim_feedforward: int,
+        dropout: float = 0.1
+    ):
+        super().__init__()
+
+        if d_model % nhead != 0:
+            raise ValueError(f"d_model ({d_model}) must be divisible by nhead ({nhead})")
+
+        self.nhead = nhead
+        self.head_dim = d_model // nhead
+        self.dropout = dropout
+
+        # Fused Q/K/V projection
+        self.qkv_proj = nn.Linear(d_model, 3 * d_model)
+        self.out_proj = nn.Linear(d_model, d_model)
+
+        # Feed-forward block
+        self.linear1 = nn.Linear(d_model, dim_feedforward)
+        self.linear2 = nn.Linear(dim_feedforward, d_model)
+
+        self.norm1 = nn.LayerNorm(d_model)
+        self.norm2 = nn.LayerNorm(d_model)
+        self.dropout1 = nn.Dropout(dropout)
+        self.dropout2 = nn.Dropout(dropout)
+        self.dropout_ff = nn.Dropout(dropout)
+
+    def _self_attention(self, x: torch.Tensor) -> torch.Tensor:
+        batch_size, seq_len, d_model = x.shape
+
+        # (batch, seq_len, 3*d_model) -> 3 x (batch, nhead, seq_len, head_dim)
+        qkv = self.qkv_proj(x).view(batch_size, seq_len, 3, self.nhead, self.head_dim)
+        q, k, v = qkv.permute(2, 0, 3, 1, 4).unbind(0)
+
+        attn = F.scaled_dot_product_attention(
+            q, k, v,
+            dropout_p=self.dropout if self.training else 0.0,
+            is_causal=False
+        )
+
+        attn = attn.transpose(1, 2).reshape(batch_size, seq_len, d_model)
+        return self.out_proj(attn)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        """
+        Args:
+            x: (batch_size, seq_length, d_model)
+        Returns:
+            encoded: (batch_size, seq_length, d_model)
+        """
+        x = self.norm1(x + self.dropout1(self._self_attention(x)))
+        ff = self.linear2(self.dropout_ff(F.relu(self.linear1(x))))
+        x = self.norm2(x + self.dropout2(ff))
+        return x
+
+
+class SDPAEncoder(nn.Module):
+    """
+    Stack of SDPAEncoderLayer blocks
+    Attention dispatches to the Flash / memory-efficient kernels when the
+    device and dtype allow it, falling back to the math kernel otherwise
+    """
+
+    BACKENDS = [
+        SDPBackend.FLASH_ATTENTION,
+        SDPBackend.EFFICIENT_ATTENTION,
+        SDPBackend.MATH
+    ]
+
+    def __init__(
+        self,
+        d_model: int,
+        nhead: int,
+        num_layers: int,
+        dim_feedforward: int,
+        dropout: float = 0.1
+    ):
+        super().__init__()
+
+        self.layers = nn.ModuleList([
+            SDPAEncoderLayer(d_model, nhead, dim_feedforward, dropout)
+            for _ in range(num_layers)
+        ])
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        with sdpa_kernel(self.BACKENDS):
+            for layer in self.layers:
+                x = layer(x)
         return x
 
 
@@ -69,18 +172,14 @@ class TransformerPredictor(nn.Module):
         # Positional encoding
         self.pos_encoder = PositionalEncoding(d_model, max_len=sequence_length)
 
-        # Transformer encoder
-        encoder_layer = nn.TransformerEncoderLayer(
+        # Transformer encoder (fused QKV + scaled_dot_product_attention, so the
+        # (seq_len x seq_len) attention matrix is never materialized)
+        self.transformer_encoder = SDPAEncoder(
             d_model=d_model,
             nhead=nhead,
+            num_layers=num_encoder_layers,
             dim_feedforward=dim_feedforward,
-            dropout=dropout,
-            batch_first=False
-        )
-
-        self.transformer_encoder = nn.TransformerEncoder(
-            encoder_layer,
-            num_layers=num_encoder_layers
+            dropout=dropout
         )
 
         # Classification head
@@ -110,7 +209,8 @@ class TransformerPredictor(nn.Module):
     def forward(
         self,
         x: torch.Tensor,
-        predict_price: bool = False
+        predict_price: bool = False,
+        return_both: bool = False
     ) -> torch.Tensor:
         """
         Forward pass
@@ -118,6 +218,8 @@ class TransformerPredictor(nn.Module):
         Args:
             x: Input tensor of shape (batch_size, seq_len, input_dim)
             predict_price: If True, predict price change; else predict direction
+            return_both: If True, return (direction_logits, price_prediction)
+                from a single encoder pass
 
         Returns:
             predictions: (batch_size, num_classes) or (batch_size, 1)
@@ -125,19 +227,19 @@ class TransformerPredictor(nn.Module):
         # Project input to d_model dimension
         x = self.input_projection(x)  # (batch, seq_len, d_model)
 
-        # Transpose for transformer: (seq_len, batch, d_model)
-        x = x.transpose(0, 1)
-
         # Add positional encoding
         x = self.pos_encoder(x)
 
         # Apply transformer encoder
-        encoded = self.transformer_encoder(x)  # (seq_len, batch, d_model)
+        encoded = self.transformer_encoder(x)  # (batch, seq_len, d_model)
 
         # Take the last time step
-        last_hidden = encoded[-1]  # (batch, d_model)
+        last_hidden = encoded[:, -1]  # (batch, d_model)
 
         # Predict
+        if return_both:
+            return self.classifier(last_hidden), self.regressor(last_hidden)
+
         if predict_price:
             output = self.regressor(last_hidden)  # (batch, 1)
         else:
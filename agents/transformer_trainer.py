@@ -3,13 +3,15 @@ Fine-tuned Transformer Model Trainer
 Advanced training pipeline with real market data
 """
 
+import os
 import torch
-import torch.nn as nn
+import torch.nn.functional as F
 import torch.optim as optim
 from torch.utils.data import Dataset, DataLoader
 import numpy as np
 from typing import Dict, Tuple, Optional
 import logging
+import threading
 from pathlib import Path
 from datetime import datetime
 import json
@@ -19,19 +21,197 @@ from agents.transformer_predictor import TransformerPredictor
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+HISTORY_KEYS = ('train_loss', 'val_loss', 'train_accuracy', 'val_accuracy', 'learning_rate')
+
+
+def _step_loss(
+    cls_logits: torch.Tensor,
+    reg_output: torch.Tensor,
+    y: torch.Tensor,
+    cls_labels: Optional[torch.Tensor] = None
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """
+    Combined direction/return loss and correct-direction count for one batch
+
+    Written as one function so torch.compile can fuse both losses and the
+    accuracy reduction into a single kernel. A logit above 0 is the same
+    decision as sigmoid(logit) > 0.5.
+
+    Args:
+        cls_logits: Direction logits (batch, 1)
+        reg_output: Predicted returns (batch, 1)
+        y: Target returns (batch,)
+        cls_labels: Precomputed float direction labels (y > 0); derived
+            from y when not given
+
+    Returns:
+        Tuple of (loss, number of correct direction predictions)
+    """
+    # Flatten everything to (batch,) so the shapes are explicit: no silent
+    # broadcasting when the batch has one sample or y arrives as (batch, 1)
+    cls_logits = cls_logits.view(-1)
+    reg_output = reg_output.view(-1)
+    y = y.view(-1)
+
+    if cls_labels is None:
+        cls_labels = (y > 0).float()
+    cls_labels = cls_labels.view(-1)
+
+    cls_loss = F.binary_cross_entropy_with_logits(cls_logits, cls_labels)
+    reg_loss = F.mse_loss(reg_output, y)
+    loss = 0.5 * cls_loss + 0.5 * reg_loss
+
+    correct = ((cls_logits > 0).to(cls_labels.dtype) == cls_labels).sum()
+
+    return loss, correct
+
+
+def _snapshot(obj):
+    """Detached host copy of a (nested) checkpoint, safe to save while training continues"""
+    if torch.is_tensor(obj):
+        return obj.detach().to('cpu', copy=True)
+    if isinstance(obj, dict):
+        return {k: _snapshot(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(_snapshot(v) for v in obj)
+    return obj
+
 
 class MarketDataset(Dataset):
     """PyTorch Dataset for market sequences"""
 
-    def __init__(self, X: np.ndarray, y: np.ndarray):
-        self.X = torch.FloatTensor(X)
-        self.y = torch.FloatTensor(y)
+    def __init__(self, X: np.ndarray, y: np.ndarray, device: str = 'cpu'):
+        # as_tensor shares memory with float32 contiguous arrays on CPU
+        # instead of copying them like FloatTensor does
+        self.X = torch.as_tensor(X, dtype=torch.float32, device=device)
+        self.y = torch.as_tensor(y, dtype=torch.float32, device=device)
+
+        # Direction labels are fixed per sample: derive them once, not per batch
+        self.y_cls = (self.y > 0).float()
+
+    def save(self, path: str):
+        """Serialize the (host copies of the) tensors for reuse with from_file"""
+        torch.save({'X': self.X.cpu(), 'y': self.y.cpu()}, path)
+
+    @classmethod
+    def from_file(cls, path: str, device: str = 'cpu') -> 'MarketDataset':
+        """
+        Load a dataset written by save
+
+        The file is memory-mapped, so on CPU the sequences are paged in by
+        the OS on access instead of being read into RAM up front
+
+        Args:
+            path: File written by MarketDataset.save
+            device: Device to place the tensors on
+        """
+        try:
+            data = torch.load(path, mmap=True)
+        except TypeError:  # torch < 2.1 has no mmap loading
+            data = torch.load(path)
+
+        return cls(data['X'], data['y'], device=device)
 
     def __len__(self):
         return len(self.X)
 
     def __getitem__(self, idx):
-        return self.X[idx], self.y[idx]
+        return self.X[idx], self.y[idx], self.y_cls[idx]
+
+
+class DeviceBatchLoader:
+    """
+    Batches a device-resident MarketDataset by tensor indexing
+    Each batch is a gather on the device: no worker processes, no per-item
+    __getitem__/collate and no host-to-device copy per step
+    """
+
+    def __init__(
+        self,
+        dataset: MarketDataset,
+        batch_size: int,
+        shuffle: bool = False,
+        drop_last: bool = False
+    ):
+        self.dataset = dataset
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+
+    def __len__(self):
+        n = len(self.dataset)
+        if self.drop_last:
+            return n // self.batch_size
+        return -(-n // self.batch_size)
+
+    def __iter__(self):
+        X, y, y_cls = self.dataset.X, self.dataset.y, self.dataset.y_cls
+        n_batches = len(self)
+
+        if not self.shuffle:
+            for i in range(n_batches):
+                batch = slice(i * self.batch_size, (i + 1) * self.batch_size)
+                yield X[batch], y[batch], y_cls[batch]
+            return
+
+        # One permutation per epoch, moved to the device in a single copy
+        perm = torch.randperm(len(self.dataset)).to(X.device)
+        for i in range(n_batches):
+            idx = perm[i * self.batch_size:(i + 1) * self.batch_size]
+            yield X[idx], y[idx], y_cls[idx]
+
+
+class DataPrefetcher:
+    """
+    Iterates a DataLoader with the next batch already on the device
+    On CUDA the host-to-device copy of batch i+1 is issued on a side stream
+    while batch i is being processed; on CPU batches are passed through
+    """
+
+    def __init__(self, loader: DataLoader, device: str):
+        self.loader = loader
+        self.device = device
+        self.stream = torch.cuda.Stream() if device.startswith('cuda') else None
+        self.next_batch = None
+
+    def __len__(self):
+        return len(self.loader)
+
+    def __iter__(self):
+        self._iter = iter(self.loader)
+        self._preload()
+        return self
+
+    def _preload(self):
+        try:
+            batch = next(self._iter)
+        except StopIteration:
+            self.next_batch = None
+            return
+
+        if self.stream is None:
+            self.next_batch = [t.to(self.device) for t in batch]
+            return
+
+        with torch.cuda.stream(self.stream):
+            self.next_batch = [t.to(self.device, non_blocking=True) for t in batch]
+
+    def __next__(self):
+        if self.stream is not None:
+            torch.cuda.current_stream().wait_stream(self.stream)
+
+        batch = self.next_batch
+        if batch is None:
+            raise StopIteration
+
+        # Tensors were allocated on the side stream; tell the caching
+        # allocator they are in use on the compute stream too
+        if self.stream is not None:
+            for t in batch:
+                t.record_stream(torch.cuda.current_stream())
+
+        self._preload()
+        return batch
 
 
 class TransformerTrainer:
@@ -52,11 +232,33 @@ class TransformerTrainer:
         num_encoder_layers: int = 6,
         dim_feedforward: int = 1024,
         dropout: float = 0.1,
-        device: str = None
+        device: str = None,
+        compile_model: Optional[bool] = None
     ):
         self.device = device or ('cuda' if torch.cuda.is_available() else 'cpu')
         logger.info(f"Using device: {self.device}")
 
+        # Mixed precision on GPU: bf16 shares fp32's exponent range so it needs
+        # no loss scaling; older GPUs fall back to fp16 with a GradScaler
+        self.use_amp = self.device.startswith('cuda')
+        if self.use_amp:
+            # TF32 for the remaining fp32 matmuls; batch/seq shapes are fixed,
+            # so cuDNN's autotuned kernel choice stays cached across steps
+            torch.backends.cuda.matmul.allow_tf32 = True
+            torch.backends.cudnn.allow_tf32 = True
+            torch.backends.cudnn.benchmark = True
+            torch.set_float32_matmul_precision('high')
+
+        if self.use_amp and torch.cuda.is_bf16_supported():
+            self.amp_dtype = torch.bfloat16
+        else:
+            self.amp_dtype = torch.float16
+        use_scaler = self.use_amp and self.amp_dtype == torch.float16
+        if hasattr(torch.amp, 'GradScaler'):
+            self.scaler = torch.amp.GradScaler('cuda', enabled=use_scaler)
+        else:  # torch < 2.3 only has the CUDA-specific scaler
+            self.scaler = torch.cuda.amp.GradScaler(enabled=use_scaler)
+
         # Initialize model
         self.model = TransformerPredictor(
             input_dim=input_dim,
@@ -64,33 +266,45 @@ class TransformerTrainer:
             nhead=nhead,
             num_encoder_layers=num_encoder_layers,
             dim_feedforward=dim_feedforward,
-            dropout=dropout
+            dropout=dropout,
+            num_classes=1
         ).to(self.device)
 
+        # Inductor fusion + CUDA graph replay removes per-op launch overhead,
+        # which dominates at small batch sizes. Opt in with TORCH_COMPILE=1;
+        # on CPU compilation usually costs more than it saves. Compiling in
+        # place keeps state_dict keys (and checkpoints) unchanged
+        if compile_model is None:
+            compile_model = self.use_amp and os.environ.get('TORCH_COMPILE') == '1'
+        self.compiled = compile_model
+        self._step_loss = _step_loss
+        if compile_model:
+            self.model.compile(mode='reduce-overhead', fullgraph=True, dynamic=False)
+            self._step_loss = torch.compile(_step_loss, fullgraph=True, dynamic=False)
+
         # Training components
         self.optimizer = None
         self.scheduler = None
-        self.criterion_reg = nn.MSELoss()
-        self.criterion_cls = nn.BCEWithLogitsLoss()
 
-        # Training history
-        self.history = {
-            'train_loss': [],
-            'val_loss': [],
-            'train_accuracy': [],
-            'val_accuracy': [],
-            'learning_rate': []
-        }
+        # Training history: one float32 array per metric, indexed by epoch
+        self.history = {key: np.empty(0, dtype=np.float32) for key in HISTORY_KEYS}
 
         # Early stopping
         self.best_val_loss = float('inf')
         self.patience_counter = 0
 
+        # Validate every val_every epochs (raised to 2 late in a plateau)
+        self.val_every = 1
+
+        # Background checkpoint writer
+        self._save_thread = None
+
     def prepare_data_loaders(
         self,
         data: Dict[str, np.ndarray],
         batch_size: int = 32,
-        num_workers: int = 0
+        num_workers: Optional[int] = None,
+        on_device: bool = True
     ) -> Tuple[DataLoader, DataLoader]:
         """
         Create PyTorch DataLoaders
@@ -98,20 +312,52 @@ class TransformerTrainer:
         Args:
             data: Dictionary with 'X_train', 'X_test', 'y_train', 'y_test'
             batch_size: Batch size for training
-            num_workers: Number of data loading workers
+            num_workers: Number of data loading workers (ignored when on_device);
+                defaults to min(cpu_count, 8) on CUDA and 0 on CPU
+            on_device: Move the whole dataset to the training device once and
+                batch by indexing there; disable for data that does not fit
 
         Returns:
             Tuple of (train_loader, test_loader)
         """
+        # Drop the ragged last batch so every training step sees the same shape
+        drop_last = len(data['X_train']) > batch_size
+
+        if on_device:
+            train_dataset = MarketDataset(data['X_train'], data['y_train'], device=self.device)
+            test_dataset = MarketDataset(data['X_test'], data['y_test'], device=self.device)
+
+            train_loader = DeviceBatchLoader(
+                train_dataset, batch_size, shuffle=True, drop_last=drop_last
+            )
+            test_loader = DeviceBatchLoader(test_dataset, batch_size, shuffle=False)
+
+            logger.info(
+                f"Created device-resident loaders: {len(train_dataset)} train, "
+                f"{len(test_dataset)} test samples on {self.device}"
+            )
+
+            return train_loader, test_loader
+
         train_dataset = MarketDataset(data['X_train'], data['y_train'])
         test_dataset = MarketDataset(data['X_test'], data['y_test'])
 
+        if num_workers is None:
+            num_workers = min(os.cpu_count() or 1, 8) if self.device.startswith('cuda') else 0
+
+        # Keep workers alive across epochs instead of re-forking them
+        worker_kwargs = {}
+        if num_workers > 0:
+            worker_kwargs = {'persistent_workers': True, 'prefetch_factor': 4}
+
         train_loader = DataLoader(
             train_dataset,
             batch_size=batch_size,
             shuffle=True,
+            drop_last=drop_last,
             num_workers=num_workers,
-            pin_memory=True if self.device == 'cuda' else False
+            pin_memory=self.device.startswith('cuda'),
+            **worker_kwargs
         )
 
         test_loader = DataLoader(
@@ -119,54 +365,59 @@ class TransformerTrainer:
             batch_size=batch_size,
             shuffle=False,
             num_workers=num_workers,
-            pin_memory=True if self.device == 'cuda' else False
+            pin_memory=self.device.startswith('cuda'),
+            **worker_kwargs
         )
 
         logger.info(f"Created DataLoaders: {len(train_dataset)} train, {len(test_dataset)} test samples")
 
         return train_loader, test_loader
 
-    def train_epoch(self, train_loader: DataLoader) -> Tuple[float, float]:
+    def train_epoch(self, train_loader: DataLoader, accum_steps: int = 1) -> Tuple[float, float]:
         """
         Train for one epoch
 
+        Args:
+            train_loader: Training data loader
+            accum_steps: Number of batches whose gradients are accumulated
+                per optimizer step (effective batch = accum_steps * batch_size)
+
         Returns:
             Tuple of (average_loss, accuracy)
         """
         self.model.train()
-        total_loss = 0
-        correct_predictions = 0
+        # Accumulate on the device; a single host sync after the loop
+        loss_acc = torch.zeros((), device=self.device)
+        correct_acc = torch.zeros((), device=self.device, dtype=torch.long)
         total_samples = 0
+        n_batches = len(train_loader)
 
-        for batch_idx, (X, y) in enumerate(train_loader):
-            X = X.to(self.device)
-            y = y.to(self.device)
-
+        self.optimizer.zero_grad(set_to_none=True)
+        for batch_idx, (X, y, cls_labels) in enumerate(DataPrefetcher(train_loader, self.device)):
             # Forward pass
-            self.optimizer.zero_grad()
-            cls_logits, reg_output = self.model(X)
-
-            # Convert regression targets to classification labels
-            cls_labels = (y > 0).float().unsqueeze(1)
-
-            # Combined loss
-            cls_loss = self.criterion_cls(cls_logits, cls_labels)
-            reg_loss = self.criterion_reg(reg_output.squeeze(), y)
-            loss = 0.5 * cls_loss + 0.5 * reg_loss
-
-            # Backward pass
-            loss.backward()
-            torch.nn.utils.clip_grad_norm_(self.model.parameters(), max_norm=1.0)
-            self.optimizer.step()
+            with torch.amp.autocast(device_type='cuda', dtype=self.amp_dtype, enabled=self.use_amp):
+                cls_logits, reg_output = self.model(X, return_both=True)
+                loss, correct = self._step_loss(cls_logits, reg_output, y, cls_labels)
+
+            # Backward pass in fp32 (scaler is a pass-through unless fp16)
+            self.scaler.scale(loss / accum_steps).backward()
+
+            # Clip and step on the accumulated gradient; a trailing partial
+            # group is flushed so gradients never leak into the next epoch
+            if (batch_idx + 1) % accum_steps == 0 or batch_idx + 1 == n_batches:
+                self.scaler.unscale_(self.optimizer)
+                torch.nn.utils.clip_grad_norm_(self.model.parameters(), max_norm=1.0)
+                self.scaler.step(self.optimizer)
+                self.scaler.update()
+                self.optimizer.zero_grad(set_to_none=True)
 
             # Metrics
-            total_loss += loss.item()
-            predictions = (torch.sigmoid(cls_logits) > 0.5).float()
-            correct_predictions += (predictions == cls_labels).sum().item()
-            total_samples += len(y)
+            loss_acc += loss.detach()
+            correct_acc += correct
+            total_samples += y.size(0)
 
-        avg_loss = total_loss / len(train_loader)
-        accuracy = correct_predictions / total_samples
+        avg_loss = (loss_acc / len(train_loader)).item()
+        accuracy = (correct_acc.float() / total_samples).item()
 
         return avg_loss, accuracy
 
@@ -178,34 +429,26 @@ class TransformerTrainer:
             Tuple of (average_loss, accuracy)
         """
         self.model.eval()
-        total_loss = 0
-        correct_predictions = 0
+        # Accumulate on the device; a single host sync after the loop
+        loss_acc = torch.zeros((), device=self.device)
+        correct_acc = torch.zeros((), device=self.device, dtype=torch.long)
         total_samples = 0
 
-        with torch.no_grad():
-            for X, y in val_loader:
-                X = X.to(self.device)
-                y = y.to(self.device)
-
+        with torch.inference_mode(), torch.amp.autocast(
+            device_type='cuda', dtype=self.amp_dtype, enabled=self.use_amp
+        ):
+            for X, y, cls_labels in DataPrefetcher(val_loader, self.device):
                 # Forward pass
-                cls_logits, reg_output = self.model(X)
-
-                # Classification labels
-                cls_labels = (y > 0).float().unsqueeze(1)
-
-                # Combined loss
-                cls_loss = self.criterion_cls(cls_logits, cls_labels)
-                reg_loss = self.criterion_reg(reg_output.squeeze(), y)
-                loss = 0.5 * cls_loss + 0.5 * reg_loss
+                cls_logits, reg_output = self.model(X, return_both=True)
+                loss, correct = self._step_loss(cls_logits, reg_output, y, cls_labels)
 
                 # Metrics
-                total_loss += loss.item()
-                predictions = (torch.sigmoid(cls_logits) > 0.5).float()
-                correct_predictions += (predictions == cls_labels).sum().item()
-                total_samples += len(y)
+                loss_acc += loss.detach()
+                correct_acc += correct
+                total_samples += y.size(0)
 
-        avg_loss = total_loss / len(val_loader)
-        accuracy = correct_predictions / total_samples
+        avg_loss = (loss_acc / len(val_loader)).item()
+        accuracy = (correct_acc.float() / total_samples).item()
 
         return avg_loss, accuracy
 
@@ -216,7 +459,9 @@ class TransformerTrainer:
         epochs: int = 100,
         learning_rate: float = 1e-4,
         patience: int = 10,
-        save_dir: str = "models/transformer"
+        save_dir: str = "models/transformer",
+        accum_steps: int = 1,
+        checkpoint_every: int = 10
     ):
         """
         Complete training pipeline with early stopping and checkpointing
@@ -228,23 +473,36 @@ class TransformerTrainer:
             learning_rate: Initial learning rate
             patience: Early stopping patience
             save_dir: Directory to save model checkpoints
+            accum_steps: Batches accumulated per optimizer step
+            checkpoint_every: Epochs between full (model + optimizer) checkpoints;
+                the best model is saved as weights only whenever it improves
         """
         save_path = Path(save_dir)
         save_path.mkdir(parents=True, exist_ok=True)
 
-        # Initialize optimizer and scheduler
-        self.optimizer = optim.AdamW(
-            self.model.parameters(),
-            lr=learning_rate,
-            weight_decay=1e-5
-        )
+        # Initialize optimizer and scheduler. The fused CUDA kernel updates all
+        # parameters in one launch; fall back to the multi-tensor path where
+        # the installed PyTorch does not support it
+        try:
+            self.optimizer = optim.AdamW(
+                self.model.parameters(),
+                lr=learning_rate,
+                weight_decay=1e-5,
+                fused=self.device.startswith('cuda')
+            )
+        except (TypeError, RuntimeError):
+            self.optimizer = optim.AdamW(
+                self.model.parameters(),
+                lr=learning_rate,
+                weight_decay=1e-5,
+                foreach=True
+            )
 
         self.scheduler = optim.lr_scheduler.ReduceLROnPlateau(
             self.optimizer,
             mode='min',
             factor=0.5,
-            patience=5,
-            verbose=True
+            patience=5
         )
 
         logger.info("=" * 80)
@@ -257,23 +515,36 @@ class TransformerTrainer:
         logger.info(f"Model Parameters: {sum(p.numel() for p in self.model.parameters()):,}")
         logger.info("=" * 80)
 
+        # Preallocate history for this run; it is trimmed to the epochs
+        # actually trained (early stopping) once the loop exits
+        offset = len(self.history['train_loss'])
+        self.history = {
+            key: np.concatenate([values, np.full(epochs, np.nan, dtype=np.float32)])
+            for key, values in self.history.items()
+        }
+
+        self.val_every = 1
+
         for epoch in range(epochs):
             # Train
-            train_loss, train_acc = self.train_epoch(train_loader)
+            train_loss, train_acc = self.train_epoch(train_loader, accum_steps=accum_steps)
 
-            # Validate
-            val_loss, val_acc = self.validate(val_loader)
+            # Validate; skipped epochs reuse the last result, which counts as
+            # no improvement for both early stopping and the LR scheduler
+            if epoch % self.val_every == 0:
+                val_loss, val_acc = self.validate(val_loader)
 
             # Learning rate scheduling
             self.scheduler.step(val_loss)
             current_lr = self.optimizer.param_groups[0]['lr']
 
             # Update history
-            self.history['train_loss'].append(train_loss)
-            self.history['val_loss'].append(val_loss)
-            self.history['train_accuracy'].append(train_acc)
-            self.history['val_accuracy'].append(val_acc)
-            self.history['learning_rate'].append(current_lr)
+            row = offset + epoch
+            self.history['train_loss'][row] = train_loss
+            self.history['val_loss'][row] = val_loss
+            self.history['train_accuracy'][row] = train_acc
+            self.history['val_accuracy'][row] = val_acc
+            self.history['learning_rate'][row] = current_lr
 
             # Logging
             logger.info(
@@ -288,18 +559,16 @@ class TransformerTrainer:
                 self.best_val_loss = val_loss
                 self.patience_counter = 0
 
-                # Save best model
+                # Save best model (weights only; optimizer state is 2x the
+                # parameter size for AdamW and only needed to resume)
                 checkpoint = {
                     'epoch': epoch,
                     'model_state_dict': self.model.state_dict(),
-                    'optimizer_state_dict': self.optimizer.state_dict(),
                     'val_loss': val_loss,
-                    'val_accuracy': val_acc,
-                    'history': self.history
+                    'val_accuracy': val_acc
                 }
 
-                checkpoint_path = save_path / f"best_model.pt"
-                torch.save(checkpoint, checkpoint_path)
+                self._save_async(checkpoint, save_path / "best_model.pt")
                 logger.info(f"  ✓ Saved best model (val_loss: {val_loss:.4f})")
 
             else:
@@ -308,28 +577,81 @@ class TransformerTrainer:
                     logger.info(f"\nEarly stopping triggered after {epoch+1} epochs")
                     break
 
+            # Once half the patience is used up the run is likely to stop
+            # without improving, so only validate every other epoch
+            self.val_every = 2 if self.patience_counter >= max(1, patience // 2) else 1
+
+            # Periodic resumable checkpoint
+            if (epoch + 1) % checkpoint_every == 0:
+                self._save_async(
+                    self._full_checkpoint(epoch, offset + epoch + 1), save_path / "last_checkpoint.pt"
+                )
+
+        self.history = {key: values[:offset + epoch + 1] for key, values in self.history.items()}
+
         # Save final model
-        final_checkpoint = {
-            'model_state_dict': self.model.state_dict(),
-            'optimizer_state_dict': self.optimizer.state_dict(),
-            'history': self.history
+        self._save_async(
+            self._full_checkpoint(epoch, offset + epoch + 1), save_path / "final_model.pt"
+        )
+
+        # Save training history (arrays) plus a small human-readable summary
+        np.savez_compressed(save_path / "training_history.npz", **self.history)
+
+        best_epoch = int(np.argmin(self.history['val_loss']))
+        summary = {
+            'epochs_trained': len(self.history['val_loss']),
+            'best_epoch': best_epoch + 1,
+            'best_val_loss': float(self.history['val_loss'][best_epoch]),
+            'best_val_accuracy': float(self.history['val_accuracy'].max()),
+            'final_learning_rate': float(self.history['learning_rate'][-1])
         }
-        torch.save(final_checkpoint, save_path / "final_model.pt")
+        with open(save_path / "training_summary.json", 'w') as f:
+            json.dump(summary, f, indent=2)
 
-        # Save training history
-        with open(save_path / "training_history.json", 'w') as f:
-            json.dump(self.history, f, indent=2)
+        self._wait_for_save()
 
         logger.info("\n" + "=" * 80)
         logger.info("TRAINING COMPLETE")
         logger.info("=" * 80)
         logger.info(f"Best Validation Loss: {self.best_val_loss:.4f}")
-        logger.info(f"Best Validation Accuracy: {max(self.history['val_accuracy']):.4f}")
+        logger.info(f"Best Validation Accuracy: {summary['best_val_accuracy']:.4f}")
         logger.info(f"Models saved to: {save_path}")
         logger.info("=" * 80)
 
+    def _full_checkpoint(self, epoch: int, n_recorded: int) -> dict:
+        """Model, optimizer and the first n_recorded epochs of history, for resuming training"""
+        return {
+            'epoch': epoch,
+            'model_state_dict': self.model.state_dict(),
+            'optimizer_state_dict': self.optimizer.state_dict(),
+            'history': {key: values[:n_recorded].tolist() for key, values in self.history.items()}
+        }
+
+    def _save_async(self, checkpoint: dict, path: Path):
+        """
+        Snapshot a checkpoint to host memory and write it on a background
+        thread, so disk I/O overlaps with the next epoch. Writes are
+        serialized: a new save first waits for the previous one.
+        """
+        snapshot = _snapshot(checkpoint)
+        self._wait_for_save()
+
+        self._save_thread = threading.Thread(
+            target=torch.save,
+            args=(snapshot, path),
+            kwargs={'_use_new_zipfile_serialization': True}
+        )
+        self._save_thread.start()
+
+    def _wait_for_save(self):
+        """Block until the pending checkpoint write (if any) has finished"""
+        if self._save_thread is not None:
+            self._save_thread.join()
+            self._save_thread = None
+
     def load_checkpoint(self, checkpoint_path: str):
         """Load model from checkpoint"""
+        self._wait_for_save()
         checkpoint = torch.load(checkpoint_path, map_location=self.device)
         self.model.load_state_dict(checkpoint['model_state_dict'])
 
@@ -337,31 +659,52 @@ class TransformerTrainer:
             self.optimizer.load_state_dict(checkpoint['optimizer_state_dict'])
 
         if 'history' in checkpoint:
-            self.history = checkpoint['history']
+            self.history = {
+                key: np.asarray(values, dtype=np.float32)
+                for key, values in checkpoint['history'].items()
+            }
 
         logger.info(f"✓ Loaded checkpoint from {checkpoint_path}")
 
-    def predict(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    def predict(self, X: np.ndarray, batch_size: int = 512) -> Tuple[np.ndarray, np.ndarray]:
         """
         Make predictions on new data
 
+        Runs in fixed-size chunks so large inputs do not exhaust device
+        memory and a compiled model sees at most two batch shapes
+
         Args:
             X: Input sequences (n_samples, seq_length, n_features)
+            batch_size: Number of sequences per forward pass
 
         Returns:
-            Tuple of (classification_predictions, regression_predictions)
+            Tuple of (classification_predictions, regression_predictions),
+            each (n_samples, 1)
         """
         self.model.eval()
 
-        X_tensor = torch.FloatTensor(X).to(self.device)
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        n_samples = len(X)
+        cls_pred = np.empty((n_samples, 1), dtype=np.float32)
+        reg_pred = np.empty((n_samples, 1), dtype=np.float32)
+        pin = self.device.startswith('cuda')
 
-        with torch.no_grad():
-            cls_logits, reg_output = self.model(X_tensor)
-            cls_pred = torch.sigmoid(cls_logits).cpu().numpy()
-            reg_pred = reg_output.cpu().numpy()
+        with torch.inference_mode(), torch.amp.autocast(
+            device_type='cuda', dtype=self.amp_dtype, enabled=self.use_amp
+        ):
+            for start in range(0, n_samples, batch_size):
+                end = min(start + batch_size, n_samples)
 
-        return cls_pred, reg_pred
+                chunk = torch.from_numpy(X[start:end])
+                if pin:
+                    chunk = chunk.pin_memory()
+                chunk = chunk.to(self.device, non_blocking=True)
+
+                cls_logits, reg_output = self.model(chunk, return_both=True)
+                cls_pred[start:end] = torch.sigmoid(cls_logits).float().cpu().numpy()
+                reg_pred[start:end] = reg_output.float().cpu().numpy()
 
+        return cls_pred, reg_pred
 
 if __name__ == "__main__":
     from agents.market_data_loader import MarketDataLoader
@@ -391,8 +734,7 @@ if __name__ == "__main__":
     # Create data loaders
     train_loader, val_loader = trainer.prepare_data_loaders(
         data,
-        batch_size=32,
-        num_workers=0
+        batch_size=32
     )
 
     # Train model
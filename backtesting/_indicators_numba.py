@@ -0,0 +1,154 @@
+"""
+Numba-compiled indicator kernels for the backtesting strategies
+Requires numba (pip install -e .[perf]); strategies fall back to the
+pandas implementations when it is unavailable
+"""
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True)
+def _rsi_value(avg_gain, avg_loss):
+    """RSI from smoothed gain and loss; 100 with no losses, NaN when flat"""
+    if avg_loss == 0.0:
+        return 100.0 if avg_gain > 0.0 else np.nan
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+@njit(cache=True)
+def _rsi_numba(close, period):
+    """
+    Wilder's RSI of a price series in one pass
+
+    Average gain/loss are seeded with the simple mean of the first
+    `period` price changes, then smoothed recursively:
+    avg = (avg * (period - 1) + value) / period.
+
+    Args:
+        close: float64[:] prices
+        period: RSI period
+
+    Returns:
+        float64[:] RSI, NaN for the first `period` bars
+    """
+    n = close.shape[0]
+    rsi = np.full(n, np.nan)
+    if n <= period:
+        return rsi
+
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, period + 1):
+        change = close[i] - close[i - 1]
+        if change > 0.0:
+            avg_gain += change
+        else:
+            avg_loss -= change
+    avg_gain /= period
+    avg_loss /= period
+    rsi[period] = _rsi_value(avg_gain, avg_loss)
+
+    for i in range(period + 1, n):
+        change = close[i] - close[i - 1]
+        gain = change if change > 0.0 else 0.0
+        loss = -change if change < 0.0 else 0.0
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
+        rsi[i] = _rsi_value(avg_gain, avg_loss)
+
+    return rsi
+
+
+@njit(cache=True)
+def _adx_loop(plus_dm, minus_dm, period):
+    """
+    Wilder's ADX from directional movement in one kernel
+
+    Inputs start at the second bar (each needs the previous bar). +DM and
+    -DM are Wilder-smoothed from a simple-average seed over the first
+    `period` values; DX follows from the smoothed averages, and ADX is DX
+    smoothed the same way, so it is first defined at index 2 * period - 2.
+    +DI and -DI share the ATR denominator, which cancels out of DX, so the
+    true range is not needed.
+
+    Args:
+        plus_dm: float64[:] positive directional movement
+        minus_dm: float64[:] negative directional movement
+        period: ADX period
+
+    Returns:
+        float64[:] ADX aligned with the inputs, NaN until defined
+    """
+    n = plus_dm.shape[0]
+    adx = np.full(n, np.nan)
+    dx = np.empty(n)
+    if n < period:
+        return adx
+
+    plus_avg = 0.0
+    minus_avg = 0.0
+    for i in range(period):
+        plus_avg += plus_dm[i]
+        minus_avg += minus_dm[i]
+    plus_avg /= period
+    minus_avg /= period
+
+    for i in range(period - 1, n):
+        if i >= period:
+            plus_avg = (plus_avg * (period - 1) + plus_dm[i]) / period
+            minus_avg = (minus_avg * (period - 1) + minus_dm[i]) / period
+        di_sum = plus_avg + minus_avg
+        dx[i] = 100.0 * abs(plus_avg - minus_avg) / di_sum if di_sum > 0.0 else 0.0
+
+    first = 2 * period - 2
+    if n <= first:
+        return adx
+
+    value = 0.0
+    for i in range(period - 1, first + 1):
+        value += dx[i]
+    value /= period
+    adx[first] = value
+    for i in range(first + 1, n):
+        value = (value * (period - 1) + dx[i]) / period
+        adx[i] = value
+
+    return adx
+
+
+@njit(cache=True, parallel=True)
+def _ma_cross_signals(fast, slow, bars, min_bars, held):
+    """
+    Moving average crossover side for every symbol at one timestamp
+
+    Args:
+        fast: float64[:, :] fast moving average, one row per symbol
+        slow: float64[:, :] slow moving average, one row per symbol
+        bars: int64[:] each symbol's last bar index at the timestamp (-1 if none)
+        min_bars: Bars required before a symbol can signal
+        held: bool[:] whether each symbol has an open position
+
+    Returns:
+        int8[:] per symbol: 1 buy on a bullish cross, -1 sell on a bearish
+        cross of a held symbol, 0 otherwise
+    """
+    n = bars.shape[0]
+    sides = np.zeros(n, dtype=np.int8)
+
+    for s in prange(n):
+        i = bars[s]
+        if i + 1 < min_bars:
+            continue
+
+        current_fast = fast[s, i]
+        current_slow = slow[s, i]
+        prev_fast = fast[s, i - 1] if i > 0 else current_fast
+        prev_slow = slow[s, i - 1] if i > 0 else current_slow
+
+        if prev_fast <= prev_slow and current_fast > current_slow and not held[s]:
+            sides[s] = 1
+        elif prev_fast >= prev_slow and current_fast < current_slow and held[s]:
+            sides[s] = -1
+
+    return sides
@@ -0,0 +1,55 @@
+"""
+Numba-compiled performance metrics kernel for the backtesting engine
+Requires numba (pip install -e .[perf]); BacktestEngine falls back to
+the NumPy implementation when it is unavailable
+"""
+
+import math
+from numba import njit
+
+# Annualization factor for daily returns, folded in as a compile-time constant
+_SQRT_252 = math.sqrt(252.0)
+
+
+@njit(cache=True, fastmath=True)
+def _metrics_kernel(equity, rf_daily):
+    """
+    Return, Sharpe, drawdown and volatility of an equity curve in one pass
+
+    Per-tick returns are folded into a Welford mean/variance (sample std,
+    ddof=1) while the running peak and worst drawdown are tracked, so no
+    returns or running-max arrays are allocated.
+
+    Args:
+        equity: float64[:] portfolio value per tick
+        rf_daily: Per-tick risk-free rate
+
+    Returns:
+        (total_return, sharpe_ratio, max_drawdown, annual_volatility)
+    """
+    n = equity.shape[0]
+    if n == 0:
+        return 0.0, 0.0, 0.0, 0.0
+
+    mean = 0.0
+    m2 = 0.0
+    peak = equity[0]
+    max_dd = 0.0
+
+    for i in range(1, n):
+        value = equity[i]
+        ret = (value - equity[i - 1]) / equity[i - 1]
+        delta = ret - mean
+        mean += delta / i
+        m2 += delta * (ret - mean)
+
+        if value > peak:
+            peak = value
+        dd = (value - peak) / peak
+        if dd < max_dd:
+            max_dd = dd
+
+    std = math.sqrt(m2 / (n - 2)) if n > 2 else 0.0
+    sharpe = (mean - rf_daily) / std * _SQRT_252 if std > 0.0 else 0.0
+
+    return equity[n - 1] / equity[0] - 1.0, sharpe, max_dd, std * _SQRT_252
@@ -8,14 +8,88 @@ import pandas as pd
 from typing import Dict, List, Optional, Tuple, Callable
 from datetime import datetime, timedelta
 from dataclasses import dataclass
+from collections import deque
 from enum import Enum
 import logging
+import math
 from pathlib import Path
 import json
 
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+try:
+    from backtesting._metrics_numba import _metrics_kernel
+except ImportError:
+    _metrics_kernel = None
+
+# Annualization factor for daily returns
+_SQRT_252 = math.sqrt(252)
+
+# Completed-trade columns kept by BacktestEngine, one array each
+_TRADE_COLUMNS = {
+    'sym_idx': np.int32,
+    'entry_time_ns': np.int64,
+    'exit_time_ns': np.int64,
+    'entry_price': np.float64,
+    'exit_price': np.float64,
+    'quantity': np.float64,
+    'pnl': np.float64,
+    'commission': np.float64,
+}
+
+
+def _metrics_numpy(equity: np.ndarray, rf_daily: float) -> Tuple[float, float, float, float]:
+    """
+    NumPy fallback for _metrics_kernel when numba is not installed
+
+    Returns:
+        (total_return, sharpe_ratio, max_drawdown, annual_volatility)
+    """
+    if len(equity) == 0:
+        return 0.0, 0.0, 0.0, 0.0
+
+    # Annualized metrics (sample std, as pandas computed it)
+    returns = np.diff(equity) / equity[:-1]
+    returns_std = returns.std(ddof=1) if len(returns) > 1 else 0.0
+    sharpe_ratio = (returns.mean() - rf_daily) / returns_std * _SQRT_252 if returns_std > 0 else 0.0
+
+    # Drawdown calculation
+    running_max = np.maximum.accumulate(equity)
+    max_drawdown = ((equity - running_max) / running_max).min()
+
+    return equity[-1] / equity[0] - 1, sharpe_ratio, max_drawdown, returns_std * _SQRT_252
+
+
+def compact_market_data(
+    data: pd.DataFrame,
+    price_columns: Tuple[str, ...] = ('open', 'high', 'low', 'close', 'volume')
+) -> pd.DataFrame:
+    """
+    Shrink (timestamp, symbol) market data for long backtests
+
+    Price/volume columns are stored as float32, halving the memory the
+    strategies' rolling indicators stream through, and the symbol level
+    becomes categorical. Cash and P&L are still accounted in float64.
+
+    Args:
+        data: Historical market data with MultiIndex (timestamp, symbol)
+        price_columns: Columns to cast where present
+
+    Returns:
+        Compacted copy of data
+    """
+    columns = [col for col in price_columns if col in data.columns]
+    compact = data.astype({col: np.float32 for col in columns})
+    symbols = pd.CategoricalIndex(compact.index.levels[1], name=compact.index.names[1])
+    compact.index = compact.index.set_levels(symbols, level=1)
+    return compact
+
 
 class OrderType(Enum):
     """Order types"""
@@ -31,7 +105,15 @@ class OrderSide(Enum):
     SELL = "sell"
 
 
-@dataclass
+# Enum members are singletons, so hot paths compare these by identity
+_BUY = OrderSide.BUY
+_SELL = OrderSide.SELL
+_MARKET = OrderType.MARKET
+_LIMIT = OrderType.LIMIT
+_STOP = OrderType.STOP
+
+
+@dataclass(slots=True)
 class Order:
     """Order representation"""
     symbol: str
@@ -47,7 +129,11 @@ class Order:
     status: str = "pending"
 
 
-@dataclass
+# Bare Order allocation for place_order, which sets every field itself
+_new_order = Order.__new__
+
+
+@dataclass(slots=True)
 class Position:
     """Position representation"""
     symbol: str
@@ -57,9 +143,11 @@ class Position:
     entry_time: datetime
     unrealized_pnl: float = 0.0
     realized_pnl: float = 0.0
+    sym_idx: int = -1  # Column in the backtest price matrix
+    entry_time_ns: Optional[int] = None  # entry_time as int64 ns, set by run_backtest
 
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     """Completed trade"""
     symbol: str
@@ -75,6 +163,33 @@ class Trade:
     duration: timedelta
 
 
+def _execute_market(order: Order, current_price: float) -> Optional[float]:
+    """Market orders always fill at the current price"""
+    return current_price
+
+
+def _execute_limit(order: Order, current_price: float) -> Optional[float]:
+    """Limit orders fill at the limit once the price reaches it"""
+    if order.side is _BUY:
+        return order.price if current_price <= order.price else None
+    return order.price if current_price >= order.price else None
+
+
+def _execute_stop(order: Order, current_price: float) -> Optional[float]:
+    """Stop orders fill at the current price once the stop is crossed"""
+    if order.side is _BUY:
+        return current_price if current_price >= order.stop_price else None
+    return current_price if current_price <= order.stop_price else None
+
+
+# Trigger check per order type; unlisted types (STOP_LIMIT) never fill
+_EXECUTORS = {
+    _MARKET: _execute_market,
+    _LIMIT: _execute_limit,
+    _STOP: _execute_stop,
+}
+
+
 class BacktestEngine:
     """
     Professional backtesting engine with:
@@ -91,7 +206,9 @@ class BacktestEngine:
         commission_rate: float = 0.001,  # 0.1%
         slippage_rate: float = 0.0005,  # 0.05%
         max_position_size: float = 0.2,  # 20% per position
-        risk_free_rate: float = 0.02
+        risk_free_rate: float = 0.02,
+        record_trade_objects: bool = True,
+        recycle_orders: bool = False
     ):
         """
         Initialize backtest engine
@@ -102,40 +219,88 @@ class BacktestEngine:
             slippage_rate: Slippage as fraction of price
             max_position_size: Maximum position size as fraction of portfolio
             risk_free_rate: Annual risk-free rate
+            record_trade_objects: Also keep a Trade object per completed
+                trade in self.trades; the trade columns are always kept
+            recycle_orders: Reuse rejected Order objects for new orders.
+                The self.orders log is then not kept, and an Order returned
+                by place_order must not be held past its rejection
         """
         self.initial_capital = initial_capital
         self.commission_rate = commission_rate
         self.slippage_rate = slippage_rate
         self.max_position_size = max_position_size
         self.risk_free_rate = risk_free_rate
+        self.record_trade_objects = record_trade_objects
+        self.recycle_orders = recycle_orders
+
+        # Loop invariants for order execution and metrics
+        self._buy_slip = 1 + slippage_rate
+        self._sell_slip = 1 - slippage_rate
+        self._rf_daily = risk_free_rate / 252
 
         # State
         self.cash = initial_capital
         self.positions: Dict[str, Position] = {}
         self.orders: List[Order] = []
+        self.pending_orders: deque = deque()
+        self.filled_orders: List[Order] = []
+        self._order_pool: List[Order] = []
         self.trades: List[Trade] = []
         self.portfolio_history: List[Dict] = []
         self.current_time: Optional[datetime] = None
-
-        # Performance tracking
-        self.equity_curve = []
-        self.returns = []
-        self.drawdowns = []
+        self._current_time_ns: Optional[int] = None
+        self.symbol_to_idx: Dict[str, int] = {}
+
+        # Performance tracking (equity preallocated per run, filled by tick)
+        self.equity_curve = np.empty(0)
+        self.returns = np.empty(0)
+        self.drawdowns = np.empty(0)
+        self._running_max = -math.inf
+        self._min_dd: Optional[float] = None
+        self._total_commission = 0.0
+
+        # Completed trades as growable column buffers (see _TRADE_COLUMNS)
+        self._init_trade_buffers()
+
+    def _init_trade_buffers(self, capacity: int = 1024):
+        """Allocate empty trade column buffers"""
+        self._trade_cap = capacity
+        self._trade_n = 0
+        self._trade_cols = {name: np.empty(capacity, dtype=dtype) for name, dtype in _TRADE_COLUMNS.items()}
+
+    def _grow_trade_buffers(self):
+        """Double trade buffer capacity, keeping recorded trades"""
+        self._trade_cap *= 2
+        for name, col in self._trade_cols.items():
+            grown = np.empty(self._trade_cap, dtype=col.dtype)
+            grown[:self._trade_n] = col[:self._trade_n]
+            self._trade_cols[name] = grown
 
     def reset(self):
         """Reset backtest state"""
         self.cash = self.initial_capital
         self.positions = {}
         self.orders = []
+        self.pending_orders = deque()
+        self.filled_orders = []
         self.trades = []
+        self._init_trade_buffers()
         self.portfolio_history = []
-        self.equity_curve = []
-        self.returns = []
-        self.drawdowns = []
+        self.equity_curve = np.empty(0)
+        self.returns = np.empty(0)
+        self.drawdowns = np.empty(0)
+        self._running_max = -math.inf
+        self._min_dd = None
+        self._total_commission = 0.0
         self.current_time = None
+        self._current_time_ns = None
+        self.symbol_to_idx = {}
 
     def get_portfolio_value(self) -> float:
         """Calculate total portfolio value"""
+        if not self.positions:
+            return self.cash
+
         positions_value = sum(
             pos.quantity * pos.current_price
             for pos in self.positions.values()
@@ -165,17 +330,24 @@ class BacktestEngine:
         Returns:
             Order object
         """
-        order = Order(
-            symbol=symbol,
-            side=side,
-            order_type=order_type,
-            quantity=quantity,
-            price=price,
-            stop_price=stop_price,
-            timestamp=self.current_time
-        )
-
-        self.orders.append(order)
+        # Reuse a recycled order or allocate one without the dataclass
+        # __init__; every field is assigned below either way
+        order = self._order_pool.pop() if self._order_pool else _new_order(Order)
+        order.symbol = symbol
+        order.side = side
+        order.order_type = order_type
+        order.quantity = quantity
+        order.price = price
+        order.stop_price = stop_price
+        order.timestamp = self.current_time
+        order.filled_price = None
+        order.commission = 0.0
+        order.slippage = 0.0
+        order.status = "pending"
+
+        if not self.recycle_orders:
+            self.orders.append(order)
+        self.pending_orders.append(order)
         return order
 
     def execute_order(self, order: Order, current_price: float) -> bool:
@@ -192,42 +364,24 @@ class BacktestEngine:
         if order.status != "pending":
             return False
 
-        # Check order type conditions
-        should_execute = False
-
-        if order.order_type == OrderType.MARKET:
-            should_execute = True
-            execution_price = current_price
-        elif order.order_type == OrderType.LIMIT:
-            if order.side == OrderSide.BUY and current_price <= order.price:
-                should_execute = True
-                execution_price = order.price
-            elif order.side == OrderSide.SELL and current_price >= order.price:
-                should_execute = True
-                execution_price = order.price
-        elif order.order_type == OrderType.STOP:
-            if order.side == OrderSide.BUY and current_price >= order.stop_price:
-                should_execute = True
-                execution_price = current_price
-            elif order.side == OrderSide.SELL and current_price <= order.stop_price:
-                should_execute = True
-                execution_price = current_price
-
-        if not should_execute:
+        # Trigger check specialized per order type; None means not triggered
+        handler = _EXECUTORS.get(order.order_type)
+        execution_price = handler(order, current_price) if handler is not None else None
+        if execution_price is None:
             return False
 
         # Apply slippage
-        if order.side == OrderSide.BUY:
-            execution_price *= (1 + self.slippage_rate)
+        if order.side is _BUY:
+            execution_price *= self._buy_slip
         else:
-            execution_price *= (1 - self.slippage_rate)
+            execution_price *= self._sell_slip
 
         # Calculate commission
         trade_value = execution_price * order.quantity
         commission = trade_value * self.commission_rate
 
         # Check if we have enough cash (for BUY orders)
-        if order.side == OrderSide.BUY:
+        if order.side is _BUY:
             total_cost = trade_value + commission
             if total_cost > self.cash:
                 order.status = "rejected"
@@ -239,6 +393,7 @@ class BacktestEngine:
         order.commission = commission
         order.slippage = abs(execution_price - current_price)
         order.status = "filled"
+        self._total_commission += commission
 
         self._update_position(order)
 
@@ -248,7 +403,7 @@ class BacktestEngine:
         """Update position after order execution"""
         symbol = order.symbol
 
-        if order.side == OrderSide.BUY:
+        if order.side is _BUY:
             # Open or add to position
             if symbol in self.positions:
                 pos = self.positions[symbol]
@@ -265,7 +420,9 @@ class BacktestEngine:
                     quantity=order.quantity,
                     entry_price=order.filled_price,
                     current_price=order.filled_price,
-                    entry_time=self.current_time
+                    entry_time=self.current_time,
+                    sym_idx=self.symbol_to_idx.setdefault(symbol, len(self.symbol_to_idx)),
+                    entry_time_ns=self._current_time_ns
                 )
 
             # Deduct cash
@@ -282,21 +439,45 @@ class BacktestEngine:
             pnl = (order.filled_price - pos.entry_price) * order.quantity
             pnl -= order.commission
 
-            # Create trade record
-            trade = Trade(
-                symbol=symbol,
-                entry_time=pos.entry_time,
-                exit_time=self.current_time,
-                entry_price=pos.entry_price,
-                exit_price=order.filled_price,
-                quantity=order.quantity,
-                pnl=pnl,
-                pnl_percent=(order.filled_price / pos.entry_price - 1) * 100,
-                commission=order.commission,
-                side=OrderSide.SELL,
-                duration=self.current_time - pos.entry_time
-            )
-            self.trades.append(trade)
+            # Times as int64 ns; only positions or ticks from outside
+            # run_backtest need a Timestamp conversion
+            entry_ns = pos.entry_time_ns
+            if entry_ns is None:
+                entry_ns = pd.Timestamp(pos.entry_time).value
+            exit_ns = self._current_time_ns
+            if exit_ns is None:
+                exit_ns = pd.Timestamp(self.current_time).value
+
+            # Record the trade in the column buffers
+            if self._trade_n == self._trade_cap:
+                self._grow_trade_buffers()
+            k = self._trade_n
+            cols = self._trade_cols
+            # Positions built outside place_order may lack a sym_idx
+            cols['sym_idx'][k] = self.symbol_to_idx.setdefault(symbol, len(self.symbol_to_idx))
+            cols['entry_time_ns'][k] = entry_ns
+            cols['exit_time_ns'][k] = exit_ns
+            cols['entry_price'][k] = pos.entry_price
+            cols['exit_price'][k] = order.filled_price
+            cols['quantity'][k] = order.quantity
+            cols['pnl'][k] = pnl
+            cols['commission'][k] = order.commission
+            self._trade_n = k + 1
+
+            if self.record_trade_objects:
+                self.trades.append(Trade(
+                    symbol=symbol,
+                    entry_time=pos.entry_time,
+                    exit_time=self.current_time,
+                    entry_price=pos.entry_price,
+                    exit_price=order.filled_price,
+                    quantity=order.quantity,
+                    pnl=pnl,
+                    pnl_percent=(order.filled_price / pos.entry_price - 1) * 100,
+                    commission=order.commission,
+                    side=_SELL,
+                    duration=pd.Timedelta(exit_ns - entry_ns)
+                ))
 
             # Update position
             pos.quantity -= order.quantity
@@ -311,11 +492,113 @@ class BacktestEngine:
 
     def update_positions(self, prices: Dict[str, float]):
         """Update current prices and unrealized P&L"""
+        if not self.positions:
+            return
+
         for symbol, pos in self.positions.items():
             if symbol in prices:
                 pos.current_price = prices[symbol]
                 pos.unrealized_pnl = (pos.current_price - pos.entry_price) * pos.quantity
 
+    def update_positions_row(self, prices_row: np.ndarray, sym_to_idx: Dict[str, int]):
+        """
+        Update current prices and unrealized P&L from one price-matrix row
+
+        Array counterpart of update_positions used by the backtest loop:
+        each position reads prices_row[pos.sym_idx] and NaN prices are
+        skipped. Positions without a sym_idx are resolved once through
+        sym_to_idx; symbols indexed past the row (traded but not priced)
+        are skipped.
+
+        Args:
+            prices_row: Prices for one tick, in sym_to_idx column order
+            sym_to_idx: Symbol to column index mapping
+        """
+        if not self.positions:
+            return
+
+        for symbol, pos in self.positions.items():
+            j = pos.sym_idx
+            if j < 0:
+                j = pos.sym_idx = sym_to_idx.get(symbol, -1)
+                if j < 0:
+                    continue
+            if j >= len(prices_row):
+                continue
+            price = prices_row[j]
+            if price == price:
+                pos.current_price = price
+                pos.unrealized_pnl = (price - pos.entry_price) * pos.quantity
+
+    def _pandas_inputs(
+        self,
+        data: pd.DataFrame,
+        symbols: List[str]
+    ) -> Tuple[np.ndarray, pd.Index]:
+        """
+        Close matrix for MultiIndex (timestamp, symbol) data
+
+        The timestamp level of a MultiIndex is already unique and sorted,
+        so closes are scattered into the matrix through the index codes
+        rather than re-deduplicated by an unstack.
+
+        Args:
+            data: Historical market data with MultiIndex (timestamp, symbol)
+            symbols: List of symbols to trade
+
+        Returns:
+            ((T, N) close matrix with NaN gaps, timestamps)
+        """
+        index = data.index.remove_unused_levels()
+        timestamps = index.levels[0]
+        if not timestamps.is_monotonic_increasing:
+            close_df = data['close'].unstack(level=1).reindex(columns=symbols)
+            return close_df.to_numpy(dtype=np.float64), close_df.index
+
+        # Map symbol-level codes to matrix columns (-1 for untraded symbols)
+        level_cols = np.full(len(index.levels[1]), -1)
+        positions = index.levels[1].get_indexer(symbols)
+        traded = positions >= 0
+        level_cols[positions[traded]] = np.flatnonzero(traded)
+
+        ts_codes, sym_codes = index.codes
+        cols = level_cols[sym_codes]
+        keep = cols >= 0
+
+        close_mat = np.full((len(timestamps), len(symbols)), np.nan)
+        close_mat[ts_codes[keep], cols[keep]] = data['close'].to_numpy(dtype=np.float64)[keep]
+
+        return close_mat, timestamps
+
+    def _polars_inputs(
+        self,
+        data: "pl.DataFrame",
+        symbols: List[str]
+    ) -> Tuple["pl.DataFrame", np.ndarray, List[datetime], np.ndarray]:
+        """
+        Close matrix and per-tick row bounds for long-format Polars data
+
+        Args:
+            data: Polars frame with 'timestamp', 'symbol' and 'close' columns
+            symbols: List of symbols to trade
+
+        Returns:
+            (data sorted by timestamp/symbol, (T, N) close matrix with NaN
+            gaps, timestamps, end row of each timestamp in the sorted data)
+        """
+        data = data.sort(['timestamp', 'symbol'])
+        wide = data.pivot(on='symbol', index='timestamp', values='close').sort('timestamp')
+
+        close_mat = np.full((wide.height, len(symbols)), np.nan)
+        for j, symbol in enumerate(symbols):
+            if symbol in wide.columns:
+                close_mat[:, j] = wide[symbol].cast(pl.Float64).fill_null(np.nan).to_numpy()
+
+        # Rows [0, end) of the sorted frame are everything up to each tick
+        row_ends = data['timestamp'].search_sorted(wide['timestamp'], side='right').to_numpy()
+
+        return data, close_mat, wide['timestamp'].to_list(), row_ends
+
     def run_backtest(
         self,
         strategy: Callable,
@@ -325,49 +608,86 @@ class BacktestEngine:
         """
         Run backtest with a trading strategy
 
+        Polars input is also accepted, as a long frame with 'timestamp',
+        'symbol' and 'close' columns. The strategy then receives a
+        zero-copy slice of the rows up to the current timestamp instead
+        of the full frame, unless it sets accepts_polars = False (as the
+        built-in strategies do): it is then given the full frame
+        converted once to the pandas MultiIndex layout. Either way, closes are held as a C-contiguous
+        (T, N) float64 matrix with one row per tick, in symbols order.
+
         Args:
             strategy: Strategy function that returns signals
-            data: Historical market data with MultiIndex (timestamp, symbol)
+            data: Historical market data with MultiIndex (timestamp, symbol),
+                or a Polars DataFrame
             symbols: List of symbols to trade
 
         Returns:
             Dictionary with backtest results
         """
+        polars_input = pl is not None and isinstance(data, pl.DataFrame)
+        if polars_input:
+            data, close_mat, timestamps, row_ends = self._polars_inputs(data, symbols)
+            if not getattr(strategy, 'accepts_polars', True):
+                # Strategies built on the pandas MultiIndex see the whole
+                # history and look up each bar by timestamp themselves
+                data = data.to_pandas().set_index(['timestamp', 'symbol'])
+                polars_input = False
+        else:
+            # Closes once into a (T, N) matrix aligned to symbols; missing
+            # (timestamp, symbol) rows become NaN and are masked out per tick
+            close_mat, timestamps = self._pandas_inputs(data, symbols)
+
         logger.info("=" * 80)
         logger.info("STARTING BACKTEST")
         logger.info("=" * 80)
         logger.info(f"Initial Capital: ${self.initial_capital:,.2f}")
         logger.info(f"Symbols: {', '.join(symbols)}")
-        logger.info(f"Period: {data.index[0]} to {data.index[-1]}")
+        logger.info(f"Period: {timestamps[0]} to {timestamps[-1]}")
         logger.info("=" * 80)
 
         self.reset()
+        symbol_to_idx = self.symbol_to_idx = {symbol: j for j, symbol in enumerate(symbols)}
+
+        # Row-major so each tick's row is one contiguous stride
+        close_mat = np.ascontiguousarray(close_mat, dtype=np.float64)
+        valid_mat = ~np.isnan(close_mat)
+        n_ticks = len(timestamps)
+        self.equity_curve = np.empty(n_ticks)
+        progress_step = max(1, n_ticks // 20)
+        log_progress = logger.isEnabledFor(logging.INFO)
+        self._min_dd = 0.0
 
-        # Get unique timestamps
-        timestamps = data.index.get_level_values(0).unique()
+        timestamps_ns = pd.DatetimeIndex(timestamps).as_unit('ns').asi8
 
         for i, timestamp in enumerate(timestamps):
             self.current_time = timestamp
+            self._current_time_ns = int(timestamps_ns[i])
 
-            # Get current prices
-            current_prices = {}
-            for symbol in symbols:
-                try:
-                    price = data.loc[(timestamp, symbol), 'close']
-                    current_prices[symbol] = price
-                except KeyError:
-                    continue
+            # Current prices, indexed by symbol_to_idx
+            prices_row = close_mat[i]
+            valid_row = valid_mat[i]
 
             # Update positions with current prices
-            self.update_positions(current_prices)
-
-            # Execute pending orders
-            for order in self.orders:
-                if order.status == "pending" and order.symbol in current_prices:
-                    self.execute_order(order, current_prices[order.symbol])
+            self.update_positions_row(prices_row, symbol_to_idx)
+
+            # Execute pending orders; one rotation of the queue keeps
+            # unfilled orders in placement order and drops settled ones
+            for _ in range(len(self.pending_orders)):
+                order = self.pending_orders.popleft()
+                j = symbol_to_idx.get(order.symbol)
+                if j is not None and j < len(valid_row) and valid_row[j]:
+                    self.execute_order(order, prices_row[j])
+                if order.status == "pending":
+                    self.pending_orders.append(order)
+                elif order.status == "filled":
+                    self.filled_orders.append(order)
+                elif self.recycle_orders:
+                    self._order_pool.append(order)
 
             # Get strategy signals
-            signals = strategy(data, timestamp, self.positions, self.cash)
+            strategy_data = data.slice(0, row_ends[i]) if polars_input else data
+            signals = strategy(strategy_data, timestamp, self.positions, self.cash)
 
             # Process signals
             for signal in signals:
@@ -375,28 +695,33 @@ class BacktestEngine:
 
             # Record portfolio state
             portfolio_value = self.get_portfolio_value()
-            self.equity_curve.append(portfolio_value)
+            self.equity_curve[i] = portfolio_value
 
-            if i > 0:
-                daily_return = (portfolio_value / self.equity_curve[i-1]) - 1
-                self.returns.append(daily_return)
+            # Online peak and worst drawdown
+            if portfolio_value > self._running_max:
+                self._running_max = portfolio_value
+            dd = (portfolio_value - self._running_max) / self._running_max
+            if dd < self._min_dd:
+                self._min_dd = dd
 
             self.portfolio_history.append({
                 'timestamp': timestamp,
                 'cash': self.cash,
                 'portfolio_value': portfolio_value,
                 'positions': len(self.positions),
-                'num_trades': len(self.trades)
+                'num_trades': self._trade_n
             })
 
-            # Progress logging
-            if (i + 1) % 50 == 0:
+            # Progress logging every 5% of ticks, formatted only when emitted
+            if log_progress and (i + 1) % progress_step == 0:
                 logger.info(
-                    f"Progress: {i+1}/{len(timestamps)} | "
-                    f"Portfolio: ${portfolio_value:,.2f} | "
-                    f"Trades: {len(self.trades)}"
+                    "Progress: %d/%d | Portfolio: $%.2f | Trades: %d",
+                    i + 1, n_ticks, portfolio_value, self._trade_n
                 )
 
+        # Per-tick returns, computed once over the whole equity curve
+        self.returns = np.diff(self.equity_curve) / self.equity_curve[:-1]
+
         # Calculate final metrics
         results = self.calculate_metrics()
 
@@ -414,46 +739,151 @@ class BacktestEngine:
 
         return results
 
+    def run_vector_backtest(
+        self,
+        signals: np.ndarray,
+        prices: np.ndarray,
+        weights: Optional[np.ndarray] = None
+    ) -> Dict:
+        """
+        Fast path for stateless long/flat strategies given as a signal matrix
+
+        Replaces the per-tick loop with one vectorized pass. A signal at
+        tick t is filled at tick t+1's close, as market orders are in
+        run_backtest. Held weights are rebalanced to signal * weight every
+        tick, and commission plus slippage are charged on the traded
+        weight. No individual fills are simulated, so trade statistics
+        are zero.
+
+        Args:
+            signals: (T, N) array of target exposure per symbol, e.g. 0/1
+            prices: (T, N) array of gap-free close prices
+
+            Both are converted to C-contiguous float64 (one row per tick),
+            copying only when the input is Fortran-ordered or another dtype.
+            weights: (N,) fraction of equity per symbol at full signal
+                (defaults to max_position_size for every symbol)
+
+        Returns:
+            Dictionary with backtest results
+        """
+        signals = np.ascontiguousarray(signals, dtype=np.float64)
+        prices = np.ascontiguousarray(prices, dtype=np.float64)
+        if prices.ndim != 2 or signals.shape != prices.shape:
+            raise ValueError(f"signals {signals.shape} and prices {prices.shape} must be matching (T, N) arrays")
+        if weights is None:
+            weights = np.full(prices.shape[1], self.max_position_size)
+
+        self.reset()
+
+        # Weight held after tick t's close is the target signalled at t-1
+        held = np.zeros_like(signals)
+        held[1:] = signals[:-1] * weights
+
+        # Per-tick growth from the weight held over the previous interval,
+        # net of costs on the weight traded at this tick
+        gross = np.zeros(len(prices))
+        gross[1:] = (held[:-1] * (prices[1:] / prices[:-1] - 1)).sum(axis=1)
+        turnover = np.abs(np.diff(held, axis=0, prepend=0.0)).sum(axis=1)
+        cost = turnover * (self.commission_rate + self.slippage_rate)
+
+        self.equity_curve = self.initial_capital * np.cumprod((1 + gross) * (1 - cost))
+        self.returns = np.diff(self.equity_curve) / self.equity_curve[:-1]
+
+        # Commission in currency, on equity before this tick's costs
+        pre_cost_equity = self.equity_curve / (1 - cost)
+        self._total_commission = (turnover * self.commission_rate * pre_cost_equity).sum()
+
+        return self.calculate_metrics()
+
+    @classmethod
+    def run_sweep(
+        cls,
+        strategy_cls: Callable,
+        param_grid: List[Dict],
+        data: pd.DataFrame,
+        symbols: List[str],
+        max_workers: Optional[int] = None,
+        **engine_kwargs
+    ) -> List[Dict]:
+        """
+        Backtest every strategy configuration in a process pool
+
+        Each run is still sequential in time; only independent
+        configurations execute in parallel, through
+        backtesting.parallel.run_in_pool, which ships the data to the
+        workers once.
+
+        Args:
+            strategy_cls: Picklable strategy factory, e.g. MovingAverageCrossover
+            param_grid: List of keyword-argument dicts for strategy_cls
+            data: Historical market data with MultiIndex (timestamp, symbol)
+            symbols: List of symbols to trade
+            max_workers: Worker processes (defaults to the CPU count)
+            **engine_kwargs: Arguments for each BacktestEngine
+
+        Returns:
+            One results dictionary per configuration, in param_grid order,
+            each with the configuration under 'params'
+        """
+        from backtesting.parallel import _run_config, run_in_pool
+
+        jobs = [((cls, engine_kwargs, symbols, strategy_cls, params), 0) for params in param_grid]
+        results = run_in_pool(_run_config, jobs, [data], max_workers)
+        for params, result in zip(param_grid, results):
+            result['params'] = params
+        return results
+
+    def trade_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Completed-trade columns as NumPy arrays
+
+        Returns:
+            Dictionary with one array per _TRADE_COLUMNS entry plus
+            'duration_ns' and 'duration_sec', one element per completed
+            trade. Arrays are views of the engine's buffers, valid until
+            the next reset.
+        """
+        n = self._trade_n
+        arrays = {name: col[:n] for name, col in self._trade_cols.items()}
+        arrays['duration_ns'] = arrays['exit_time_ns'] - arrays['entry_time_ns']
+        arrays['duration_sec'] = arrays['duration_ns'] / 1e9
+        return arrays
+
     def calculate_metrics(self) -> Dict:
         """Calculate comprehensive performance metrics"""
-        final_value = self.get_portfolio_value()
-        total_return = (final_value / self.initial_capital) - 1
+        equity = np.ascontiguousarray(self.equity_curve, dtype=np.float64)
+        final_value = equity[-1] if len(equity) > 0 else self.get_portfolio_value()
+        metrics_fn = _metrics_kernel if _metrics_kernel is not None else _metrics_numpy
+
+        # Return, Sharpe, drawdown and volatility from the equity curve; the
+        # first mark is the initial capital since orders fill a tick later
+        if len(equity) > 0:
+            total_return, sharpe_ratio, max_drawdown, annual_vol = metrics_fn(
+                equity, self._rf_daily
+            )
+        else:
+            total_return = (final_value / self.initial_capital) - 1
+            sharpe_ratio = max_drawdown = annual_vol = 0
 
-        # Convert to pandas Series for easier calculation
-        returns_series = pd.Series(self.returns)
-        equity_series = pd.Series(self.equity_curve)
+        # Drawdown tracked online by run_backtest
+        if self._min_dd is not None:
+            max_drawdown = self._min_dd
 
-        # Annualized metrics
-        n_days = len(self.returns)
+        n_days = len(equity) - 1
         annual_factor = 252 / n_days if n_days > 0 else 0
         annual_return = (1 + total_return) ** annual_factor - 1 if total_return > -1 else -1
-        annual_vol = returns_series.std() * np.sqrt(252) if len(returns_series) > 0 else 0
-
-        # Sharpe ratio
-        excess_returns = returns_series - (self.risk_free_rate / 252)
-        sharpe_ratio = (
-            excess_returns.mean() / returns_series.std() * np.sqrt(252)
-            if len(returns_series) > 0 and returns_series.std() > 0
-            else 0
-        )
 
-        # Drawdown calculation
-        running_max = equity_series.expanding().max()
-        drawdown = (equity_series - running_max) / running_max
-        max_drawdown = drawdown.min() if len(drawdown) > 0 else 0
-
-        # Trade statistics
-        winning_trades = [t for t in self.trades if t.pnl > 0]
-        losing_trades = [t for t in self.trades if t.pnl <= 0]
-
-        win_rate = len(winning_trades) / len(self.trades) if self.trades else 0
-        avg_win = np.mean([t.pnl for t in winning_trades]) if winning_trades else 0
-        avg_loss = np.mean([t.pnl for t in losing_trades]) if losing_trades else 0
-        profit_factor = (
-            abs(sum(t.pnl for t in winning_trades) / sum(t.pnl for t in losing_trades))
-            if losing_trades and sum(t.pnl for t in losing_trades) != 0
-            else 0
-        )
+        # Trade statistics from the P&L column, no per-trade attribute access
+        pnl = self._trade_cols['pnl'][:self._trade_n]
+        wins = pnl[pnl > 0]
+        losses = pnl[pnl <= 0]
+        loss_sum = losses.sum()
+
+        win_rate = len(wins) / len(pnl) if len(pnl) else 0
+        avg_win = wins.mean() if len(wins) else 0
+        avg_loss = losses.mean() if len(losses) else 0
+        profit_factor = abs(wins.sum() / loss_sum) if len(losses) and loss_sum != 0 else 0
 
         return {
             'initial_value': self.initial_capital,
@@ -463,41 +893,73 @@ class BacktestEngine:
             'annual_volatility': annual_vol,
             'sharpe_ratio': sharpe_ratio,
             'max_drawdown': max_drawdown,
-            'total_trades': len(self.trades),
-            'winning_trades': len(winning_trades),
-            'losing_trades': len(losing_trades),
+            'total_trades': len(pnl),
+            'winning_trades': len(wins),
+            'losing_trades': len(losses),
             'win_rate': win_rate,
             'avg_win': avg_win,
             'avg_loss': avg_loss,
             'profit_factor': profit_factor,
-            'total_commission': sum(o.commission for o in self.orders if o.status == "filled")
+            'total_commission': self._total_commission
         }
 
-    def export_results(self, output_dir: str = "backtest_results"):
-        """Export backtest results to files"""
+    def export_results(self, output_dir: str = "backtest_results", legacy_csv: bool = False):
+        """
+        Export backtest results to files
+
+        Trades and portfolio history are written as zstd-compressed
+        Parquet, with trades built straight from the column buffers.
+
+        Args:
+            output_dir: Directory for the exported files
+            legacy_csv: Write trades.csv / portfolio_history.csv instead
+                (also used when pyarrow is not installed)
+        """
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
 
-        # Export trades
-        trades_df = pd.DataFrame([
-            {
-                'symbol': t.symbol,
-                'entry_time': t.entry_time,
-                'exit_time': t.exit_time,
-                'entry_price': t.entry_price,
-                'exit_price': t.exit_price,
-                'quantity': t.quantity,
-                'pnl': t.pnl,
-                'pnl_percent': t.pnl_percent,
-                'duration_days': t.duration.days
-            }
-            for t in self.trades
-        ])
-        trades_df.to_csv(output_path / 'trades.csv', index=False)
-
-        # Export portfolio history
-        portfolio_df = pd.DataFrame(self.portfolio_history)
-        portfolio_df.to_csv(output_path / 'portfolio_history.csv', index=False)
+        # Trade columns straight from the buffers; times stay int64 ns
+        trades = self.trade_arrays()
+        # sym_idx -> symbol; every traded symbol has an index (see _update_position)
+        symbols = np.empty(len(self.symbol_to_idx), dtype=object)
+        symbols[list(self.symbol_to_idx.values())] = list(self.symbol_to_idx)
+        trade_columns = {
+            'symbol': symbols[trades['sym_idx']],
+            'entry_time': trades['entry_time_ns'],
+            'exit_time': trades['exit_time_ns'],
+            'entry_price': trades['entry_price'],
+            'exit_price': trades['exit_price'],
+            'quantity': trades['quantity'],
+            'pnl': trades['pnl'],
+            'pnl_percent': (trades['exit_price'] / trades['entry_price'] - 1) * 100,
+            'duration_days': trades['duration_ns'] // 86_400_000_000_000
+        }
+
+        if not legacy_csv:
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                logger.warning("pyarrow not installed, exporting CSV. Install with: pip install pyarrow")
+                legacy_csv = True
+
+        if legacy_csv:
+            trades_df = pd.DataFrame(trade_columns)
+            for col in ('entry_time', 'exit_time'):
+                trades_df[col] = pd.to_datetime(trades_df[col], unit='ns')
+            trades_df.to_csv(output_path / 'trades.csv', index=False)
+
+            portfolio_df = pd.DataFrame(self.portfolio_history)
+            portfolio_df.to_csv(output_path / 'portfolio_history.csv', index=False)
+        else:
+            trades_table = pa.table({
+                name: pa.array(values, type=pa.timestamp('ns')) if name.endswith('_time') else pa.array(values)
+                for name, values in trade_columns.items()
+            })
+            pq.write_table(trades_table, output_path / 'trades.parquet', compression='zstd')
+
+            portfolio_table = pa.Table.from_pylist(self.portfolio_history)
+            pq.write_table(portfolio_table, output_path / 'portfolio_history.parquet', compression='zstd')
 
         # Export metrics
         metrics = self.calculate_metrics()
@@ -546,4 +1008,4 @@ if __name__ == "__main__":
     print("    - Transaction costs and slippage")
     print("    - Position management")
     print("    - Comprehensive performance metrics")
-    print("    - Export to CSV/JSON")
+    print("    - Export to Parquet/JSON (CSV on request)")
@@ -0,0 +1,171 @@
+"""
+Parallel Backtest Driver
+Run independent strategy/data-split backtests in worker processes
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+import logging
+import multiprocessing
+import os
+import tempfile
+from pathlib import Path
+
+from backtesting.engine import BacktestEngine
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+logger = logging.getLogger(__name__)
+
+
+def split_symbols(data: pd.DataFrame, n_groups: int) -> List[pd.DataFrame]:
+    """
+    Partition market data into symbol groups
+
+    Args:
+        data: Historical market data with MultiIndex (timestamp, symbol)
+        n_groups: Number of groups; symbols are dealt round-robin
+
+    Returns:
+        One frame per non-empty group, each holding only its symbols' rows
+    """
+    symbols = data.index.get_level_values(1).unique()
+    groups = [symbols[k::n_groups] for k in range(n_groups)]
+    return [
+        data[data.index.get_level_values(1).isin(group)]
+        for group in groups
+        if len(group)
+    ]
+
+
+def _write_frame(data: pd.DataFrame, path: str):
+    """Write a frame as an uncompressed Arrow IPC file workers can memory-map"""
+    feather.write_feather(data.reset_index(), path, compression='uncompressed')
+
+
+@lru_cache(maxsize=1)
+def _read_frame(path: str, index_names: Tuple[Optional[str], ...]) -> pd.DataFrame:
+    """Memory-map an Arrow IPC frame and restore its index, once per worker for repeated jobs"""
+    # reset_index() stored unnamed levels as level_<i> columns
+    columns = [name if name is not None else f'level_{i}' for i, name in enumerate(index_names)]
+    frame = feather.read_table(path, memory_map=True).to_pandas().set_index(columns)
+    return frame.rename_axis(list(index_names))
+
+
+def _call_with_frame(worker: Callable, args: Tuple, data, index_names: Optional[Tuple] = None):
+    """
+    Run worker(*args, frame) in a worker process
+
+    Module-level so ProcessPoolExecutor can pickle it. data is either the
+    frame itself or the path of its Arrow IPC file.
+    """
+    if isinstance(data, str):
+        data = _read_frame(data, index_names)
+    return worker(*args, data)
+
+
+def run_in_pool(
+    worker: Callable,
+    jobs: Sequence[Tuple[Tuple, int]],
+    frames: Sequence[pd.DataFrame],
+    n_workers: Optional[int] = None
+) -> List:
+    """
+    Run worker(*args, frames[k]) for every (args, k) job in a process pool
+
+    Each frame is written once as an Arrow IPC file that the workers
+    memory-map, rather than being pickled into every job; without pyarrow
+    the frames are pickled. Workers are spawned, not forked: forking after
+    Numba's parallel threading layer has started can deadlock.
+
+    Args:
+        worker: Picklable module-level function taking the frame last
+        jobs: (args, frame index) pairs
+        frames: Market data frames referenced by the jobs
+        n_workers: Worker processes (defaults to the CPU count)
+
+    Returns:
+        One worker result per job, in job order
+    """
+    n_workers = min(n_workers or os.cpu_count() or 1, len(jobs))
+    results: List = [None] * len(jobs)
+
+    # A single worker gains nothing from a pool
+    if n_workers <= 1:
+        return [worker(*args, frames[k]) for args, k in jobs]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if feather is None:
+            logger.warning("pyarrow not installed, pickling market data. Install with: pip install pyarrow")
+            sources = [(frame, None) for frame in frames]
+        else:
+            sources = []
+            for k, frame in enumerate(frames):
+                path = str(Path(tmp_dir) / f"frame_{k}.arrow")
+                _write_frame(frame, path)
+                sources.append((path, tuple(frame.index.names)))
+
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=n_workers, mp_context=context) as executor:
+            futures = {
+                executor.submit(_call_with_frame, worker, args, *sources[k]): j
+                for j, (args, k) in enumerate(jobs)
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+
+    return results
+
+
+def _run_config(engine_cls: type, engine_kwargs: Dict, symbols: List[str],
+                strategy_cls: Callable, params: Dict, data: pd.DataFrame) -> Dict:
+    """Backtest one strategy configuration (a BacktestEngine.run_sweep job)"""
+    engine = engine_cls(**engine_kwargs)
+    return engine.run_backtest(strategy_cls(**params), data, symbols)
+
+
+def _run_split(engine_kwargs: Dict, strategy, data: pd.DataFrame) -> Dict:
+    """Backtest one strategy on its data split (a run_parallel job)"""
+    symbols = list(data.index.get_level_values(1).unique())
+    engine = BacktestEngine(**engine_kwargs)
+    results = engine.run_backtest(strategy, data, symbols)
+    results['symbols'] = symbols
+    results['equity_curve'] = np.asarray(engine.equity_curve)
+    return results
+
+
+def run_parallel(
+    strategies: List,
+    data_splits: List[pd.DataFrame],
+    n_workers: Optional[int] = None,
+    **engine_kwargs
+) -> List[Dict]:
+    """
+    Backtest each strategy on its data split in a process pool
+
+    strategies[k] runs end-to-end on data_splits[k] (for example one
+    split_symbols() group each) with its own BacktestEngine.
+
+    Args:
+        strategies: Picklable strategy instances, one per split
+        data_splits: Market data frames with MultiIndex (timestamp, symbol)
+        n_workers: Worker processes (defaults to the CPU count)
+        **engine_kwargs: Arguments for each BacktestEngine
+
+    Returns:
+        One results dictionary per split, in input order, each with the
+        split's 'symbols' and its 'equity_curve' array
+    """
+    if len(strategies) != len(data_splits):
+        raise ValueError(
+            f"Got {len(strategies)} strategies for {len(data_splits)} data splits"
+        )
+
+    jobs = [((engine_kwargs, strategy), k) for k, strategy in enumerate(strategies)]
+    return run_in_pool(_run_split, jobs, data_splits, n_workers)
@@ -8,8 +8,116 @@ import pandas as pd
 from typing import Dict, List
 from backtesting.engine import OrderSide, OrderType
 
+try:
+    from backtesting._indicators_numba import _adx_loop, _ma_cross_signals, _rsi_numba
+except ImportError:  # numba not installed
+    _adx_loop = _ma_cross_signals = _rsi_numba = None
 
-class MovingAverageCrossover:
+
+def _float_values(series: pd.Series) -> np.ndarray:
+    """Series values as float32 when stored compact, float64 otherwise"""
+    values = series.to_numpy()
+    return values if values.dtype == np.float32 else values.astype(np.float64, copy=False)
+
+
+def _wilder_average(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Wilder's moving average, seeded with the simple mean of the first period values
+
+    Args:
+        values: Input series
+        period: Smoothing period
+
+    Returns:
+        Smoothed series aligned with values, NaN before index period - 1
+    """
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        seeded = values[period - 1:].astype(np.float64)
+        seeded[0] = values[:period].mean()
+        # ewm with alpha=1/period, adjust=False is Wilder's recursion
+        out[period - 1:] = pd.Series(seeded).ewm(alpha=1 / period, adjust=False).mean().to_numpy()
+    return out
+
+
+# Single-slot memo for split_by_symbol: (data, per-symbol arrays)
+_split_cache = (None, None)
+
+
+def split_by_symbol(data: pd.DataFrame) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Split (timestamp, symbol) market data into contiguous per-symbol columns
+
+    Rows are grouped by symbol with one stable argsort of the MultiIndex
+    codes, so each symbol's columns are slices of a single reordered copy
+    rather than a data.xs() index rebuild per symbol. The result for the
+    most recent frame is memoized on its identity.
+
+    Args:
+        data: Market data indexed by (timestamp, symbol), sorted by timestamp
+
+    Returns:
+        {symbol: {'ts': int64 ns timestamps, column: ndarray, ...}} in the
+        order symbols first appear in data
+    """
+    global _split_cache
+
+    cached_data, cached = _split_cache
+    if cached_data is data:
+        return cached
+
+    index = data.index
+    codes = np.asarray(index.codes[1])
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(index.levels[1]) + 1))
+
+    ts = pd.DatetimeIndex(index.get_level_values(0)).as_unit('ns').asi8[order]
+    columns = {col: data[col].to_numpy()[order] for col in data.columns}
+
+    split = {}
+    for code in pd.unique(codes[codes >= 0]):
+        start, stop = bounds[code], bounds[code + 1]
+        arrays = {'ts': ts[start:stop]}
+        for col, values in columns.items():
+            arrays[col] = values[start:stop]
+        split[index.levels[1][code]] = arrays
+
+    _split_cache = (data, split)
+    return split
+
+
+class _IndicatorCache:
+    """
+    Mixin that runs a strategy's precompute(data) once per data frame
+
+    Indicators are computed over the full history in one vectorized pass
+    (rolling windows only look back, so there is no lookahead); each bar
+    then reads them at the last index at or before the timestamp.
+    """
+
+    # Indicators are read from the pandas MultiIndex, so run_backtest hands
+    # Polars input over as one converted pandas frame
+    accepts_polars = False
+
+    _cache_data = None
+    _cache: Dict = {}
+
+    def __getstate__(self):
+        """Pickle without the cached frame and indicators (e.g. for worker processes)"""
+        state = self.__dict__.copy()
+        state.pop('_cache', None)
+        state.pop('_cache_data', None)
+        return state
+
+    def _indicators(self, data: pd.DataFrame) -> Dict[str, Dict[str, np.ndarray]]:
+        """Per-symbol indicator arrays for data, computed on first use"""
+        if self._cache_data is not data:
+            self._cache = self.precompute(data)
+            self._cache_data = data
+        return self._cache
+
+
+class MovingAverageCrossover(_IndicatorCache):
     """
     Simple Moving Average Crossover Strategy
     Buy when fast MA crosses above slow MA
@@ -21,66 +129,96 @@ class MovingAverageCrossover:
         self.slow_period = slow_period
         self.position_size = position_size
 
+    def precompute(self, data: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Fast and slow moving averages of all symbols as padded matrices
+
+        Returns:
+            'symbols' in data order; 'close', 'fast' and 'slow' as
+            (n_symbols, max_bars) arrays padded with NaN; 'ts' as the union
+            of bar timestamps and 'bars' as each symbol's last bar index at
+            each of them (-1 before its first bar)
+        """
+        split = split_by_symbol(data)
+        symbols = list(split)
+        ts = np.unique(np.concatenate([arrays['ts'] for arrays in split.values()]))
+        n_bars = max(len(arrays['ts']) for arrays in split.values())
+
+        close = np.full((len(symbols), n_bars), np.nan)
+        fast = np.full((len(symbols), n_bars), np.nan)
+        slow = np.full((len(symbols), n_bars), np.nan)
+        bars = np.empty((len(ts), len(symbols)), dtype=np.int64)
+
+        for s, arrays in enumerate(split.values()):
+            series = pd.Series(arrays['close'])
+            n = len(series)
+            close[s, :n] = arrays['close']
+            fast[s, :n] = series.rolling(window=self.fast_period).mean().to_numpy()
+            slow[s, :n] = series.rolling(window=self.slow_period).mean().to_numpy()
+            bars[:, s] = np.searchsorted(arrays['ts'], ts, side='right') - 1
+
+        return {'symbols': symbols, 'ts': ts, 'bars': bars, 'close': close, 'fast': fast, 'slow': slow}
+
     def __call__(self, data: pd.DataFrame, timestamp, positions: Dict, cash: float) -> List[Dict]:
         """Generate trading signals"""
         signals = []
+        ind = self._indicators(data)
+
+        row = np.searchsorted(ind['ts'], pd.Timestamp(timestamp).value, side='right') - 1
+        if row < 0:
+            return signals
+
+        # Crossover side of every symbol at once: 1 buy, -1 sell, 0 hold
+        symbols = ind['symbols']
+        bars = ind['bars'][row]
+        held = np.fromiter((symbol in positions for symbol in symbols), dtype=np.bool_, count=len(symbols))
+        if _ma_cross_signals is not None:
+            sides = _ma_cross_signals(ind['fast'], ind['slow'], bars, self.slow_period, held)
+        else:
+            sides = self._cross_sides(ind['fast'], ind['slow'], bars, held)
+
+        for s in np.flatnonzero(sides):
+            symbol = symbols[s]
+            if sides[s] > 0:
+                # Buy signal
+                quantity = (cash * self.position_size) / ind['close'][s, bars[s]]
+                signals.append({
+                    'symbol': symbol,
+                    'side': OrderSide.BUY,
+                    'quantity': quantity,
+                    'order_type': OrderType.MARKET
+                })
+            else:
+                # Sell signal
+                quantity = positions[symbol].quantity
+                signals.append({
+                    'symbol': symbol,
+                    'side': OrderSide.SELL,
+                    'quantity': quantity,
+                    'order_type': OrderType.MARKET
+                })
 
-        # Get all symbols
-        symbols = data.index.get_level_values(1).unique()
-
-        for symbol in symbols:
-            try:
-                # Get historical data for this symbol
-                symbol_data = data.xs(symbol, level=1)
-                symbol_data = symbol_data[symbol_data.index <= timestamp]
-
-                if len(symbol_data) < self.slow_period:
-                    continue
-
-                # Calculate moving averages
-                fast_ma = symbol_data['close'].rolling(window=self.fast_period).mean()
-                slow_ma = symbol_data['close'].rolling(window=self.slow_period).mean()
+        return signals
 
-                # Get current and previous values
-                current_fast = fast_ma.iloc[-1]
-                current_slow = slow_ma.iloc[-1]
-                prev_fast = fast_ma.iloc[-2] if len(fast_ma) > 1 else current_fast
-                prev_slow = slow_ma.iloc[-2] if len(slow_ma) > 1 else current_slow
+    def _cross_sides(self, fast: np.ndarray, slow: np.ndarray, bars: np.ndarray, held: np.ndarray) -> np.ndarray:
+        """NumPy equivalent of the _ma_cross_signals kernel"""
+        rows = np.arange(len(bars))
+        prev = np.maximum(bars - 1, 0)
+        current_fast, current_slow = fast[rows, bars], slow[rows, bars]
+        prev_fast, prev_slow = fast[rows, prev], slow[rows, prev]
 
-                current_price = symbol_data['close'].iloc[-1]
+        # Check for crossover
+        ready = bars + 1 >= self.slow_period
+        bullish_cross = ready & (prev_fast <= prev_slow) & (current_fast > current_slow)
+        bearish_cross = ready & (prev_fast >= prev_slow) & (current_fast < current_slow)
 
-                # Check for crossover
-                bullish_cross = (prev_fast <= prev_slow) and (current_fast > current_slow)
-                bearish_cross = (prev_fast >= prev_slow) and (current_fast < current_slow)
+        sides = np.zeros(len(bars), dtype=np.int8)
+        sides[bullish_cross & ~held] = 1
+        sides[bearish_cross & held] = -1
+        return sides
 
-                # Generate signals
-                if bullish_cross and symbol not in positions:
-                    # Buy signal
-                    quantity = (cash * self.position_size) / current_price
-                    signals.append({
-                        'symbol': symbol,
-                        'side': OrderSide.BUY,
-                        'quantity': quantity,
-                        'order_type': OrderType.MARKET
-                    })
 
-                elif bearish_cross and symbol in positions:
-                    # Sell signal
-                    quantity = positions[symbol].quantity
-                    signals.append({
-                        'symbol': symbol,
-                        'side': OrderSide.SELL,
-                        'quantity': quantity,
-                        'order_type': OrderType.MARKET
-                    })
-
-            except Exception as e:
-                continue
-
-        return signals
-
-
-class MeanReversion:
+class MeanReversion(_IndicatorCache):
     """
     Mean Reversion Strategy using Bollinger Bands
     Buy when price touches lower band
@@ -99,60 +237,63 @@ class MeanReversion:
         self.position_size = position_size
         self.stop_loss_pct = stop_loss_pct
 
+    def precompute(self, data: pd.DataFrame) -> Dict[str, Dict[str, np.ndarray]]:
+        """Bollinger Bands per symbol over the full history"""
+        cache = {}
+        for symbol, arrays in split_by_symbol(data).items():
+            close = pd.Series(arrays['close'])
+            sma = close.rolling(window=self.period).mean()
+            std = close.rolling(window=self.period).std()
+            cache[symbol] = {
+                'ts': arrays['ts'],
+                'close': arrays['close'],
+                'upper': (sma + (std * self.num_std)).to_numpy(),
+                'lower': (sma - (std * self.num_std)).to_numpy(),
+            }
+        return cache
+
     def __call__(self, data: pd.DataFrame, timestamp, positions: Dict, cash: float) -> List[Dict]:
         """Generate trading signals"""
         signals = []
+        t_ns = pd.Timestamp(timestamp).value
 
-        symbols = data.index.get_level_values(1).unique()
-
-        for symbol in symbols:
-            try:
-                symbol_data = data.xs(symbol, level=1)
-                symbol_data = symbol_data[symbol_data.index <= timestamp]
-
-                if len(symbol_data) < self.period:
-                    continue
+        for symbol, ind in self._indicators(data).items():
+            i = np.searchsorted(ind['ts'], t_ns, side='right') - 1
 
-                # Calculate Bollinger Bands
-                sma = symbol_data['close'].rolling(window=self.period).mean()
-                std = symbol_data['close'].rolling(window=self.period).std()
-                upper_band = sma + (std * self.num_std)
-                lower_band = sma - (std * self.num_std)
-
-                current_price = symbol_data['close'].iloc[-1]
-                current_upper = upper_band.iloc[-1]
-                current_lower = lower_band.iloc[-1]
+            if i + 1 < self.period:
+                continue
 
-                # Buy at lower band
-                if current_price <= current_lower and symbol not in positions:
-                    quantity = (cash * self.position_size) / current_price
+            current_price = ind['close'][i]
+            current_upper = ind['upper'][i]
+            current_lower = ind['lower'][i]
+
+            # Buy at lower band
+            if current_price <= current_lower and symbol not in positions:
+                quantity = (cash * self.position_size) / current_price
+                signals.append({
+                    'symbol': symbol,
+                    'side': OrderSide.BUY,
+                    'quantity': quantity,
+                    'order_type': OrderType.MARKET
+                })
+
+            # Sell at upper band or stop loss
+            elif symbol in positions:
+                pos = positions[symbol]
+                pnl_pct = (current_price / pos.entry_price) - 1
+
+                if current_price >= current_upper or pnl_pct <= -self.stop_loss_pct:
                     signals.append({
                         'symbol': symbol,
-                        'side': OrderSide.BUY,
-                        'quantity': quantity,
+                        'side': OrderSide.SELL,
+                        'quantity': pos.quantity,
                         'order_type': OrderType.MARKET
                     })
 
-                # Sell at upper band or stop loss
-                elif symbol in positions:
-                    pos = positions[symbol]
-                    pnl_pct = (current_price / pos.entry_price) - 1
-
-                    if current_price >= current_upper or pnl_pct <= -self.stop_loss_pct:
-                        signals.append({
-                            'symbol': symbol,
-                            'side': OrderSide.SELL,
-                            'quantity': pos.quantity,
-                            'order_type': OrderType.MARKET
-                        })
-
-            except Exception:
-                continue
-
         return signals
 
 
-class MomentumStrategy:
+class MomentumStrategy(_IndicatorCache):
     """
     Momentum Strategy using RSI
     Buy when RSI crosses above oversold level
@@ -172,62 +313,72 @@ class MomentumStrategy:
         self.position_size = position_size
 
     def calculate_rsi(self, prices: pd.Series, period: int) -> pd.Series:
-        """Calculate RSI"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        """Calculate RSI with Wilder's smoothing, seeded by the first simple average"""
+        close = _float_values(prices)
+        if _rsi_numba is not None:
+            return pd.Series(_rsi_numba(close, period), index=prices.index)
+
+        delta = np.diff(close)
+        avg_gain = _wilder_average(np.where(delta > 0, delta, 0.0), period)
+        avg_loss = _wilder_average(np.where(delta < 0, -delta, 0.0), period)
+
+        rsi = np.full(len(close), np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi[1:] = 100 - 100 / (1 + avg_gain / avg_loss)
+        return pd.Series(rsi, index=prices.index)
+
+    def precompute(self, data: pd.DataFrame) -> Dict[str, Dict[str, np.ndarray]]:
+        """RSI per symbol over the full history"""
+        cache = {}
+        for symbol, arrays in split_by_symbol(data).items():
+            close = pd.Series(arrays['close'])
+            cache[symbol] = {
+                'ts': arrays['ts'],
+                'close': arrays['close'],
+                'rsi': self.calculate_rsi(close, self.rsi_period).to_numpy(),
+            }
+        return cache
 
     def __call__(self, data: pd.DataFrame, timestamp, positions: Dict, cash: float) -> List[Dict]:
         """Generate trading signals"""
         signals = []
+        t_ns = pd.Timestamp(timestamp).value
 
-        symbols = data.index.get_level_values(1).unique()
-
-        for symbol in symbols:
-            try:
-                symbol_data = data.xs(symbol, level=1)
-                symbol_data = symbol_data[symbol_data.index <= timestamp]
-
-                if len(symbol_data) < self.rsi_period + 1:
-                    continue
-
-                # Calculate RSI
-                rsi = self.calculate_rsi(symbol_data['close'], self.rsi_period)
-
-                current_rsi = rsi.iloc[-1]
-                prev_rsi = rsi.iloc[-2] if len(rsi) > 1 else current_rsi
-                current_price = symbol_data['close'].iloc[-1]
-
-                # Buy signal: RSI crosses above oversold
-                if prev_rsi <= self.oversold and current_rsi > self.oversold and symbol not in positions:
-                    quantity = (cash * self.position_size) / current_price
-                    signals.append({
-                        'symbol': symbol,
-                        'side': OrderSide.BUY,
-                        'quantity': quantity,
-                        'order_type': OrderType.MARKET
-                    })
-
-                # Sell signal: RSI crosses below overbought
-                elif prev_rsi >= self.overbought and current_rsi < self.overbought and symbol in positions:
-                    quantity = positions[symbol].quantity
-                    signals.append({
-                        'symbol': symbol,
-                        'side': OrderSide.SELL,
-                        'quantity': quantity,
-                        'order_type': OrderType.MARKET
-                    })
+        for symbol, ind in self._indicators(data).items():
+            i = np.searchsorted(ind['ts'], t_ns, side='right') - 1
 
-            except Exception:
+            if i + 1 < self.rsi_period + 1:
                 continue
 
+            rsi = ind['rsi']
+            current_rsi = rsi[i]
+            prev_rsi = rsi[i - 1] if i > 0 else current_rsi
+            current_price = ind['close'][i]
+
+            # Buy signal: RSI crosses above oversold
+            if prev_rsi <= self.oversold and current_rsi > self.oversold and symbol not in positions:
+                quantity = (cash * self.position_size) / current_price
+                signals.append({
+                    'symbol': symbol,
+                    'side': OrderSide.BUY,
+                    'quantity': quantity,
+                    'order_type': OrderType.MARKET
+                })
+
+            # Sell signal: RSI crosses below overbought
+            elif prev_rsi >= self.overbought and current_rsi < self.overbought and symbol in positions:
+                quantity = positions[symbol].quantity
+                signals.append({
+                    'symbol': symbol,
+                    'side': OrderSide.SELL,
+                    'quantity': quantity,
+                    'order_type': OrderType.MARKET
+                })
+
         return signals
 
 
-class TrendFollowing:
+class TrendFollowing(_IndicatorCache):
     """
     Trend Following Strategy using ADX and Moving Averages
     Enter when trend is strong (high ADX) and price confirms direction
@@ -247,82 +398,80 @@ class TrendFollowing:
         self.position_size = position_size
 
     def calculate_adx(self, high: pd.Series, low: pd.Series, close: pd.Series, period: int) -> pd.Series:
-        """Calculate ADX (simplified version)"""
-        # True Range
-        tr1 = high - low
-        tr2 = abs(high - close.shift())
-        tr3 = abs(low - close.shift())
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-
-        # Directional Movement
-        up_move = high - high.shift()
-        down_move = low.shift() - low
-
-        plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0)
-        minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0)
+        """
+        Calculate Wilder's ADX
 
-        # Smoothed indicators
-        atr = tr.rolling(window=period).mean()
-        plus_di = 100 * (pd.Series(plus_dm).rolling(window=period).mean() / atr)
-        minus_di = 100 * (pd.Series(minus_dm).rolling(window=period).mean() / atr)
+        +DI and -DI share the average true range as denominator, which
+        cancels out of DX, so only the directional movement is smoothed
+        (close is accepted for the usual high/low/close signature).
+        """
+        h = _float_values(high)
+        l = _float_values(low)
 
-        # ADX
-        dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
-        adx = dx.rolling(window=period).mean()
-
-        return adx
+        # Directional Movement
+        up_move = np.diff(h)
+        down_move = -np.diff(l)
+        plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+        minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+
+        adx = np.full(len(h), np.nan)
+        if _adx_loop is not None:
+            adx[1:] = _adx_loop(plus_dm, minus_dm, period)
+        else:
+            plus_avg = _wilder_average(plus_dm, period)
+            minus_avg = _wilder_average(minus_dm, period)
+            di_sum = plus_avg + minus_avg
+            with np.errstate(divide='ignore', invalid='ignore'):
+                dx = np.where(di_sum > 0, 100 * np.abs(plus_avg - minus_avg) / di_sum, 0.0)
+            adx[period:] = _wilder_average(dx[period - 1:], period)
+
+        return pd.Series(adx, index=close.index)
+
+    def precompute(self, data: pd.DataFrame) -> Dict[str, Dict[str, np.ndarray]]:
+        """ADX and moving average per symbol over the full history"""
+        cache = {}
+        for symbol, arrays in split_by_symbol(data).items():
+            close = pd.Series(arrays['close'])
+            adx = self.calculate_adx(
+                pd.Series(arrays['high']), pd.Series(arrays['low']), close, self.adx_period
+            )
+            cache[symbol] = {
+                'ts': arrays['ts'],
+                'close': arrays['close'],
+                'adx': adx.to_numpy(),
+                'ma': close.rolling(window=self.ma_period).mean().to_numpy(),
+            }
+        return cache
 
     def __call__(self, data: pd.DataFrame, timestamp, positions: Dict, cash: float) -> List[Dict]:
         """Generate trading signals"""
         signals = []
+        t_ns = pd.Timestamp(timestamp).value
 
-        symbols = data.index.get_level_values(1).unique()
-
-        for symbol in symbols:
-            try:
-                symbol_data = data.xs(symbol, level=1)
-                symbol_data = symbol_data[symbol_data.index <= timestamp]
-
-                if len(symbol_data) < self.adx_period * 2:
-                    continue
-
-                # Calculate indicators
-                adx = self.calculate_adx(
-                    symbol_data['high'],
-                    symbol_data['low'],
-                    symbol_data['close'],
-                    self.adx_period
-                )
-                ma = symbol_data['close'].rolling(window=self.ma_period).mean()
-
-                current_adx = adx.iloc[-1]
-                current_price = symbol_data['close'].iloc[-1]
-                current_ma = ma.iloc[-1]
-
-                # Strong trend detected
-                if current_adx > self.adx_threshold:
-                    # Uptrend: Buy
-                    if current_price > current_ma and symbol not in positions:
-                        quantity = (cash * self.position_size) / current_price
-                        signals.append({
-                            'symbol': symbol,
-                            'side': OrderSide.BUY,
-                            'quantity': quantity,
-                            'order_type': OrderType.MARKET
-                        })
+        for symbol, ind in self._indicators(data).items():
+            i = np.searchsorted(ind['ts'], t_ns, side='right') - 1
 
-                    # Downtrend or weak trend: Sell
-                    elif current_price < current_ma and symbol in positions:
-                        quantity = positions[symbol].quantity
-                        signals.append({
-                            'symbol': symbol,
-                            'side': OrderSide.SELL,
-                            'quantity': quantity,
-                            'order_type': OrderType.MARKET
-                        })
+            if i + 1 < self.adx_period * 2:
+                continue
+
+            current_adx = ind['adx'][i]
+            current_price = ind['close'][i]
+            current_ma = ind['ma'][i]
 
-                # Weak trend: Exit positions
-                elif current_adx < self.adx_threshold and symbol in positions:
+            # Strong trend detected
+            if current_adx > self.adx_threshold:
+                # Uptrend: Buy
+                if current_price > current_ma and symbol not in positions:
+                    quantity = (cash * self.position_size) / current_price
+                    signals.append({
+                        'symbol': symbol,
+                        'side': OrderSide.BUY,
+                        'quantity': quantity,
+                        'order_type': OrderType.MARKET
+                    })
+
+                # Downtrend or weak trend: Sell
+                elif current_price < current_ma and symbol in positions:
                     quantity = positions[symbol].quantity
                     signals.append({
                         'symbol': symbol,
@@ -331,13 +480,20 @@ class TrendFollowing:
                         'order_type': OrderType.MARKET
                     })
 
-            except Exception:
-                continue
+            # Weak trend: Exit positions
+            elif current_adx < self.adx_threshold and symbol in positions:
+                quantity = positions[symbol].quantity
+                signals.append({
+                    'symbol': symbol,
+                    'side': OrderSide.SELL,
+                    'quantity': quantity,
+                    'order_type': OrderType.MARKET
+                })
 
         return signals
 
 
-class PairsTradingStrategy:
+class PairsTradingStrategy(_IndicatorCache):
     """
     Statistical Arbitrage / Pairs Trading
     Trade mean-reverting spread between correlated assets
@@ -357,6 +513,43 @@ class PairsTradingStrategy:
         self.exit_threshold = exit_threshold
         self.position_size = position_size
 
+    def precompute(self, data: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Spread z-score of the pair on the union of both symbols' timestamps
+
+        Returns:
+            'ts' union timestamps; per union bar, 'z' the spread z-score,
+            'n1'/'n2' each leg's bar count so far and 'price1'/'price2'
+            each leg's latest close
+        """
+        symbol1, symbol2 = self.pair
+        arrays = split_by_symbol(data)
+        arrays1, arrays2 = arrays[symbol1], arrays[symbol2]
+
+        ts = np.union1d(arrays1['ts'], arrays2['ts'])
+        n1 = np.searchsorted(arrays1['ts'], ts, side='right')
+        n2 = np.searchsorted(arrays2['ts'], ts, side='right')
+
+        # Align data on timestamp; a bar missing on either leg leaves a NaN spread
+        prices1 = np.full(len(ts), np.nan)
+        prices2 = np.full(len(ts), np.nan)
+        prices1[np.searchsorted(ts, arrays1['ts'])] = arrays1['close']
+        prices2[np.searchsorted(ts, arrays2['ts'])] = arrays2['close']
+
+        # Calculate spread
+        spread = pd.Series(prices1 - prices2)
+        spread_mean = spread.rolling(window=self.lookback_period).mean().to_numpy()
+        spread_std = spread.rolling(window=self.lookback_period).std().to_numpy()
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = (spread.to_numpy() - spread_mean) / spread_std
+
+        return {
+            'ts': ts, 'z': z, 'n1': n1, 'n2': n2,
+            'price1': arrays1['close'][np.maximum(n1 - 1, 0)],
+            'price2': arrays2['close'][np.maximum(n2 - 1, 0)],
+        }
+
     def __call__(self, data: pd.DataFrame, timestamp, positions: Dict, cash: float) -> List[Dict]:
         """Generate trading signals"""
         signals = []
@@ -364,30 +557,17 @@ class PairsTradingStrategy:
         try:
             symbol1, symbol2 = self.pair
 
-            # Get data for both symbols
-            data1 = data.xs(symbol1, level=1)
-            data2 = data.xs(symbol2, level=1)
+            ind = self._indicators(data)
+            j = np.searchsorted(ind['ts'], pd.Timestamp(timestamp).value, side='right') - 1
 
-            data1 = data1[data1.index <= timestamp]
-            data2 = data2[data2.index <= timestamp]
-
-            if len(data1) < self.lookback_period or len(data2) < self.lookback_period:
+            if j < 0 or ind['n1'][j] < self.lookback_period or ind['n2'][j] < self.lookback_period:
                 return signals
 
-            # Align data
-            prices1 = data1['close']
-            prices2 = data2['close']
-
-            # Calculate spread
-            spread = prices1 - prices2
-            spread_mean = spread.rolling(window=self.lookback_period).mean()
-            spread_std = spread.rolling(window=self.lookback_period).std()
-
             # Z-score
-            z_score = (spread.iloc[-1] - spread_mean.iloc[-1]) / spread_std.iloc[-1]
+            z_score = ind['z'][j]
 
-            current_price1 = prices1.iloc[-1]
-            current_price2 = prices2.iloc[-1]
+            current_price1 = ind['price1'][j]
+            current_price2 = ind['price2'][j]
 
             # Entry signals
             if abs(z_score) > self.entry_threshold:
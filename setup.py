@@ -2,7 +2,7 @@
 Setup configuration for AI DAO Hedge Fund
 """
 
-from setuptools import setup, find_packages
+from setuptools import setup, find_packages, Extension
 
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
@@ -10,6 +10,24 @@ with open("README.md", "r", encoding="utf-8") as fh:
 with open("requirements.txt", "r", encoding="utf-8") as fh:
     requirements = [line.strip() for line in fh if line.strip() and not line.startswith("#")]
 
+# Optional compiled Black-Scholes kernel; the pure-Python paths are used
+# when Cython is not available at build time
+try:
+    from Cython.Build import cythonize
+
+    ext_modules = cythonize(
+        [
+            Extension(
+                "agents._bs",
+                ["agents/_bs.pyx"],
+                extra_compile_args=["-O3", "-ffast-math"],
+            )
+        ],
+        language_level=3,
+    )
+except ImportError:
+    ext_modules = []
+
 setup(
     name="ai-dao-hedge-fund",
     version="1.0.0",
@@ -20,6 +38,7 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/mohin-io/AI-DAO-Hedge-Fund",
     packages=find_packages(),
+    ext_modules=ext_modules,
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Developers",
@@ -27,11 +46,10 @@ setup(
         "Topic :: Office/Business :: Financial :: Investment",
         "License :: OSI Approved :: MIT License",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.9",
         "Programming Language :: Python :: 3.10",
         "Programming Language :: Python :: 3.11",
     ],
-    python_requires=">=3.9",
+    python_requires=">=3.10",
     install_requires=requirements,
     extras_require={
         "dev": [
@@ -41,6 +59,12 @@ setup(
             "flake8>=6.1.0",
             "mypy>=1.6.0",
         ],
+        "perf": [
+            "numba>=0.58.0",
+            "TA-Lib>=0.4.28",
+            "Cython>=3.0.0",
+            "polars>=1.0.0",
+        ],
     },
     entry_points={
         "console_scripts": [
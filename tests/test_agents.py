@@ -59,6 +59,18 @@ class TestAgents:
         assert agent.agent_id == 2
         assert "Risk Management" in agent.strategy
 
+    def test_momentum_explanation(self):
+        """Test per-asset explanation text for buy/sell/hold actions"""
+        agent = MomentumAgent()
+
+        explanation = agent.get_explanation(None, np.array([0.25, -0.1234, 0.005]))
+        lines = explanation.split("\n")
+
+        assert lines[0] == "Momentum Trader Decision:"
+        assert lines[1].startswith("Asset 0: BUY 25.0% - Positive momentum")
+        assert lines[2].startswith("Asset 1: SELL 12.3% - Negative momentum")
+        assert lines[3] == "Asset 2: HOLD - No strong momentum signal"
+
     def test_agent_metrics_tracking(self):
         """Test that agents track performance metrics"""
         agent = MomentumAgent()
@@ -0,0 +1,451 @@
+"""
+Unit tests for the backtesting engine
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backtesting.engine import (
+    BacktestEngine, Order, OrderSide, OrderType, Position, _metrics_numpy, compact_market_data
+)
+from backtesting.strategies import MeanReversion, MovingAverageCrossover
+
+
+def make_data(closes: dict, start: str = '2023-01-02') -> pd.DataFrame:
+    """MultiIndex (timestamp, symbol) frame from per-symbol close lists; None marks a gap"""
+    n = len(next(iter(closes.values())))
+    dates = pd.date_range(start, periods=n, freq='D')
+    rows = [
+        (date, symbol, price)
+        for symbol, prices in closes.items()
+        for date, price in zip(dates, prices)
+        if price is not None
+    ]
+    df = pd.DataFrame(rows, columns=['timestamp', 'symbol', 'close'])
+    return df.set_index(['timestamp', 'symbol']).sort_index()
+
+
+def scripted(schedule: dict):
+    """Strategy that emits the signals listed for each tick index"""
+    ticks = {}
+
+    def strategy(data, timestamp, positions, cash):
+        i = ticks.setdefault('i', 0)
+        ticks['i'] = i + 1
+        return [
+            signal(positions) if callable(signal) else signal
+            for signal in schedule.get(i, [])
+        ]
+
+    return strategy
+
+
+class TestBacktestEngine:
+    """Test suite for BacktestEngine"""
+
+    @pytest.fixture
+    def engine(self):
+        """Engine with round-number costs"""
+        return BacktestEngine(initial_capital=10000, commission_rate=0.001, slippage_rate=0.0)
+
+    def test_market_round_trip(self, engine):
+        """Test a market buy then sell fills at the next tick's close with commission"""
+        data = make_data({'AAA': [100.0, 100.0, 110.0, 120.0]})
+        strategy = scripted({
+            0: [dict(symbol='AAA', side=OrderSide.BUY, quantity=10)],
+            2: [lambda positions: dict(symbol='AAA', side=OrderSide.SELL,
+                                       quantity=positions['AAA'].quantity)],
+        })
+
+        results = engine.run_backtest(strategy, data, ['AAA'])
+
+        buy_cost = 10 * 100.0 * 1.001
+        sell_proceeds = 10 * 120.0 * 0.999
+        assert results['final_value'] == pytest.approx(10000 - buy_cost + sell_proceeds)
+        assert results['total_trades'] == 1
+        assert results['winning_trades'] == 1
+        assert results['total_commission'] == pytest.approx(1.0 + 1.2)
+        assert [h['portfolio_value'] for h in engine.portfolio_history] == pytest.approx(
+            [10000, 10000 - 1.0, 10000 - 1.0 + 100, 10000 - buy_cost + sell_proceeds]
+        )
+
+    def test_pending_order_waits_for_missing_price(self, engine):
+        """Test an order for a symbol with no bar at a tick fills on its next bar"""
+        data = make_data({
+            'AAA': [100.0, 101.0, 102.0, 103.0],
+            'BBB': [50.0, None, None, 55.0],
+        })
+        strategy = scripted({0: [dict(symbol='BBB', side=OrderSide.BUY, quantity=10),
+                                 dict(symbol='CCC', side=OrderSide.BUY, quantity=10)]})
+
+        engine.run_backtest(strategy, data, ['AAA', 'BBB'])
+
+        assert engine.positions['BBB'].entry_price == pytest.approx(55.0)
+        assert engine.positions['BBB'].sym_idx == 1
+        assert [o.symbol for o in engine.pending_orders] == ['CCC']
+        assert engine.positions['BBB'].entry_time == pd.Timestamp('2023-01-05')
+        assert len(engine.portfolio_history) == 4
+
+    def test_update_positions_row(self, engine):
+        """Test row-based marking resolves missing sym_idx and skips NaN prices"""
+        engine.positions['BBB'] = Position(symbol='BBB', quantity=2, entry_price=10.0,
+                                           current_price=10.0, entry_time=pd.Timestamp('2023-01-02'))
+
+        engine.update_positions_row(np.array([100.0, 12.0]), {'AAA': 0, 'BBB': 1})
+        assert engine.positions['BBB'].sym_idx == 1
+        assert engine.positions['BBB'].unrealized_pnl == pytest.approx(4.0)
+
+        engine.update_positions_row(np.array([101.0, np.nan]), {'AAA': 0, 'BBB': 1})
+        assert engine.positions['BBB'].current_price == pytest.approx(12.0)
+
+    def test_price_matrix_matches_unstack(self, engine):
+        """Test the code-scattered close matrix against an unstack pivot"""
+        data = make_data({
+            'AAA': [100.0, None, 102.0, 103.0],
+            'BBB': [50.0, 51.0, None, 53.0],
+            'CCC': [10.0, 11.0, 12.0, 13.0],
+        }).sample(frac=1.0, random_state=0)
+        symbols = ['BBB', 'AAA', 'ZZZ']
+
+        close_mat, timestamps = engine._pandas_inputs(data, symbols)
+        expected = data['close'].unstack(level=1).reindex(columns=symbols)
+
+        np.testing.assert_array_equal(close_mat, expected.to_numpy())
+        assert timestamps.equals(expected.index)
+
+    def test_limit_and_stop_orders(self, engine):
+        """Test limit buys fill at the limit and stop sells trigger below the stop"""
+        data = make_data({'AAA': [100.0, 98.0, 94.0, 96.0, 89.0]})
+        strategy = scripted({
+            0: [dict(symbol='AAA', side=OrderSide.BUY, quantity=10,
+                     order_type=OrderType.LIMIT, price=95.0)],
+            2: [lambda positions: dict(symbol='AAA', side=OrderSide.SELL,
+                                       quantity=positions['AAA'].quantity,
+                                       order_type=OrderType.STOP, stop_price=90.0)],
+        })
+
+        results = engine.run_backtest(strategy, data, ['AAA'])
+
+        assert results['total_trades'] == 1
+        assert engine.trades[0].entry_price == pytest.approx(95.0)
+        assert engine.trades[0].exit_price == pytest.approx(89.0)
+        assert len(engine.filled_orders) == 2
+
+        columns = engine.trade_arrays()
+        assert columns['pnl'] == pytest.approx([engine.trades[0].pnl])
+        assert columns['commission'] == pytest.approx([engine.trades[0].commission])
+        assert columns['duration_sec'] == pytest.approx([2 * 86400])
+        assert columns['duration_ns'].tolist() == [engine.trades[0].duration.value]
+        assert not engine.pending_orders
+
+    @pytest.mark.parametrize("order_type, side, price, stop_price, market, expected", [
+        (OrderType.MARKET, OrderSide.BUY, None, None, 100.0, 100.0),
+        (OrderType.LIMIT, OrderSide.BUY, 95.0, None, 96.0, None),
+        (OrderType.LIMIT, OrderSide.SELL, 105.0, None, 106.0, 105.0),
+        (OrderType.STOP, OrderSide.BUY, None, 105.0, 106.0, 106.0),
+        (OrderType.STOP, OrderSide.SELL, None, 95.0, 96.0, None),
+        (OrderType.STOP_LIMIT, OrderSide.BUY, 100.0, 100.0, 100.0, None),
+    ])
+    def test_execute_order_triggers(self, engine, order_type, side, price, stop_price, market, expected):
+        """Test the per-type trigger rules and fill prices"""
+        engine.positions['AAA'] = Position(symbol='AAA', quantity=1, entry_price=100.0,
+                                           current_price=100.0, entry_time=pd.Timestamp('2023-01-02'))
+        engine.current_time = pd.Timestamp('2023-01-03')
+        order = Order(symbol='AAA', side=side, order_type=order_type, quantity=1,
+                      price=price, stop_price=stop_price)
+
+        assert engine.execute_order(order, market) is (expected is not None)
+        assert order.filled_price == (pytest.approx(expected) if expected is not None else None)
+
+    def test_insufficient_cash_rejects_order(self, engine):
+        """Test a buy larger than available cash is rejected, not filled"""
+        data = make_data({'AAA': [100.0, 100.0, 100.0]})
+        strategy = scripted({0: [dict(symbol='AAA', side=OrderSide.BUY, quantity=1000)]})
+
+        results = engine.run_backtest(strategy, data, ['AAA'])
+
+        assert not engine.positions
+        assert not engine.pending_orders and not engine.filled_orders
+        assert results['final_value'] == pytest.approx(10000)
+        assert results['total_commission'] == 0
+
+    def test_polars_input_matches_pandas(self, engine):
+        """Test a Polars frame backtests like the pandas MultiIndex and is sliced per tick"""
+        pl = pytest.importorskip("polars")
+        data = make_data({
+            'AAA': [100.0, 101.0, 99.0, 104.0, 108.0],
+            'BBB': [50.0, None, 52.0, 51.0, 55.0],
+        })
+        schedule = {
+            0: [dict(symbol='BBB', side=OrderSide.BUY, quantity=10)],
+            1: [dict(symbol='AAA', side=OrderSide.BUY, quantity=5)],
+            3: [lambda positions: dict(symbol='AAA', side=OrderSide.SELL,
+                                       quantity=positions['AAA'].quantity)],
+        }
+        expected = engine.run_backtest(scripted(schedule), data, ['AAA', 'BBB'])
+        expected_history = [h['portfolio_value'] for h in engine.portfolio_history]
+
+        seen = []
+        inner = scripted(schedule)
+
+        def strategy(window, timestamp, positions, cash):
+            seen.append((window.height, window['timestamp'].max()))
+            return inner(window, timestamp, positions, cash)
+
+        pl_data = pl.from_pandas(data.reset_index()).sample(fraction=1.0, shuffle=True, seed=0)
+        results = engine.run_backtest(strategy, pl_data, ['AAA', 'BBB'])
+
+        assert results == pytest.approx(expected)
+        assert [h['portfolio_value'] for h in engine.portfolio_history] == pytest.approx(expected_history)
+        assert [height for height, _ in seen] == [2, 3, 5, 7, 9]
+        assert seen[-1][1] == pd.Timestamp('2023-01-06')
+
+    @pytest.mark.parametrize("make_strategy", [
+        lambda: MovingAverageCrossover(fast_period=3, slow_period=8, position_size=0.3),
+        lambda: MeanReversion(period=10, num_std=1.0, position_size=0.3),
+    ])
+    def test_polars_input_builtin_strategy(self, engine, make_strategy):
+        """Test built-in strategies on Polars input trade like on the pandas MultiIndex"""
+        pl = pytest.importorskip("polars")
+        rng = np.random.default_rng(0)
+        data = make_data({
+            symbol: list(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 80))))
+            for symbol in ('AAA', 'BBB')
+        })
+        expected = engine.run_backtest(make_strategy(), data, ['AAA', 'BBB'])
+        assert expected['total_trades'] > 0
+
+        pl_data = pl.from_pandas(data.reset_index()).sample(fraction=1.0, shuffle=True, seed=0)
+        results = engine.run_backtest(make_strategy(), pl_data, ['AAA', 'BBB'])
+
+        assert results == pytest.approx(expected)
+
+    def test_vector_backtest(self, engine):
+        """Test the signal-matrix fast path against a hand-rolled rebalance"""
+        prices = np.array([[100.0, 50.0], [110.0, 50.0], [121.0, 55.0], [110.0, 60.0]])
+        signals = np.array([[1, 0], [1, 1], [0, 1], [0, 0]])
+        weights = np.array([0.5, 0.25])
+
+        results = engine.run_vector_backtest(signals, prices, weights)
+
+        # Fills lag signals by one tick; costs are 0.1% of traded weight
+        c = 0.001
+        equity = [10000.0]
+        equity.append(equity[-1] * (1 - 0.5 * c))
+        equity.append(equity[-1] * (1 + 0.5 * 0.1) * (1 - 0.25 * c))
+        equity.append(equity[-1] * (1 + 0.5 * (110 / 121 - 1) + 0.25 * (60 / 55 - 1)) * (1 - 0.5 * c))
+
+        assert engine.equity_curve == pytest.approx(equity)
+        assert results['final_value'] == pytest.approx(equity[-1])
+        assert results['total_trades'] == 0
+        assert results['total_commission'] > 0
+
+        engine.run_vector_backtest(np.asfortranarray(signals), np.asfortranarray(prices), weights)
+        assert engine.equity_curve == pytest.approx(equity)
+
+        with pytest.raises(ValueError):
+            engine.run_vector_backtest(signals[:, :1], prices)
+
+    def test_trade_columns_grow_and_match_objects(self, tmp_path):
+        """Test trade buffers grow past capacity and agree with Trade objects and the export"""
+        n_ticks = 2 * 1030 + 1
+        data = make_data({'AAA': list(100 + np.sin(np.arange(n_ticks)))})
+        buy = dict(symbol='AAA', side=OrderSide.BUY, quantity=1)
+        sell = dict(symbol='AAA', side=OrderSide.SELL, quantity=1)
+        schedule = {i: [buy if i % 2 == 0 else sell] for i in range(n_ticks - 1)}
+
+        engine = BacktestEngine(initial_capital=10000)
+        results = engine.run_backtest(scripted(schedule), data, ['AAA'])
+        lean = BacktestEngine(initial_capital=10000, record_trade_objects=False)
+        lean_results = lean.run_backtest(scripted(schedule), data, ['AAA'])
+
+        columns = engine.trade_arrays()
+        assert len(engine.trades) == results['total_trades'] == 1030
+        assert columns['pnl'] == pytest.approx([t.pnl for t in engine.trades])
+        assert columns['duration_sec'] == pytest.approx([t.duration.total_seconds() for t in engine.trades])
+        assert not lean.trades
+        assert lean_results == pytest.approx(results)
+
+        lean.export_results(str(tmp_path), legacy_csv=True)
+        exported = pd.read_csv(tmp_path / 'trades.csv', parse_dates=['entry_time', 'exit_time'])
+        assert exported['symbol'].eq('AAA').all()
+        assert exported['pnl'].tolist() == pytest.approx(columns['pnl'])
+        assert exported['exit_time'].tolist() == [t.exit_time for t in engine.trades]
+        assert exported['duration_days'].tolist() == [t.duration.days for t in engine.trades]
+
+    def test_manual_trades_get_symbol_indices(self, engine):
+        """Test trades outside run_backtest record a valid sym_idx for every symbol"""
+        engine.current_time = pd.Timestamp('2024-01-01')
+        for symbol, price in (('AAPL', 100.0), ('MSFT', 200.0)):
+            engine.execute_order(engine.place_order(symbol, OrderSide.BUY, 5), price)
+        engine.positions['TSLA'] = Position(symbol='TSLA', quantity=2, entry_price=50.0,
+                                            current_price=50.0, entry_time=engine.current_time)
+
+        engine.current_time = pd.Timestamp('2024-01-03')
+        for symbol, price in (('MSFT', 210.0), ('TSLA', 55.0), ('AAPL', 101.0)):
+            engine.execute_order(engine.place_order(symbol, OrderSide.SELL, 1), price)
+
+        symbols = list(engine.symbol_to_idx)
+        assert [symbols[j] for j in engine.trade_arrays()['sym_idx']] == ['MSFT', 'TSLA', 'AAPL']
+        assert engine.positions['AAPL'].sym_idx == engine.symbol_to_idx['AAPL']
+
+    @pytest.mark.parametrize("legacy_csv", [False, True])
+    def test_export_manual_trades(self, engine, tmp_path, legacy_csv):
+        """Test exporting trades from orders placed without run_backtest"""
+        if not legacy_csv:
+            pytest.importorskip("pyarrow")
+        engine.current_time = pd.Timestamp('2024-01-01')
+        engine.execute_order(engine.place_order('AAPL', OrderSide.BUY, 10), 100.0)
+        engine.execute_order(engine.place_order('MSFT', OrderSide.BUY, 5), 200.0)
+        engine.current_time = pd.Timestamp('2024-01-03')
+        engine.execute_order(engine.place_order('AAPL', OrderSide.SELL, 10), 110.0)
+
+        engine.export_results(str(tmp_path), legacy_csv=legacy_csv)
+
+        if legacy_csv:
+            trades = pd.read_csv(tmp_path / 'trades.csv', parse_dates=['entry_time', 'exit_time'])
+        else:
+            trades = pd.read_parquet(tmp_path / 'trades.parquet')
+        assert trades['symbol'].tolist() == ['AAPL']
+        assert trades['entry_time'].tolist() == [pd.Timestamp('2024-01-01')]
+        assert trades['duration_days'].tolist() == [2]
+
+    def test_export_parquet_matches_csv(self, engine, tmp_path):
+        """Test the default Parquet export carries the same trades and history as the CSV"""
+        pytest.importorskip("pyarrow")
+        data = make_data({'AAA': [100.0, 101.0, 105.0, 103.0, 108.0]})
+        strategy = scripted({
+            0: [dict(symbol='AAA', side=OrderSide.BUY, quantity=10)],
+            2: [lambda positions: dict(symbol='AAA', side=OrderSide.SELL,
+                                       quantity=positions['AAA'].quantity)],
+        })
+        engine.run_backtest(strategy, data, ['AAA'])
+
+        engine.export_results(str(tmp_path / 'parquet'))
+        engine.export_results(str(tmp_path / 'csv'), legacy_csv=True)
+
+        trades = pd.read_parquet(tmp_path / 'parquet' / 'trades.parquet')
+        trades_csv = pd.read_csv(tmp_path / 'csv' / 'trades.csv', parse_dates=['entry_time', 'exit_time'])
+        history = pd.read_parquet(tmp_path / 'parquet' / 'portfolio_history.parquet')
+
+        assert not (tmp_path / 'parquet' / 'trades.csv').exists()
+        assert trades['exit_time'].tolist() == trades_csv['exit_time'].tolist()
+        assert trades['pnl'].tolist() == pytest.approx(trades_csv['pnl'].tolist())
+        assert trades['duration_days'].tolist() == [2]
+        assert history['portfolio_value'].tolist() == pytest.approx(
+            [h['portfolio_value'] for h in engine.portfolio_history]
+        )
+
+    def test_metrics_match_pandas_reference(self, engine):
+        """Test vectorized metrics against the pandas formulation"""
+        rng = np.random.default_rng(0)
+        prices = list(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 60))))
+        data = make_data({'AAA': prices})
+        schedule = {}
+        for i in range(0, 56, 8):
+            schedule[i] = [dict(symbol='AAA', side=OrderSide.BUY, quantity=20)]
+            schedule[i + 4] = [lambda positions: dict(symbol='AAA', side=OrderSide.SELL,
+                                                      quantity=positions['AAA'].quantity)]
+
+        results = engine.run_backtest(scripted(schedule), data, ['AAA'])
+
+        equity = pd.Series([h['portfolio_value'] for h in engine.portfolio_history])
+        returns = equity.pct_change().dropna()
+        drawdown = (equity - equity.expanding().max()) / equity.expanding().max()
+        pnl = pd.Series([t.pnl for t in engine.trades])
+
+        assert results['annual_volatility'] == pytest.approx(returns.std() * np.sqrt(252))
+        assert results['sharpe_ratio'] == pytest.approx(
+            (returns - 0.02 / 252).mean() / returns.std() * np.sqrt(252)
+        )
+        assert results['max_drawdown'] == pytest.approx(drawdown.min())
+        assert results['total_trades'] == 7
+        assert results['win_rate'] == pytest.approx((pnl > 0).mean())
+        assert results['avg_win'] == pytest.approx(pnl[pnl > 0].mean())
+        assert results['avg_loss'] == pytest.approx(pnl[pnl <= 0].mean())
+        assert results['profit_factor'] == pytest.approx(abs(pnl[pnl > 0].sum() / pnl[pnl <= 0].sum()))
+
+    def test_recycled_orders_are_reused(self):
+        """Test rejected orders return to the pool and results are unchanged"""
+        data = make_data({'AAA': [100.0] * 6})
+        too_big = dict(symbol='AAA', side=OrderSide.BUY, quantity=1000)
+        fits = dict(symbol='AAA', side=OrderSide.BUY, quantity=1)
+        schedule = {0: [too_big], 1: [too_big], 2: [fits], 3: [too_big]}
+
+        plain = BacktestEngine(initial_capital=10000)
+        expected = plain.run_backtest(scripted(schedule), data, ['AAA'])
+        engine = BacktestEngine(initial_capital=10000, recycle_orders=True)
+        results = engine.run_backtest(scripted(schedule), data, ['AAA'])
+
+        assert results == pytest.approx(expected)
+        assert not engine.orders and len(plain.orders) == 4
+        assert len(engine._order_pool) == 1
+        assert engine.filled_orders[0].quantity == 1
+        assert engine.filled_orders[0].status == "filled"
+
+    @pytest.mark.parametrize("n", [0, 1, 2, 300])
+    def test_metrics_kernel_matches_numpy(self, n):
+        """Test the Numba metrics kernel against the NumPy fallback"""
+        pytest.importorskip("numba")
+        from backtesting._metrics_numba import _metrics_kernel
+
+        rng = np.random.default_rng(n)
+        equity = 10000 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+
+        assert _metrics_kernel(equity, 0.02 / 252) == pytest.approx(_metrics_numpy(equity, 0.02 / 252))
+
+    def test_run_sweep_matches_sequential(self):
+        """Test process-pool sweep results against one-by-one backtests, in grid order"""
+        pytest.importorskip("pyarrow")
+        rng = np.random.default_rng(1)
+        data = make_data({
+            'AAA': list(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 40)))),
+            'BBB': list(50 * np.exp(np.cumsum(rng.normal(0, 0.02, 40)))),
+        })
+        grid = [dict(fast_period=3, slow_period=8), dict(fast_period=5, slow_period=12)]
+
+        results = BacktestEngine.run_sweep(
+            MovingAverageCrossover, grid, data, ['AAA', 'BBB'], max_workers=2, initial_capital=10000
+        )
+
+        for params, result in zip(grid, results):
+            expected = BacktestEngine(initial_capital=10000).run_backtest(
+                MovingAverageCrossover(**params), data, ['AAA', 'BBB']
+            )
+            assert result['params'] == params
+            assert result['final_value'] == pytest.approx(expected['final_value'])
+            assert result['total_trades'] == expected['total_trades']
+
+    def test_compact_market_data_backtest(self):
+        """Test float32/categorical market data gives the same trades as float64"""
+        rng = np.random.default_rng(3)
+        data = make_data({
+            'AAA': list(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 60)))),
+            'BBB': list(50 * np.exp(np.cumsum(rng.normal(0, 0.02, 60)))),
+        })
+        compact = compact_market_data(data)
+
+        assert compact['close'].dtype == np.float32
+        assert isinstance(compact.index.levels[1], pd.CategoricalIndex)
+        assert list(compact.index.get_level_values(1)) == list(data.index.get_level_values(1))
+
+        expected = BacktestEngine(initial_capital=10000).run_backtest(
+            MovingAverageCrossover(3, 8, 0.3), data, ['AAA', 'BBB']
+        )
+        results = BacktestEngine(initial_capital=10000).run_backtest(
+            MovingAverageCrossover(3, 8, 0.3), compact, ['AAA', 'BBB']
+        )
+
+        assert results['total_trades'] == expected['total_trades'] > 0
+        assert results['final_value'] == pytest.approx(expected['final_value'], rel=1e-5)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,101 @@
+"""
+Unit tests for the parallel backtest driver
+"""
+
+import pytest
+import pickle
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backtesting.engine import BacktestEngine
+import backtesting.parallel as parallel
+from backtesting.parallel import run_parallel, split_symbols
+from backtesting.strategies import MeanReversion, MovingAverageCrossover
+
+
+def make_data(n: int = 80, symbols=('AAA', 'BBB', 'CCC')) -> pd.DataFrame:
+    """Random-walk close frame indexed by (timestamp, symbol)"""
+    rng = np.random.default_rng(0)
+    dates = pd.date_range('2023-01-02', periods=n, freq='D')
+    frames = [
+        pd.DataFrame({
+            'timestamp': dates, 'symbol': symbol,
+            'close': 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n))),
+        })
+        for symbol in symbols
+    ]
+    return pd.concat(frames).set_index(['timestamp', 'symbol']).sort_index()
+
+
+class TestParallel:
+    """Test suite for run_parallel and split_symbols"""
+
+    def test_split_symbols_partitions_rows(self):
+        """Test symbol groups are disjoint and together cover the frame"""
+        data = make_data()
+        splits = split_symbols(data, 2)
+
+        assert [list(s.index.get_level_values(1).unique()) for s in splits] == [['AAA', 'CCC'], ['BBB']]
+        assert sum(len(s) for s in splits) == len(data)
+        assert len(split_symbols(data, 5)) == 3
+
+    @pytest.mark.parametrize("n_workers", [1, 2])
+    def test_run_parallel_matches_sequential(self, n_workers):
+        """Test pooled split backtests against one-by-one runs, in input order"""
+        pytest.importorskip("pyarrow")
+        splits = split_symbols(make_data(), 2)
+        factories = [lambda: MovingAverageCrossover(3, 8, 0.3), lambda: MeanReversion(10, 1.0, 0.3)]
+
+        results = run_parallel([f() for f in factories], splits, n_workers=n_workers, initial_capital=10000)
+
+        for factory, data, result in zip(factories, splits, results):
+            symbols = list(data.index.get_level_values(1).unique())
+            engine = BacktestEngine(initial_capital=10000)
+            expected = engine.run_backtest(factory(), data, symbols)
+            assert result['symbols'] == symbols
+            assert result['final_value'] == pytest.approx(expected['final_value'])
+            assert result['total_trades'] == expected['total_trades']
+            np.testing.assert_allclose(result['equity_curve'], engine.equity_curve)
+
+    def test_run_sweep_pickles_data_without_pyarrow(self, monkeypatch):
+        """Test the shared pool driver falls back to pickled frames for run_sweep"""
+        monkeypatch.setattr(parallel, "feather", None)
+        data = make_data()
+        grid = [dict(fast_period=3, slow_period=8), dict(fast_period=5, slow_period=12)]
+
+        results = BacktestEngine.run_sweep(
+            MovingAverageCrossover, grid, data, ['AAA', 'BBB', 'CCC'], max_workers=2, initial_capital=10000
+        )
+
+        for params, result in zip(grid, results):
+            expected = BacktestEngine(initial_capital=10000).run_backtest(
+                MovingAverageCrossover(**params), data, ['AAA', 'BBB', 'CCC']
+            )
+            assert result['params'] == params
+            assert result['final_value'] == pytest.approx(expected['final_value'])
+
+    def test_run_parallel_rejects_mismatched_inputs(self):
+        """Test one strategy is required per data split"""
+        with pytest.raises(ValueError):
+            run_parallel([MovingAverageCrossover()], split_symbols(make_data(), 2))
+
+    def test_strategy_pickles_without_indicator_cache(self):
+        """Test strategies ship to workers without their cached frame"""
+        data = make_data()
+        strategy = MovingAverageCrossover(3, 8)
+        strategy(data, data.index[-1][0], {}, 10000.0)
+
+        clone = pickle.loads(pickle.dumps(strategy))
+
+        assert clone._cache_data is None
+        assert clone(data, data.index[-1][0], {}, 10000.0) == strategy(data, data.index[-1][0], {}, 10000.0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,292 @@
+"""
+Unit tests for the backtesting strategies
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backtesting.engine import OrderSide
+import backtesting.strategies as strategies
+from backtesting.strategies import (
+    MeanReversion, MomentumStrategy, MovingAverageCrossover, PairsTradingStrategy, TrendFollowing,
+    split_by_symbol
+)
+
+
+def make_data(seed: int = 0, n: int = 120, symbols=('AAA', 'BBB')) -> pd.DataFrame:
+    """Random-walk OHLC frame indexed by (timestamp, symbol), with a gap in BBB"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2023-01-02', periods=n, freq='D')
+    frames = []
+    for symbol in symbols:
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+        frames.append(pd.DataFrame({
+            'timestamp': dates, 'symbol': symbol,
+            'close': close, 'high': close * 1.01, 'low': close * 0.99,
+        }))
+    df = pd.concat(frames).set_index(['timestamp', 'symbol']).sort_index()
+    return df.drop([(dates[10], 'BBB'), (dates[11], 'BBB')])
+
+
+def reference_ma_signals(strategy, data, timestamp, positions):
+    """Original per-tick crossover: rolling means over the history up to timestamp"""
+    sides = {}
+    for symbol in data.index.get_level_values(1).unique():
+        close = data.xs(symbol, level=1)['close']
+        close = close[close.index <= timestamp]
+        if len(close) < strategy.slow_period:
+            continue
+        fast = close.rolling(strategy.fast_period).mean()
+        slow = close.rolling(strategy.slow_period).mean()
+        prev_fast = fast.iloc[-2] if len(fast) > 1 else fast.iloc[-1]
+        prev_slow = slow.iloc[-2] if len(slow) > 1 else slow.iloc[-1]
+        if prev_fast <= prev_slow and fast.iloc[-1] > slow.iloc[-1] and symbol not in positions:
+            sides[symbol] = OrderSide.BUY
+        elif prev_fast >= prev_slow and fast.iloc[-1] < slow.iloc[-1] and symbol in positions:
+            sides[symbol] = OrderSide.SELL
+    return sides
+
+
+def reference_mr_signals(strategy, data, timestamp, positions):
+    """Original per-tick Bollinger Band check over the history up to timestamp"""
+    sides = {}
+    for symbol in data.index.get_level_values(1).unique():
+        close = data.xs(symbol, level=1)['close']
+        close = close[close.index <= timestamp]
+        if len(close) < strategy.period:
+            continue
+        sma = close.rolling(strategy.period).mean().iloc[-1]
+        std = close.rolling(strategy.period).std().iloc[-1]
+        price = close.iloc[-1]
+        if price <= sma - std * strategy.num_std and symbol not in positions:
+            sides[symbol] = OrderSide.BUY
+        elif symbol in positions:
+            pnl_pct = price / positions[symbol].entry_price - 1
+            if price >= sma + std * strategy.num_std or pnl_pct <= -strategy.stop_loss_pct:
+                sides[symbol] = OrderSide.SELL
+    return sides
+
+
+def reference_pairs_z(strategy, data, timestamp):
+    """Original per-tick spread z-score over the history up to timestamp"""
+    closes = []
+    for symbol in strategy.pair:
+        close = data.xs(symbol, level=1)['close']
+        closes.append(close[close.index <= timestamp])
+    if min(len(c) for c in closes) < strategy.lookback_period:
+        return None
+    spread = closes[0] - closes[1]
+    mean = spread.rolling(strategy.lookback_period).mean().iloc[-1]
+    std = spread.rolling(strategy.lookback_period).std().iloc[-1]
+    return (spread.iloc[-1] - mean) / std
+
+
+def reference_wilder_rsi(close, period):
+    """Textbook Wilder RSI: simple-average seed, then recursive smoothing"""
+    change = np.diff(close)
+    gain, loss = np.maximum(change, 0), np.maximum(-change, 0)
+    rsi = np.full(len(close), np.nan)
+    if len(close) <= period:
+        return rsi
+    avg_gain, avg_loss = gain[:period].mean(), loss[:period].mean()
+    rsi[period] = 100 - 100 / (1 + avg_gain / avg_loss)
+    for i in range(period + 1, len(close)):
+        avg_gain = (avg_gain * (period - 1) + gain[i - 1]) / period
+        avg_loss = (avg_loss * (period - 1) + loss[i - 1]) / period
+        rsi[i] = 100 - 100 / (1 + avg_gain / avg_loss)
+    return rsi
+
+
+def reference_wilder_adx(high, low, close, period):
+    """Textbook Wilder ADX with ATR-normalized +DI/-DI"""
+    def smooth(values):
+        out = np.full(len(values), np.nan)
+        if len(values) < period:
+            return out
+        out[period - 1] = values[:period].mean()
+        for i in range(period, len(values)):
+            out[i] = (out[i - 1] * (period - 1) + values[i]) / period
+        return out
+
+    tr = np.maximum.reduce([high[1:] - low[1:], np.abs(high[1:] - close[:-1]), np.abs(low[1:] - close[:-1])])
+    up, down = np.diff(high), -np.diff(low)
+    atr = smooth(tr)
+    plus_di = 100 * smooth(np.where((up > down) & (up > 0), up, 0.0)) / atr
+    minus_di = 100 * smooth(np.where((down > up) & (down > 0), down, 0.0)) / atr
+    dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+
+    adx = np.full(len(close), np.nan)
+    adx[period:] = smooth(dx[period - 1:])
+    return adx
+
+
+class TestStrategies:
+    """Test suite for precomputed strategy signals"""
+
+    @pytest.fixture
+    def data(self):
+        """Two-symbol OHLC frame"""
+        return make_data()
+
+    @pytest.mark.parametrize("strategy, reference", [
+        (MovingAverageCrossover(fast_period=3, slow_period=8), reference_ma_signals),
+        (MeanReversion(period=10, num_std=1.0, stop_loss_pct=0.02), reference_mr_signals),
+    ])
+    @pytest.mark.parametrize("held", [False, True])
+    def test_signals_match_per_tick_reference(self, data, strategy, reference, held):
+        """Test precomputed indicators give the same signals as per-tick recomputation"""
+        positions = {
+            symbol: SimpleNamespace(quantity=1.0, entry_price=100.0)
+            for symbol in ('AAA', 'BBB')
+        } if held else {}
+
+        emitted = 0
+        for timestamp in data.index.get_level_values(0).unique():
+            signals = strategy(data, timestamp, positions, cash=10_000.0)
+            expected = reference(strategy, data, timestamp, positions)
+            assert {s['symbol']: s['side'] for s in signals} == expected
+            emitted += len(signals)
+
+        assert emitted > 0
+
+    @pytest.mark.parametrize("use_numba", [True, False])
+    def test_ma_cross_sides_kernel_and_fallback(self, data, monkeypatch, use_numba):
+        """Test the crossover kernel and its NumPy fallback against the per-tick reference"""
+        if use_numba:
+            pytest.importorskip("numba")
+        else:
+            monkeypatch.setattr(strategies, "_ma_cross_signals", None)
+
+        strategy = MovingAverageCrossover(fast_period=2, slow_period=5)
+        positions = {'BBB': SimpleNamespace(quantity=3.0, entry_price=100.0)}
+
+        for timestamp in data.index.get_level_values(0).unique():
+            signals = strategy(data, timestamp, positions, cash=10_000.0)
+            assert {s['symbol']: s['side'] for s in signals} == \
+                reference_ma_signals(strategy, data, timestamp, positions)
+            for signal in signals:
+                if signal['side'] is OrderSide.SELL:
+                    assert signal['quantity'] == 3.0
+
+    def test_split_by_symbol_matches_xs(self, data):
+        """Test per-symbol arrays against data.xs and the memo on frame identity"""
+        split = split_by_symbol(data)
+
+        assert list(split) == list(data.index.get_level_values(1).unique())
+        for symbol, arrays in split.items():
+            symbol_data = data.xs(symbol, level=1)
+            np.testing.assert_array_equal(arrays['ts'], symbol_data.index.as_unit('ns').asi8)
+            for col in ('close', 'high', 'low'):
+                np.testing.assert_array_equal(arrays[col], symbol_data[col].to_numpy())
+
+        assert split_by_symbol(data) is split
+        assert split_by_symbol(data.copy()) is not split
+
+    @pytest.mark.parametrize("use_numba", [True, False])
+    @pytest.mark.parametrize("n", [10, 15, 200])
+    def test_rsi_matches_wilder_reference(self, monkeypatch, use_numba, n):
+        """Test Wilder RSI, compiled and pandas fallback, against a plain loop"""
+        if use_numba:
+            pytest.importorskip("numba")
+        else:
+            monkeypatch.setattr(strategies, "_rsi_numba", None)
+
+        rng = np.random.default_rng(n)
+        prices = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.02, n))))
+
+        rsi = MomentumStrategy().calculate_rsi(prices, 14)
+
+        assert rsi.index.equals(prices.index)
+        np.testing.assert_allclose(rsi.to_numpy(), reference_wilder_rsi(prices.to_numpy(), 14), rtol=1e-10)
+
+        # float32 prices are smoothed without upcasting the input
+        rsi32 = MomentumStrategy().calculate_rsi(prices.astype(np.float32), 14)
+        np.testing.assert_allclose(rsi32.to_numpy(), rsi.to_numpy(), rtol=1e-4)
+
+    @pytest.mark.parametrize("use_numba", [True, False])
+    @pytest.mark.parametrize("n", [20, 28, 200])
+    def test_adx_matches_wilder_reference(self, monkeypatch, use_numba, n):
+        """Test Wilder ADX, compiled and pandas fallback, against the ATR-based formula"""
+        if use_numba:
+            pytest.importorskip("numba")
+        else:
+            monkeypatch.setattr(strategies, "_adx_loop", None)
+
+        rng = np.random.default_rng(n)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+        high = close * (1 + rng.uniform(0, 0.02, n))
+        low = close * (1 - rng.uniform(0, 0.02, n))
+        index = pd.date_range('2023-01-02', periods=n, freq='D')
+
+        adx = TrendFollowing().calculate_adx(
+            pd.Series(high, index=index), pd.Series(low, index=index), pd.Series(close, index=index), 14
+        )
+
+        assert adx.index.equals(index)
+        assert adx.notna().sum() == max(n - 27, 0)
+        np.testing.assert_allclose(adx.to_numpy(), reference_wilder_adx(high, low, close, 14), rtol=1e-10)
+
+    def test_pairs_z_score_matches_per_tick_reference(self, data):
+        """Test the precomputed spread z-score against per-tick recomputation"""
+        strategy = PairsTradingStrategy(('AAA', 'BBB'), lookback_period=10, entry_threshold=1.0)
+        ind = strategy.precompute(data)
+
+        emitted = 0
+        for j, timestamp in enumerate(data.index.get_level_values(0).unique()):
+            expected = reference_pairs_z(strategy, data, timestamp)
+            signals = strategy(data, timestamp, {}, 10_000.0)
+            if expected is None:
+                assert not signals
+                continue
+            np.testing.assert_allclose(ind['z'][j], expected, rtol=1e-9, equal_nan=True)
+            assert bool(signals) == (abs(expected) > strategy.entry_threshold)
+            emitted += len(signals)
+
+        assert emitted > 0
+
+    def test_symbols_resolved_once_per_frame(self, data, monkeypatch):
+        """Test no strategy rescans the MultiIndex for its symbols on every bar"""
+        scans = []
+        get_level_values = pd.MultiIndex.get_level_values
+        monkeypatch.setattr(
+            pd.MultiIndex, "get_level_values",
+            lambda index, level: scans.append(level) or get_level_values(index, level)
+        )
+        timestamps = data.index.levels[0]
+
+        for strategy in [
+            MovingAverageCrossover(3, 8), MeanReversion(10), MomentumStrategy(7),
+            TrendFollowing(5, 20), PairsTradingStrategy(('AAA', 'BBB'), 10),
+        ]:
+            for timestamp in timestamps:
+                strategy(data, timestamp, {}, 10_000.0)
+
+        # One split_by_symbol pass, shared by every strategy
+        assert len(scans) == 1
+
+    def test_precompute_runs_once_per_frame(self, data, monkeypatch):
+        """Test indicators are cached on the data frame and rebuilt for a new one"""
+        strategy = MovingAverageCrossover(fast_period=3, slow_period=8)
+        calls = []
+        precompute = strategy.precompute
+        monkeypatch.setattr(strategy, "precompute", lambda d: calls.append(d) or precompute(d))
+
+        for timestamp in data.index.get_level_values(0).unique()[:5]:
+            strategy(data, timestamp, {}, 10_000.0)
+        other = make_data(seed=1)
+        strategy(other, other.index[0][0], {}, 10_000.0)
+
+        assert len(calls) == 2
+        assert calls[1] is other
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
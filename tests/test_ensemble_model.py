@@ -0,0 +1,157 @@
+"""
+Unit tests for the LSTM + GRU + Transformer ensemble
+"""
+
+import pytest
+import torch
+import torch.nn as nn
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agents.ensemble_model import EnsemblePredictor, EnsembleTrainer, SDPAEncoderLayer
+
+
+class TestEnsembleModel:
+    """Test suite for the ensemble predictor"""
+
+    @pytest.fixture
+    def sample_input(self):
+        """Create a small batch of input sequences"""
+        torch.manual_seed(0)
+        return torch.randn(4, 20, 8)
+
+    def test_sdpa_layer_matches_reference(self):
+        """Test that the SDPA encoder layer matches nn.TransformerEncoderLayer"""
+        reference = nn.TransformerEncoderLayer(
+            d_model=32, nhead=4, dim_feedforward=64, dropout=0.0, batch_first=True
+        ).eval()
+        layer = SDPAEncoderLayer(d_model=32, nhead=4, dim_feedforward=64, dropout=0.0).eval()
+
+        layer.qkv_proj.weight.data.copy_(reference.self_attn.in_proj_weight.data)
+        layer.qkv_proj.bias.data.copy_(reference.self_attn.in_proj_bias.data)
+        layer.out_proj.load_state_dict(reference.self_attn.out_proj.state_dict())
+        layer.linear1.load_state_dict(reference.linear1.state_dict())
+        layer.linear2.load_state_dict(reference.linear2.state_dict())
+        layer.norm1.load_state_dict(reference.norm1.state_dict())
+        layer.norm2.load_state_dict(reference.norm2.state_dict())
+
+        x = torch.randn(3, 10, 32)
+
+        assert torch.allclose(layer(x), reference(x), atol=1e-5)
+
+    @pytest.mark.parametrize("method", ['weighted', 'attention', 'voting'])
+    def test_forward_shapes(self, sample_input, method):
+        """Test ensemble output shapes for every combination method"""
+        model = EnsemblePredictor(
+            input_dim=8, hidden_dim=16, d_model=16, nhead=4,
+            num_encoder_layers=1, ensemble_method=method
+        )
+
+        ensemble_pred, individual_preds = model(sample_input, return_individual=True)
+
+        assert ensemble_pred.shape == (4, 1)
+        assert set(individual_preds) == {'lstm', 'gru', 'transformer'}
+        assert all(isinstance(p, torch.Tensor) for p in individual_preds.values())
+
+    def test_individual_preds_optional(self, sample_input):
+        """Test that per-model predictions are only built on request"""
+        model = EnsemblePredictor(
+            input_dim=8, hidden_dim=16, d_model=16, nhead=4, num_encoder_layers=1
+        )
+
+        _, individual_preds = model(sample_input)
+
+        assert individual_preds is None
+
+    def test_pruned_inference(self, sample_input):
+        """Test that eval-mode weighted inference skips low-weight branches"""
+        model = EnsemblePredictor(
+            input_dim=8, hidden_dim=16, d_model=16, nhead=4, num_encoder_layers=1
+        ).eval()
+
+        # Equal weights: nothing pruned, identical to the full combination
+        full = sum(
+            w * p for w, p in zip(
+                torch.softmax(model.weights, dim=0),
+                (model.lstm(sample_input), model.gru(sample_input),
+                 model._transformer_forward(sample_input))
+            )
+        )
+        pred, _ = model(sample_input)
+        assert torch.allclose(pred, full, atol=1e-6)
+
+        # Push the transformer weight below the threshold
+        with torch.no_grad():
+            model.weights.copy_(torch.tensor([5.0, 5.0, -5.0]))
+
+        pred, individual_preds = model(sample_input, return_individual=True)
+        expected = 0.5 * model.lstm(sample_input) + 0.5 * model.gru(sample_input)
+
+        assert set(individual_preds) == {'lstm', 'gru'}
+        assert torch.allclose(pred, expected, atol=1e-6)
+
+    def test_validate_scores_unpruned_ensemble(self, sample_input):
+        """Test validation reports every branch and the full weighted loss despite pruning"""
+        model = EnsemblePredictor(
+            input_dim=8, hidden_dim=16, d_model=16, nhead=4, num_encoder_layers=1
+        )
+        with torch.no_grad():
+            model.weights.copy_(torch.tensor([5.0, 5.0, -5.0]))
+        trainer = EnsembleTrainer(model)
+        y = torch.randn(4)
+
+        loss, individual_losses = trainer.validate(sample_input, y)
+
+        with torch.no_grad():
+            preds = (model.lstm(sample_input), model.gru(sample_input), model._transformer_forward(sample_input))
+            full = sum(w * p for w, p in zip(torch.softmax(model.weights, dim=0), preds))
+        assert set(individual_losses) == {'lstm', 'gru', 'transformer'}
+        assert individual_losses['transformer'] == pytest.approx(
+            nn.functional.mse_loss(preds[2].squeeze(), y).item(), rel=1e-5
+        )
+        assert loss == pytest.approx(nn.functional.mse_loss(full.squeeze(), y).item(), rel=1e-5)
+
+    def test_weight_cache_tracks_updates(self, sample_input):
+        """Test cached softmax weights are refreshed after in-place updates"""
+        model = EnsemblePredictor(
+            input_dim=8, hidden_dim=16, d_model=16, nhead=4, num_encoder_layers=1
+        ).eval()
+
+        with torch.no_grad():
+            first = model._current_weights()
+            assert model._current_weights() is first
+
+            model.weights.add_(torch.tensor([1.0, 0.0, 0.0]))
+            updated = model._current_weights()
+
+        assert updated is not first
+        assert torch.allclose(updated, torch.softmax(model.weights, dim=0))
+
+        # Training mode always recomputes so gradients reach the weights
+        model.train()
+        assert model._current_weights().requires_grad
+
+    def test_quantize_for_inference(self, sample_input):
+        """Test int8 dynamic quantization keeps predictions close"""
+        model = EnsemblePredictor(
+            input_dim=8, hidden_dim=16, d_model=16, nhead=4, num_encoder_layers=1
+        ).eval()
+        trainer = EnsembleTrainer(model)
+
+        q_model = trainer.quantize_for_inference()
+
+        with torch.no_grad():
+            expected, _ = model(sample_input)
+            actual, _ = q_model(sample_input)
+
+        assert trainer.q_model is q_model
+        assert isinstance(model.lstm.lstm, nn.LSTM)  # original left untouched
+        assert torch.allclose(actual, expected, atol=0.05)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
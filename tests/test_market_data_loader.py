@@ -0,0 +1,133 @@
+"""
+Unit tests for the market data loader used in Transformer training
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import agents.market_data_loader as market_data_loader
+from agents.market_data_loader import MarketDataLoader
+
+
+class TestMarketDataLoader:
+    """Test suite for feature engineering and sequence creation"""
+
+    @pytest.fixture
+    def loader(self, tmp_path):
+        """Create a loader writing into a temporary directory"""
+        return MarketDataLoader(data_dir=str(tmp_path / "market_data"))
+
+    @pytest.fixture
+    def ohlcv(self):
+        """Create a synthetic OHLCV frame"""
+        rng = np.random.default_rng(42)
+        n = 200
+        close = 100 + np.cumsum(rng.normal(0, 1, n))
+        close[50:53] = close[49]  # flat stretch
+        return pd.DataFrame({
+            'Open': close + rng.normal(0, 0.5, n),
+            'High': close + np.abs(rng.normal(0, 1, n)),
+            'Low': close - np.abs(rng.normal(0, 1, n)),
+            'Close': close,
+            'Volume': rng.integers(1_000, 10_000, n).astype(float),
+        }, index=pd.date_range('2024-01-01', periods=n, freq='D'))
+
+    def test_obv_matches_reference(self, loader, ohlcv):
+        """Test OBV against a straightforward running-total implementation"""
+        df = loader.add_technical_indicators(ohlcv)
+
+        close = ohlcv['Close'].values
+        volume = ohlcv['Volume'].values
+        expected = [0.0]
+        for i in range(1, len(close)):
+            if close[i] > close[i - 1]:
+                expected.append(expected[-1] + volume[i])
+            elif close[i] < close[i - 1]:
+                expected.append(expected[-1] - volume[i])
+            else:
+                expected.append(expected[-1])
+
+        np.testing.assert_allclose(df['OBV'].values, expected)
+
+    def test_pandas_indicators_match_talib(self, loader, ohlcv, monkeypatch):
+        """Test the pandas fallback computes the same indicators as TA-Lib"""
+        pytest.importorskip("talib")
+        columns = ['RSI', 'BB_Middle', 'BB_Upper', 'BB_Lower', 'BB_Width', 'ATR',
+                   'Stochastic_K', 'Stochastic_D']
+        expected = loader.add_technical_indicators(ohlcv)[columns]
+
+        monkeypatch.setitem(sys.modules, "talib", None)
+        df = loader.add_technical_indicators(ohlcv)[columns]
+
+        pd.testing.assert_frame_equal(df, expected, rtol=1e-9)
+
+    @pytest.mark.parametrize("horizon", [1, 5])
+    def test_create_sequences_matches_reference(self, loader, ohlcv, horizon):
+        """Test sliding-window sequences against explicit slicing"""
+        df = loader.add_technical_indicators(ohlcv)
+        X, y = loader.create_sequences(df, sequence_length=20, prediction_horizon=horizon)
+
+        clean = df.dropna()
+        features = clean.select_dtypes(include=[np.number]).to_numpy(dtype=np.float32)
+        close = clean['Close'].to_numpy(dtype=np.float32)
+        n_samples = len(clean) - 20 - horizon + 1
+
+        assert X.shape == (n_samples, 20, features.shape[1])
+        assert y.shape == (n_samples,)
+        assert X.flags['C_CONTIGUOUS']
+
+        for i in (0, n_samples // 2, n_samples - 1):
+            np.testing.assert_array_equal(X[i], features[i:i + 20])
+            expected = (close[i + 20 + horizon - 1] - close[i + 19]) / close[i + 19]
+            assert y[i] == pytest.approx(expected, rel=1e-5)
+
+    def test_create_sequences_too_short(self, loader, ohlcv):
+        """Test that frames shorter than one window yield empty arrays"""
+        X, y = loader.create_sequences(ohlcv.iloc[:10], sequence_length=20)
+
+        assert X.shape == (0, 20, 5)
+        assert y.shape == (0,)
+
+    def test_fetch_uses_parquet_cache(self, loader, ohlcv, monkeypatch):
+        """Test that a second fetch is served from the Parquet cache"""
+        pytest.importorskip("pyarrow")
+
+        calls = []
+
+        def fake_download(tickers, **kwargs):
+            calls.append(list(tickers))
+            return pd.concat({t: ohlcv for t in tickers}, axis=1)
+
+        monkeypatch.setattr(market_data_loader.yf, "download", fake_download)
+
+        first = loader.fetch_stock_data(['AAA', 'BBB'], '2024-01-01', '2024-07-01')
+        second = loader.fetch_stock_data(['AAA', 'BBB'], '2024-01-01', '2024-07-01')
+
+        assert calls == [['AAA', 'BBB']]
+        pd.testing.assert_frame_equal(first['AAA'], second['AAA'], check_freq=False)
+
+    def test_prepare_training_data_parallel_matches_serial(self, loader, ohlcv, monkeypatch):
+        """Test that parallel ticker processing matches the serial result"""
+        data = {'AAA': ohlcv, 'BBB': ohlcv * 1.5}
+        monkeypatch.setattr(loader, "fetch_stock_data", lambda *args, **kwargs: data)
+
+        serial = loader.prepare_training_data(
+            ['AAA', 'BBB'], '2024-01-01', '2024-07-01', sequence_length=20, n_jobs=1
+        )
+        parallel = loader.prepare_training_data(
+            ['AAA', 'BBB'], '2024-01-01', '2024-07-01', sequence_length=20, n_jobs=2
+        )
+
+        for key in ('X_train', 'X_test', 'y_train', 'y_test'):
+            np.testing.assert_array_equal(serial[key], parallel[key])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,326 @@
+"""
+Unit tests for Black-Scholes pricing, Greeks and options strategies
+"""
+
+import pytest
+import numpy as np
+from scipy.stats import norm
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import agents.options_agent as options_agent
+from agents.options_agent import (
+    BlackScholesModel, GreeksCalculator, OptionsStrategy, OptionsEnvironment, OptionsAgent
+)
+
+
+def reference_call(S, K, T, r, sigma):
+    """Textbook Black-Scholes call price via scipy.stats"""
+    d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
+    d2 = d1 - sigma * np.sqrt(T)
+    return S * norm.cdf(d1) - K * np.exp(-r * T) * norm.cdf(d2)
+
+
+def reference_put(S, K, T, r, sigma):
+    """Textbook Black-Scholes put price via scipy.stats"""
+    d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
+    d2 = d1 - sigma * np.sqrt(T)
+    return K * np.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
+
+
+CASES = [
+    (100.0, 105.0, 30 / 365, 0.05, 0.25),
+    (100.0, 90.0, 0.5, 0.02, 0.4),
+    (50.0, 50.0, 2.0, 0.0, 0.15),
+]
+
+
+class TestBlackScholes:
+    """Test suite for option pricing"""
+
+    @pytest.mark.parametrize("S,K,T,r,sigma", CASES)
+    def test_prices_match_reference(self, S, K, T, r, sigma):
+        """Test call/put prices against the scipy.stats formulation"""
+        assert BlackScholesModel.call_price(S, K, T, r, sigma) == pytest.approx(
+            reference_call(S, K, T, r, sigma), rel=1e-10
+        )
+        assert BlackScholesModel.put_price(S, K, T, r, sigma) == pytest.approx(
+            reference_put(S, K, T, r, sigma), rel=1e-10
+        )
+
+    def test_expired_option_is_intrinsic(self):
+        """Test that expired options are worth their intrinsic value"""
+        assert BlackScholesModel.call_price(110, 100, 0, 0.05, 0.2) == 10
+        assert BlackScholesModel.put_price(110, 100, 0, 0.05, 0.2) == 0
+
+    @pytest.mark.parametrize("S,K,T,r,sigma", CASES + [(110.0, 100.0, 0.0, 0.05, 0.2)])
+    def test_call_put_parity(self, S, K, T, r, sigma):
+        """Test the parity-derived put against the direct put pricer"""
+        call, put = BlackScholesModel.call_put(S, K, T, r, sigma)
+
+        assert call == pytest.approx(BlackScholesModel.call_price(S, K, T, r, sigma), rel=1e-12)
+        assert put == pytest.approx(BlackScholesModel.put_price(S, K, T, r, sigma), abs=1e-10)
+
+    @pytest.mark.parametrize("T", [30 / 365, 0])
+    def test_price_vec_matches_scalar(self, T):
+        """Test batched pricing against the scalar call/put pricers"""
+        strikes = np.array([90.0, 95.0, 105.0, 110.0])
+        is_call = np.array([False, False, True, True])
+
+        prices = BlackScholesModel.price_vec(100.0, strikes, T, 0.05, 0.25, is_call)
+        expected = [
+            BlackScholesModel.put_price(100.0, 90.0, T, 0.05, 0.25),
+            BlackScholesModel.put_price(100.0, 95.0, T, 0.05, 0.25),
+            BlackScholesModel.call_price(100.0, 105.0, T, 0.05, 0.25),
+            BlackScholesModel.call_price(100.0, 110.0, T, 0.05, 0.25),
+        ]
+
+        np.testing.assert_allclose(prices, expected, atol=1e-5)
+
+    def test_norm_cdf_approx_matches_scipy(self):
+        """Test the polynomial CDF approximation on both sides of zero"""
+        x = np.linspace(-6, 6, 241)
+
+        np.testing.assert_allclose(BlackScholesModel.norm_cdf_approx(x), norm.cdf(x), atol=1e-7)
+
+
+class TestOptionsStrategy:
+    """Test suite for multi-leg strategies"""
+
+    def test_iron_condor(self):
+        """Test iron condor credit is built from the four legs"""
+        S, T, r, sigma = 100.0, 30 / 365, 0.05, 0.25
+        result = OptionsStrategy.iron_condor(S, 90, 95, 105, 110, T, r, sigma)
+
+        credit = (
+            BlackScholesModel.put_price(S, 95, T, r, sigma)
+            - BlackScholesModel.put_price(S, 90, T, r, sigma)
+            + BlackScholesModel.call_price(S, 105, T, r, sigma)
+            - BlackScholesModel.call_price(S, 110, T, r, sigma)
+        )
+
+        assert result['net_credit'] == pytest.approx(credit)
+        assert result['max_loss'] == pytest.approx(5 - credit)
+        assert result['breakeven_upper'] == pytest.approx(105 + credit)
+
+    def test_bull_call_spread(self):
+        """Test bull call spread cost and payoff bounds"""
+        result = OptionsStrategy.bull_call_spread(100, 100, 110, 30 / 365, 0.05, 0.25)
+
+        net_cost = (
+            BlackScholesModel.call_price(100, 100, 30 / 365, 0.05, 0.25)
+            - BlackScholesModel.call_price(100, 110, 30 / 365, 0.05, 0.25)
+        )
+
+        assert result['net_cost'] == pytest.approx(net_cost)
+        assert result['max_profit'] == pytest.approx(10 - net_cost)
+
+
+class TestGreeks:
+    """Test suite for Greeks calculation"""
+
+    @pytest.mark.parametrize("S,K,T,r,sigma", CASES)
+    def test_greeks_match_reference(self, S, K, T, r, sigma):
+        """Test analytic Greeks against the scipy.stats formulation"""
+        d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
+        d2 = d1 - sigma * np.sqrt(T)
+
+        call = GreeksCalculator.calculate_all_greeks(S, K, T, r, sigma, 'call')
+        put = GreeksCalculator.calculate_all_greeks(S, K, T, r, sigma, 'put')
+
+        assert call['delta'] == pytest.approx(norm.cdf(d1))
+        assert put['delta'] == pytest.approx(norm.cdf(d1) - 1)
+        assert call['gamma'] == pytest.approx(norm.pdf(d1) / (S * sigma * np.sqrt(T)))
+        assert call['vega'] == pytest.approx(S * norm.pdf(d1) * np.sqrt(T) / 100)
+        assert call['rho'] == pytest.approx(K * T * np.exp(-r * T) * norm.cdf(d2) / 100)
+        assert put['rho'] == pytest.approx(-K * T * np.exp(-r * T) * norm.cdf(-d2) / 100)
+
+        common = -(S * norm.pdf(d1) * sigma) / (2 * np.sqrt(T))
+        assert call['theta'] == pytest.approx(
+            (common - r * K * np.exp(-r * T) * norm.cdf(d2)) / 365
+        )
+        assert put['theta'] == pytest.approx(
+            (common + r * K * np.exp(-r * T) * norm.cdf(-d2)) / 365
+        )
+
+    def test_fused_greeks_match_individual(self):
+        """Test the fused kernel against the per-Greek methods"""
+        S, K, T, r, sigma = CASES[0]
+
+        for option_type in ('call', 'put'):
+            fused = GreeksCalculator._all(S, K, T, r, sigma, option_type == 'call')
+
+            assert fused['delta'] == pytest.approx(GreeksCalculator.delta(S, K, T, r, sigma, option_type))
+            assert fused['gamma'] == pytest.approx(GreeksCalculator.gamma(S, K, T, r, sigma))
+            assert fused['theta'] == pytest.approx(GreeksCalculator.theta(S, K, T, r, sigma, option_type))
+            assert fused['vega'] == pytest.approx(GreeksCalculator.vega(S, K, T, r, sigma))
+            assert fused['rho'] == pytest.approx(GreeksCalculator.rho(S, K, T, r, sigma, option_type))
+
+
+
+class TestOptionsEnvironment:
+    """Test suite for the options RL environment"""
+
+    def test_full_episode(self):
+        """Test an episode runs to max_steps with well-formed observations"""
+        env = OptionsEnvironment()
+        obs, _ = env.reset(seed=0)
+
+        done = False
+        steps = 0
+        while not done:
+            obs, reward, done, truncated, _ = env.step(env.action_space.sample())
+            steps += 1
+
+        assert env.action_space.low.dtype == np.float32
+        assert env._obs_noise.dtype == np.float32
+        assert steps == env.max_steps
+        assert obs.shape == env.observation_space.shape
+        assert obs.dtype == np.float32
+        assert np.all(np.isfinite(obs))
+
+    def test_seeded_episodes_are_reproducible(self):
+        """Test that the same seed replays the same price path and noise"""
+        action = np.array([0, 0.0, 1], dtype=np.float32)
+
+        def rollout(seed):
+            env = OptionsEnvironment()
+            observations = [env.reset(seed=seed)[0]]
+            for _ in range(10):
+                observations.append(env.step(action)[0])
+            return np.stack(observations)
+
+        np.testing.assert_array_equal(rollout(7), rollout(7))
+        assert not np.array_equal(rollout(7), rollout(8))
+
+    def test_simulate_paths(self):
+        """Test Monte Carlo paths are risk-neutral and cover the remaining horizon"""
+        env = OptionsEnvironment()
+        env.reset(seed=0)
+        env.time_step = 200
+
+        paths = env.simulate_paths(n_paths=20000)
+
+        assert paths.shape == (20000, env.max_steps - 200)
+        # Discounted terminal price is a martingale under the risk-neutral drift
+        horizon = paths.shape[1] * env._dt
+        discounted_mean = paths[:, -1].mean() * np.exp(-env.risk_free_rate * horizon)
+        assert discounted_mean == pytest.approx(env.current_price, rel=0.01)
+
+    def test_portfolio_value_prices_positions(self):
+        """Test Monte Carlo position valuation against Black-Scholes"""
+        env = OptionsEnvironment(mc_paths=20000)
+        env.reset(seed=0)
+        env.positions = [{'type': 'call', 'strike': 100.0, 'expiry_step': 63, 'quantity': 100}]
+
+        option_value = env._calculate_portfolio_value() - env.capital
+        expected = 100 * BlackScholesModel.call_price(
+            env.current_price, 100.0, 63 / 252, env.risk_free_rate, env.volatility
+        )
+
+        assert option_value == pytest.approx(expected, rel=0.05)
+
+        # Expired positions are worth their intrinsic value
+        env.positions = [{'type': 'put', 'strike': 110.0, 'expiry_step': 0, 'quantity': 2}]
+        assert env._calculate_portfolio_value() == pytest.approx(env.capital + 2 * (110.0 - env.current_price))
+
+    def test_scipy_fallback_matches_greeks(self, monkeypatch):
+        """Test the memoized, S-scaled fallback path against direct Greeks"""
+        monkeypatch.setattr(options_agent, "_compiled_greeks", lambda: None)
+
+        env = OptionsEnvironment()
+        env.reset(seed=0)
+        for _ in range(5):
+            obs, *_ = env.step(env.action_space.sample())
+
+        greeks = GreeksCalculator.calculate_all_greeks(
+            env.current_price, env.current_price, 30 / 365,
+            env.risk_free_rate, env.volatility, 'call'
+        )
+
+        np.testing.assert_allclose(obs[6:11], list(greeks.values()), rtol=1e-6)
+
+
+class TestOptionsAgent:
+    """Test suite for the PPO options agent"""
+
+    @pytest.mark.parametrize("n_envs, n_steps", [(2, 1024), (3, 640)])
+    def test_train_with_parallel_envs(self, tmp_path, n_envs, n_steps):
+        """Test PPO training over worker processes, then save/load"""
+        agent = OptionsAgent()
+        agent.train(total_timesteps=256, n_envs=n_envs)
+
+        assert agent.model.n_envs == n_envs
+        assert agent.model.n_steps == n_steps
+        assert (n_steps * n_envs) % agent.model.batch_size == 0
+        assert agent.model.env.closed
+
+        path = tmp_path / "options_ppo"
+        agent.save(str(path))
+        agent.load(str(path))
+
+        obs, _ = agent.env.reset(seed=0)
+        action, _ = agent.model.predict(obs, deterministic=True)
+        assert action.shape == agent.env.action_space.shape
+
+
+class TestNumbaKernel:
+    """Test suite for the compiled Black-Scholes kernel"""
+
+    @pytest.fixture
+    def bs_numba(self):
+        """Import the numba kernels, skipping when numba is missing"""
+        pytest.importorskip("numba")
+        import agents._bs_numba as bs_numba
+        return bs_numba
+
+    def test_norm_cdf_matches_scipy(self, bs_numba):
+        """Test the A&S CDF on both sides of zero (sign reflection)"""
+        for x in np.linspace(-6, 6, 241):
+            assert bs_numba.norm_cdf(x) == pytest.approx(norm.cdf(x), abs=1e-7)
+
+    @pytest.mark.parametrize("S,K,T,r,sigma", CASES)
+    def test_kernel_matches_greeks_calculator(self, S, K, T, r, sigma, bs_numba):
+        """Test compiled price/Greeks against the scipy-based implementation"""
+        for option_type in ('call', 'put'):
+            is_call = option_type == 'call'
+            price, *greeks = bs_numba.all_greeks_and_price(S, K, T, r, sigma, is_call)
+            expected = GreeksCalculator.calculate_all_greeks(S, K, T, r, sigma, option_type)
+            pricer = BlackScholesModel.call_price if is_call else BlackScholesModel.put_price
+
+            assert price == pytest.approx(pricer(S, K, T, r, sigma), abs=1e-5)
+            np.testing.assert_allclose(greeks, list(expected.values()), atol=1e-6)
+
+
+
+class TestCythonKernel:
+    """Test suite for the Cython Black-Scholes extension"""
+
+    @pytest.mark.parametrize("S,K,T,r,sigma", CASES)
+    def test_kernel_matches_greeks_calculator(self, S, K, T, r, sigma):
+        """Test compiled price/Greeks against the scipy-based implementation"""
+        bs = pytest.importorskip("agents._bs")
+
+        for option_type in ('call', 'put'):
+            is_call = option_type == 'call'
+            price, *greeks = bs.price_and_greeks(S, K, T, r, sigma, is_call)
+            expected = GreeksCalculator.calculate_all_greeks(S, K, T, r, sigma, option_type)
+            pricer = BlackScholesModel.call_price if is_call else BlackScholesModel.put_price
+
+            assert price == pytest.approx(pricer(S, K, T, r, sigma), rel=1e-9)
+            np.testing.assert_allclose(greeks, list(expected.values()), rtol=1e-9)
+
+    def test_expired(self):
+        """Test expired options return intrinsic value and zero Greeks"""
+        bs = pytest.importorskip("agents._bs")
+
+        assert bs.price_and_greeks(110.0, 100.0, 0.0, 0.05, 0.2, True) == (10.0, 0, 0, 0, 0, 0)
+        assert bs.price_and_greeks(110.0, 100.0, 0.0, 0.05, 0.2, False) == (0.0, 0, 0, 0, 0, 0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
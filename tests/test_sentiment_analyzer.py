@@ -0,0 +1,270 @@
+"""
+Unit tests for the market sentiment analyzer
+"""
+
+import pytest
+import re
+import sys
+import json
+import types
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agents.sentiment_analyzer import SentimentAnalyzer
+
+
+def make_fake_praw(posts):
+    """Build a stand-in praw module serving the given posts per subreddit"""
+    class FakeSubreddit:
+        def __init__(self, name):
+            self.name = name
+
+        def hot(self, limit):
+            return [types.SimpleNamespace(**post) for post in posts[self.name][:limit]]
+
+    class FakeReddit:
+        def __init__(self, **kwargs):
+            pass
+
+        def subreddit(self, name):
+            return FakeSubreddit(name)
+
+    return types.SimpleNamespace(Reddit=FakeReddit)
+
+
+class FakeResponse:
+    """Minimal stand-in for a requests.Response carrying a JSON payload"""
+
+    def __init__(self, payload):
+        self.content = json.dumps(payload).encode()
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def reference_clean(text):
+    """Original step-by-step cleaning pipeline"""
+    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'@\w+', '', text)
+    text = re.sub(r'#', '', text)
+    text = re.sub(r'[^\w\s]', '', text)
+    return ' '.join(text.split()).lower()
+
+
+class TestSentimentAnalyzer:
+    """Test suite for text cleaning and sentiment scoring"""
+
+    @pytest.fixture
+    def analyzer(self):
+        """Create an analyzer without API credentials"""
+        return SentimentAnalyzer()
+
+    @pytest.mark.parametrize("text", [
+        "Tesla stock is soaring! Amazing performance this quarter. Very bullish!",
+        "@elonmusk says #TSLA to the moon 🚀 https://t.co/abc123 www.tesla.com",
+        "  $AAPL   earnings beat;\tguidance raised...\n#stocks @wsb  ",
+        "@#abc foo@bar baz#qux",
+        "",
+    ])
+    def test_clean_text_matches_reference(self, analyzer, text):
+        """Test precompiled cleaning against the original regex pipeline"""
+        assert analyzer._clean_text(text) == reference_clean(text)
+
+    def test_vader_polarity_direction(self, analyzer):
+        """Test that bullish and bearish texts score on opposite sides of zero"""
+        pytest.importorskip("vaderSentiment")
+
+        bullish = analyzer.analyze_text("Tesla stock is soaring! Amazing quarter, very bullish!")
+        bearish = analyzer.analyze_text("Terrible earnings, the stock is crashing. Awful guidance.")
+
+        assert bullish['polarity'] > 0.5
+        assert bearish['polarity'] < -0.5
+        assert bullish['subjectivity'] == pytest.approx(1 - abs(bullish['compound_score']))
+
+    @pytest.mark.parametrize("use_vader", [True, False])
+    def test_analyze_batch_matches_single(self, analyzer, use_vader):
+        """Test batch scoring against per-text scoring, with and without VADER"""
+        if not use_vader:
+            analyzer._vader = None
+
+        texts = [
+            "Great results, shares up 10%",
+            "Lawsuit filed, stock plunges",
+            "Company holds annual meeting",
+        ]
+        batch = analyzer.analyze_batch(texts)
+
+        assert list(batch.columns) == ['polarity', 'subjectivity', 'compound_score']
+        for i, text in enumerate(texts):
+            assert batch.iloc[i].to_dict() == pytest.approx(analyzer.analyze_text(text))
+
+    def test_clean_series_matches_single(self, analyzer):
+        """Test vectorized cleaning against the per-text cleaner"""
+        texts = pd.Series([
+            "@elonmusk says #TSLA to the moon https://t.co/abc123",
+            "  $AAPL   earnings beat;\tguidance raised...\n",
+            "",
+        ])
+
+        assert analyzer._clean_series(texts).tolist() == [analyzer._clean_text(t) for t in texts]
+
+    def test_fetch_reddit_sentiment(self, monkeypatch):
+        """Test Reddit ingest filters by keyword and scores every kept post"""
+        posts = {
+            'stocks': [
+                dict(title="TSLA soaring", selftext="Great quarter!", score=10,
+                     num_comments=3, created_utc=1_700_000_000.0),
+                dict(title="Weather today", selftext="", score=1,
+                     num_comments=0, created_utc=1_700_000_100.0),
+            ],
+            'investing': [
+                dict(title="Is tsla overvalued?", selftext="Awful margins, terrible guidance",
+                     score=5, num_comments=8, created_utc=1_700_000_200.0),
+            ],
+        }
+        monkeypatch.setitem(sys.modules, "praw", make_fake_praw(posts))
+
+        analyzer = SentimentAnalyzer(reddit_client_id="id", reddit_client_secret="secret")
+        df = analyzer.fetch_reddit_sentiment(['stocks', 'investing'], ['TSLA'], limit=10)
+
+        assert list(df.columns) == [
+            'source', 'subreddit', 'title', 'text', 'score', 'num_comments', 'created_utc',
+            'polarity', 'subjectivity', 'compound_score'
+        ]
+        assert df['title'].tolist() == ["TSLA soaring", "Is tsla overvalued?"]
+        assert df['text'].iloc[0] == "TSLA soaring Great quarter!"
+        assert (df['source'] == 'reddit').all()
+        assert df['created_utc'].iloc[0] == pd.Timestamp(1_700_000_000, unit='s', tz='UTC')
+        assert df['polarity'].tolist() == pytest.approx(
+            analyzer.analyze_batch(["TSLA soaring Great quarter!",
+                                    "Is tsla overvalued? Awful margins, terrible guidance"])['polarity'].tolist()
+        )
+
+    def test_fetch_reddit_keyword_filter(self, monkeypatch):
+        """Test keyword matching is case-insensitive and treats keywords literally"""
+        posts = {'stocks': [
+            dict(title=title, selftext="", score=1, num_comments=0, created_utc=1_700_000_000.0)
+            for title in ["brk.b dips", "BRKXB typo", "S&P 500 record", "nothing here"]
+        ]}
+        monkeypatch.setitem(sys.modules, "praw", make_fake_praw(posts))
+
+        analyzer = SentimentAnalyzer(reddit_client_id="id", reddit_client_secret="secret")
+
+        df = analyzer.fetch_reddit_sentiment(['stocks'], ['BRK.B', 's&p'])
+        assert df['title'].tolist() == ["brk.b dips", "S&P 500 record"]
+
+        assert analyzer.fetch_reddit_sentiment(['stocks'], []).empty
+
+    def test_fetch_reddit_sentiment_no_matches(self, monkeypatch):
+        """Test Reddit ingest with no keyword matches returns an empty frame"""
+        posts = {'stocks': [dict(title="Weather today", selftext="", score=1,
+                                 num_comments=0, created_utc=1_700_000_000.0)]}
+        monkeypatch.setitem(sys.modules, "praw", make_fake_praw(posts))
+
+        analyzer = SentimentAnalyzer(reddit_client_id="id", reddit_client_secret="secret")
+        df = analyzer.fetch_reddit_sentiment(['stocks'], ['TSLA'])
+
+        assert df.empty
+        assert 'polarity' in df.columns
+
+    @pytest.mark.parametrize("n", [2, 3, 50])
+    def test_calculate_trend_matches_polyfit(self, analyzer, n):
+        """Test the closed-form, time-ordered slope against a least-squares fit"""
+        rng = np.random.default_rng(n)
+        timestamps = pd.date_range('2024-01-01', periods=n, freq='h')[::-1].to_numpy()
+        polarity = rng.uniform(-1, 1, n)
+
+        expected = np.polyfit(np.arange(n), polarity[::-1], 1)[0]
+
+        assert analyzer._calculate_trend(polarity, timestamps) == pytest.approx(expected)
+        assert analyzer._calculate_trend(polarity[:1], timestamps[:1]) == 0.0
+
+    def test_fetch_news_sentiment(self, monkeypatch):
+        """Test NewsAPI ingest over the pooled session"""
+        articles = [
+            {'title': "TSLA beats estimates", 'description': "Strong deliveries, great margins",
+             'url': "https://example.com/1", 'publishedAt': "2024-01-02T10:00:00Z",
+             'source': {'name': "Wire"}},
+            {'title': "TSLA recall", 'description': None,
+             'url': "https://example.com/2", 'publishedAt': "2024-01-03T10:00:00Z",
+             'source': {'name': "Daily"}},
+        ]
+        calls = []
+
+        analyzer = SentimentAnalyzer(news_api_key="key")
+        monkeypatch.setattr(
+            analyzer._session, "get",
+            lambda url, params: calls.append(params) or FakeResponse({'articles': articles})
+        )
+
+        df = analyzer.fetch_news_sentiment("TSLA", from_date="2024-01-01", to_date="2024-01-07")
+
+        assert calls[0]['q'] == "TSLA"
+        assert df['title'].tolist() == ["TSLA beats estimates", "TSLA recall"]
+        assert df['source_name'].tolist() == ["Wire", "Daily"]
+        assert df['polarity'].iloc[0] == pytest.approx(
+            analyzer.analyze_text("TSLA beats estimates Strong deliveries, great margins")['polarity']
+        )
+
+    def test_fetch_news_sentiment_pages_concurrently(self, monkeypatch):
+        """Test multi-page NewsAPI fetches go through httpx and keep page order"""
+        httpx = pytest.importorskip("httpx")
+        requested = []
+
+        def handler(request):
+            page = int(request.url.params['page'])
+            requested.append(page)
+            return httpx.Response(200, json={'articles': [
+                {'title': f"TSLA page {page} item {i}", 'description': "", 'source': {}}
+                for i in range(2)
+            ]})
+
+        real_client = httpx.AsyncClient
+        monkeypatch.setattr(
+            httpx, "AsyncClient",
+            lambda **kwargs: real_client(transport=httpx.MockTransport(handler))
+        )
+
+        analyzer = SentimentAnalyzer(news_api_key="key")
+        monkeypatch.setattr(analyzer._session, "get", lambda *args, **kwargs: pytest.fail("used sync session"))
+
+        df = analyzer.fetch_news_sentiment("TSLA", from_date="2024-01-01", to_date="2024-01-07", pages=3)
+
+        assert sorted(requested) == [1, 2, 3]
+        assert df['title'].tolist() == [f"TSLA page {p} item {i}" for p in (1, 2, 3) for i in range(2)]
+
+    def test_get_sentiment_features(self, analyzer):
+        """Test combined Reddit/news features (mock data without credentials)"""
+        features = analyzer.get_sentiment_features('AAPL')
+
+        assert features['sentiment_volume'] == 3 * 50 + 20
+        assert -1 <= features['sentiment_mean'] <= 1
+        assert 0 <= features['sentiment_positive_ratio'] <= 1
+
+    def test_get_sentiment_features_matches_frame_concat(self, analyzer, monkeypatch):
+        """Test array-based features against the concatenated-frame statistics"""
+        reddit_df = analyzer._generate_mock_reddit_data(['stocks'], ['AAPL'], 30)
+        news_df = analyzer._generate_mock_news_data('AAPL')
+        monkeypatch.setattr(analyzer, "fetch_reddit_sentiment", lambda **kwargs: reddit_df)
+        monkeypatch.setattr(analyzer, "fetch_news_sentiment", lambda **kwargs: news_df)
+
+        features = analyzer.get_sentiment_features('AAPL')
+        combined = pd.concat([reddit_df, news_df], ignore_index=True)
+
+        assert features['sentiment_volume'] == len(combined)
+        assert features['sentiment_mean'] == pytest.approx(combined['polarity'].mean())
+        assert features['sentiment_std'] == pytest.approx(combined['polarity'].std())
+        assert features['subjectivity_mean'] == pytest.approx(combined['subjectivity'].mean())
+        assert features['sentiment_negative_ratio'] == pytest.approx((combined['polarity'] < 0).mean())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,350 @@
+"""
+Unit tests for the transformer training pipeline
+"""
+
+import pytest
+import torch
+import numpy as np
+import sys
+import json
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agents.transformer_trainer import (
+    TransformerTrainer, MarketDataset, DataPrefetcher, DeviceBatchLoader, _step_loss
+)
+from agents.transformer_predictor import TransformerPredictor, SDPAEncoder
+
+
+def make_data(n_train=48, n_test=20, seq_length=12, n_features=5, seed=0):
+    """Random sequences with returns driven by the last feature value"""
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((n_train + n_test, seq_length, n_features)).astype(np.float32)
+    y = (0.01 * X[:, -1, 0] + 0.001 * rng.standard_normal(n_train + n_test)).astype(np.float32)
+    return {
+        'X_train': X[:n_train], 'y_train': y[:n_train],
+        'X_test': X[n_train:], 'y_test': y[n_train:],
+    }
+
+
+class TestTransformerPredictor:
+    """Test suite for the SDPA-based TransformerPredictor"""
+
+    @pytest.fixture
+    def model(self):
+        """Create a small predictor in eval mode"""
+        torch.manual_seed(0)
+        return TransformerPredictor(
+            input_dim=5, d_model=16, nhead=2, num_encoder_layers=2,
+            dim_feedforward=32, sequence_length=12
+        ).eval()
+
+    def test_uses_sdpa_encoder(self, model):
+        """Test the encoder stack is built from SDPA layers"""
+        assert isinstance(model.transformer_encoder, SDPAEncoder)
+        assert len(model.transformer_encoder.layers) == 2
+
+    def test_return_both_matches_single_heads(self, model):
+        """Test the shared-encoder output matches the per-head forward passes"""
+        x = torch.randn(4, 12, 5)
+
+        with torch.no_grad():
+            cls_logits, reg_output = model(x, return_both=True)
+
+            assert cls_logits.shape == (4, 3)
+            assert reg_output.shape == (4, 1)
+            assert torch.allclose(cls_logits, model(x))
+            assert torch.allclose(reg_output, model(x, predict_price=True))
+
+    def test_samples_are_independent(self, model):
+        """Test each sample's prediction does not depend on the rest of the batch"""
+        x = torch.randn(4, 12, 5)
+
+        with torch.no_grad():
+            batched = model(x)
+            single = torch.cat([model(x[i:i + 1]) for i in range(4)])
+
+        assert torch.allclose(batched, single, atol=1e-5)
+
+
+class TestTransformerTrainer:
+    """Test suite for TransformerTrainer"""
+
+    @pytest.fixture
+    def data(self):
+        """Create a small synthetic dataset"""
+        return make_data()
+
+    @pytest.fixture
+    def trainer(self):
+        """Create a small CPU trainer"""
+        torch.manual_seed(0)
+        return TransformerTrainer(
+            input_dim=5, d_model=16, nhead=2, num_encoder_layers=1,
+            dim_feedforward=32, dropout=0.0, device='cpu'
+        )
+
+    def test_market_dataset(self, data):
+        """Test dataset length and item shapes"""
+        dataset = MarketDataset(data['X_train'], data['y_train'])
+        X, y, y_cls = dataset[0]
+
+        assert len(dataset) == len(data['X_train'])
+        assert X.shape == (12, 5)
+        assert X.dtype == torch.float32
+        assert y_cls.item() == float(data['y_train'][0] > 0)
+
+    def test_market_dataset_zero_copy(self, data):
+        """Test float32 arrays are wrapped without a copy"""
+        dataset = MarketDataset(data['X_train'], data['y_train'])
+
+        assert np.shares_memory(dataset.X.numpy(), data['X_train'])
+        assert MarketDataset(data['X_train'].astype(np.float64), data['y_train']).X.dtype == torch.float32
+
+    def test_market_dataset_file_round_trip(self, data, tmp_path):
+        """Test a saved dataset reloads (memory-mapped) with identical tensors"""
+        dataset = MarketDataset(data['X_train'], data['y_train'])
+        dataset.save(str(tmp_path / "data.pt"))
+
+        loaded = MarketDataset.from_file(str(tmp_path / "data.pt"))
+
+        assert torch.equal(loaded.X, dataset.X)
+        assert torch.equal(loaded.y, dataset.y)
+
+    def test_amp_disabled_on_cpu(self, trainer):
+        """Test mixed precision only engages on CUDA"""
+        assert not trainer.use_amp
+        assert not trainer.scaler.is_enabled()
+
+    def test_grad_scaler_without_torch_amp(self, monkeypatch):
+        """Test torch < 2.3, which has no torch.amp.GradScaler, uses the CUDA scaler"""
+        monkeypatch.delattr(torch.amp, "GradScaler")
+        trainer = TransformerTrainer(
+            input_dim=5, d_model=16, nhead=2, num_encoder_layers=1,
+            dim_feedforward=32, dropout=0.0, device='cpu'
+        )
+
+        assert not trainer.scaler.is_enabled()
+
+    def test_compile_opt_in_is_gpu_only(self, monkeypatch):
+        """Test TORCH_COMPILE=1 does not compile the CPU training path"""
+        monkeypatch.setenv("TORCH_COMPILE", "1")
+        trainer = TransformerTrainer(
+            input_dim=5, d_model=16, nhead=2, num_encoder_layers=1,
+            dim_feedforward=32, device='cpu'
+        )
+
+        assert not trainer.compiled
+
+    def test_train_loader_drops_ragged_batch(self, trainer, data):
+        """Test every training batch has the full batch size"""
+        train_loader, val_loader = trainer.prepare_data_loaders(data, batch_size=20)
+
+        assert [len(y) for _, y, _ in train_loader] == [20, 20]
+        assert sum(len(y) for _, y, _ in val_loader) == 20
+
+    def test_device_loader_covers_dataset(self, trainer, data):
+        """Test a shuffled device-resident epoch visits each kept sample once"""
+        train_loader, val_loader = trainer.prepare_data_loaders(data, batch_size=16)
+
+        seen = torch.cat([y for _, y, _ in train_loader])
+        assert len(train_loader) == 3
+        assert torch.equal(seen.sort().values, torch.as_tensor(data['y_train']).sort().values)
+        assert torch.equal(torch.cat([y for _, y, _ in val_loader]), torch.as_tensor(data['y_test']))
+
+    def test_host_loaders_match_device_loaders(self, trainer, data):
+        """Test the DataLoader path yields the same validation batches"""
+        _, device_loader = trainer.prepare_data_loaders(data, batch_size=8)
+        _, host_loader = trainer.prepare_data_loaders(data, batch_size=8, on_device=False)
+
+        assert isinstance(host_loader, torch.utils.data.DataLoader)
+        for batch, batch_ref in zip(device_loader, host_loader):
+            assert all(torch.equal(t, t_ref) for t, t_ref in zip(batch, batch_ref))
+
+    def test_host_loaders_persistent_workers(self, trainer, data):
+        """Test worker processes are kept alive across epochs"""
+        train_loader, test_loader = trainer.prepare_data_loaders(
+            data, batch_size=16, num_workers=2, on_device=False
+        )
+
+        assert train_loader.persistent_workers and test_loader.persistent_workers
+        assert train_loader.prefetch_factor == 4
+        assert train_loader.drop_last
+
+        # CPU default stays single-process
+        _, host_loader = trainer.prepare_data_loaders(data, on_device=False)
+        assert host_loader.num_workers == 0
+
+    def test_prefetcher_yields_loader_batches(self, trainer, data):
+        """Test the prefetcher yields every batch of the loader, in order"""
+        _, val_loader = trainer.prepare_data_loaders(data, batch_size=8)
+        prefetcher = DataPrefetcher(val_loader, 'cpu')
+
+        expected = list(val_loader)
+        for _ in range(2):  # re-iterable across epochs
+            batches = list(prefetcher)
+            assert len(batches) == len(prefetcher) == len(expected)
+            for batch, batch_ref in zip(batches, expected):
+                assert all(torch.equal(t, t_ref) for t, t_ref in zip(batch, batch_ref))
+
+    @pytest.mark.parametrize("batch_size", [1, 8])
+    def test_step_loss_matches_reference(self, batch_size):
+        """Test the fused loss/accuracy against the separate criterion calls"""
+        torch.manual_seed(batch_size)
+        cls_logits = torch.randn(batch_size, 1)
+        reg_output = torch.randn(batch_size, 1)
+        y = torch.randn(batch_size)
+
+        loss, correct = _step_loss(cls_logits, reg_output, y)
+
+        cls_labels = (y > 0).float().unsqueeze(1)
+        expected = (
+            0.5 * torch.nn.BCEWithLogitsLoss()(cls_logits, cls_labels)
+            + 0.5 * torch.nn.MSELoss()(reg_output[:, 0], y)
+        )
+        expected_correct = ((torch.sigmoid(cls_logits) > 0.5).float() == cls_labels).sum()
+
+        assert torch.allclose(loss, expected)
+        assert correct.item() == expected_correct.item()
+
+        # Column-shaped targets give the same result, without broadcasting
+        loss_col, correct_col = _step_loss(cls_logits, reg_output, y.unsqueeze(1))
+        assert torch.allclose(loss_col, expected)
+        assert correct_col.item() == expected_correct.item()
+
+        # Precomputed labels give the same result
+        loss_pre, correct_pre = _step_loss(cls_logits, reg_output, y, cls_labels[:, 0])
+        assert torch.allclose(loss_pre, expected)
+        assert correct_pre.item() == expected_correct.item()
+
+    def test_train_epoch_and_validate(self, trainer, data):
+        """Test one training epoch updates the weights and reports sane metrics"""
+        train_loader, val_loader = trainer.prepare_data_loaders(data, batch_size=16)
+        trainer.optimizer = torch.optim.AdamW(trainer.model.parameters(), lr=1e-3)
+        before = [p.detach().clone() for p in trainer.model.parameters()]
+
+        train_loss, train_acc = trainer.train_epoch(train_loader)
+        val_loss, val_acc = trainer.validate(val_loader)
+
+        assert np.isfinite(train_loss) and np.isfinite(val_loss)
+        assert 0.0 <= train_acc <= 1.0
+        assert 0.0 <= val_acc <= 1.0
+        assert any(not torch.equal(b, p) for b, p in zip(before, trainer.model.parameters()))
+
+    def test_gradient_accumulation_matches_full_batch(self, data):
+        """Test two accumulated half-batches update like one full batch"""
+        dataset = MarketDataset(data['X_train'], data['y_train'])
+        params = []
+
+        for batch_size, accum_steps in [(16, 1), (8, 2)]:
+            torch.manual_seed(0)
+            trainer = TransformerTrainer(
+                input_dim=5, d_model=16, nhead=2, num_encoder_layers=1,
+                dim_feedforward=32, dropout=0.0, device='cpu'
+            )
+            trainer.optimizer = torch.optim.SGD(trainer.model.parameters(), lr=0.1)
+            trainer.train_epoch(DeviceBatchLoader(dataset, batch_size), accum_steps=accum_steps)
+            params.append(torch.cat([p.detach().flatten() for p in trainer.model.parameters()]))
+
+        assert torch.allclose(params[0], params[1], atol=1e-5)
+
+    def test_validate_matches_per_batch_metrics(self, trainer, data):
+        """Test device-accumulated metrics against a per-batch host computation"""
+        _, val_loader = trainer.prepare_data_loaders(data, batch_size=8)
+        val_loss, val_acc = trainer.validate(val_loader)
+
+        losses, correct = [], 0
+        with torch.no_grad():
+            for X, y, _ in val_loader:
+                cls_logits, reg_output = trainer.model(X, return_both=True)
+                loss, n_correct = _step_loss(cls_logits, reg_output, y)
+                losses.append(loss.item())
+                correct += n_correct.item()
+
+        assert val_loss == pytest.approx(np.mean(losses), rel=1e-5)
+        assert val_acc == pytest.approx(correct / len(data['y_test']))
+
+    def test_train_writes_checkpoints(self, trainer, data, tmp_path):
+        """Test the full training loop saves checkpoints and history"""
+        train_loader, val_loader = trainer.prepare_data_loaders(data, batch_size=16)
+        trainer.train(
+            train_loader, val_loader, epochs=2, learning_rate=1e-3,
+            save_dir=str(tmp_path), checkpoint_every=2
+        )
+
+        best = torch.load(tmp_path / "best_model.pt")
+        final = torch.load(tmp_path / "final_model.pt")
+        last = torch.load(tmp_path / "last_checkpoint.pt")
+
+        assert 'optimizer_state_dict' not in best
+        assert 'optimizer_state_dict' in final and 'optimizer_state_dict' in last
+        assert len(final['history']['train_loss']) == 2
+        assert len(trainer.history['train_loss']) == 2
+
+        history = np.load(tmp_path / "training_history.npz")
+        assert history['val_loss'].dtype == np.float32
+        np.testing.assert_array_equal(history['val_loss'], trainer.history['val_loss'])
+        summary = json.loads((tmp_path / "training_summary.json").read_text())
+        assert summary['epochs_trained'] == 2
+        assert summary['best_val_loss'] == pytest.approx(trainer.best_val_loss, rel=1e-6)
+
+        # Final weights and history round-trip through load_checkpoint
+        trainer.load_checkpoint(str(tmp_path / "final_model.pt"))
+        for key, value in trainer.model.state_dict().items():
+            assert torch.equal(value, final['model_state_dict'][key])
+        np.testing.assert_array_equal(trainer.history['val_loss'], history['val_loss'])
+
+    def test_history_trimmed_on_early_stop(self, trainer, data, tmp_path):
+        """Test history only covers epochs actually trained and extends on re-training"""
+        train_loader, val_loader = trainer.prepare_data_loaders(data, batch_size=16)
+        trainer.best_val_loss = -np.inf  # no epoch can improve
+
+        trainer.train(train_loader, val_loader, epochs=10, patience=2, save_dir=str(tmp_path))
+        assert len(trainer.history['train_loss']) == 2
+        assert not np.isnan(trainer.history['learning_rate']).any()
+
+        trainer.patience_counter = 0
+        trainer.train(train_loader, val_loader, epochs=10, patience=1, save_dir=str(tmp_path))
+        assert len(trainer.history['train_loss']) == 3
+
+    def test_validation_thinned_late_in_plateau(self, trainer, data, tmp_path, monkeypatch):
+        """Test validation runs every other epoch once half the patience is used"""
+        train_loader, val_loader = trainer.prepare_data_loaders(data, batch_size=16)
+        trainer.best_val_loss = -np.inf  # no epoch can improve
+
+        validated = []
+        real_validate = trainer.validate
+        monkeypatch.setattr(
+            trainer, "validate", lambda loader: validated.append(loader) or real_validate(loader)
+        )
+
+        trainer.train(train_loader, val_loader, epochs=20, patience=6, save_dir=str(tmp_path))
+
+        assert len(trainer.history['val_loss']) == 6
+        assert len(validated) == 4
+        # Skipped epochs repeat the previous validation result
+        assert trainer.history['val_loss'][3] == trainer.history['val_loss'][2]
+
+    def test_predict_shapes(self, trainer, data):
+        """Test predictions return probabilities and returns per sample"""
+        cls_pred, reg_pred = trainer.predict(data['X_test'])
+
+        assert cls_pred.shape == (20, 1)
+        assert reg_pred.shape == (20, 1)
+        assert ((cls_pred >= 0) & (cls_pred <= 1)).all()
+
+    def test_predict_chunked_matches_single_pass(self, trainer, data):
+        """Test chunked prediction matches one full-batch forward pass"""
+        cls_full, reg_full = trainer.predict(data['X_test'].astype(np.float64))
+        cls_chunked, reg_chunked = trainer.predict(data['X_test'], batch_size=7)
+
+        assert cls_chunked.dtype == np.float32
+        np.testing.assert_allclose(cls_chunked, cls_full, atol=1e-6)
+        np.testing.assert_allclose(reg_chunked, reg_full, atol=1e-6)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])